@@ -76,7 +76,11 @@ def _parameter_type(method: _MethodDict) -> str | None:
 
     for path_param in method.get("parameters", []):
         assert path_param
-        body_schema.setdefault("required", []).append(path_param["name"])
+        # query params with defaults are optional
+        if path_param["required"]:
+            body_schema.setdefault("required", []).append(path_param["name"])
+        else:
+            body_schema.setdefault("required", [])
         body_schema["properties"][path_param["name"]] = path_param["schema"]
 
     if not body_schema["properties"]:
@@ -1,10 +1,12 @@
+import hashlib
 import typing
 from collections.abc import Callable
 from functools import wraps
 from typing import Any, Generic, Literal, Protocol, TypeVar, cast, overload
 
 from django.contrib.auth.views import redirect_to_login as redirect_to_login_url
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
 
 from recipeyak.api.base.exceptions import APIError, RequestValidationError
 from recipeyak.api.base.json import json_loads
@@ -36,21 +38,69 @@ class AnyView(Protocol):
     def __name__(self) -> str: ...
 
 
+# Called with the request & params, returns a string that changes whenever the
+# response would, or None to skip the ETag.
+VersionFunc = Callable[[Any, Any], str | None]
+
+# Called with the request & params after a successful GET, including those we
+# respond to with a 304 without calling the view.
+OnGetFunc = Callable[[Any, Any], None]
+
+# Let the browser store the response, but revalidate it with the ETag on every
+# request.
+_REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(request: Any, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, so ignore the W/ prefix.
+    return any(
+        tag == "*" or tag.removeprefix("W/") == etag
+        for tag in parse_etags(if_none_match)
+    )
+
+
 @overload
 def endpoint(
-    *, auth_required: Literal[False], redirect_to_login: bool = ...
+    *,
+    auth_required: Literal[False],
+    redirect_to_login: bool = ...,
+    version: VersionFunc | None = ...,
+    on_get: OnGetFunc | None = ...,
 ) -> Callable[[AnonView[_P]], AnonView[_P]]: ...
 
 
 @overload
 def endpoint(
-    *, auth_required: Literal[True] = ..., redirect_to_login: bool = ...
+    *,
+    auth_required: Literal[True] = ...,
+    redirect_to_login: bool = ...,
+    version: VersionFunc | None = ...,
+    on_get: OnGetFunc | None = ...,
 ) -> Callable[[AuthedView[_P]], AuthedView[_P]]: ...
 
 
 def endpoint(
-    *, auth_required: bool = True, redirect_to_login: bool = False
+    *,
+    auth_required: bool = True,
+    redirect_to_login: bool = False,
+    version: VersionFunc | None = None,
+    on_get: OnGetFunc | None = None,
 ) -> Callable[[AnyView], AnyView]:
+    """
+    Wrap a view, handling auth, parsing the params & serializing the response.
+
+    With `version`, GET requests get a strong ETag from the version and we
+    respond to a matching `If-None-Match` with a 304, without calling the view.
+    The version should be much cheaper than the view. Otherwise it's passed to
+    the view as `request.response_version`.
+
+    `on_get` is for side effects of reading, e.g., recording a view, so they
+    happen whether or not the view is called. It isn't called for HEAD.
+    """
+
     def decorator_func(func: AnyView) -> AnyView:
         @wraps(func)
         def wrapper(request: Any, **kwargs: Any) -> HttpResponse:
@@ -68,12 +118,36 @@ def endpoint(
                 )
 
             params = _parse_param_data(request, func, kwargs)
+            etag = None
+            request.response_version = None
+            if version is not None and request.method in {"GET", "HEAD"}:
+                response_version = version(request, params)
+                request.response_version = response_version
+                if response_version is not None:
+                    etag = quote_etag(
+                        hashlib.sha256(
+                            f"{func.__name__}:{response_version}".encode()
+                        ).hexdigest()
+                    )
+                    if _etag_matches(request, etag):
+                        if on_get is not None and request.method == "GET":
+                            on_get(request, params)
+                        not_modified = HttpResponseNotModified()
+                        not_modified["ETag"] = etag
+                        not_modified["Cache-Control"] = _REVALIDATE_CACHE_CONTROL
+                        return not_modified
             response_data = func(request, params)
+            if on_get is not None and request.method == "GET":
+                on_get(request, params)
             if response_data is None:
                 return HttpResponse(status=204)
             if isinstance(response_data, HttpResponse):
                 return response_data
-            return JsonResponse(response_data)
+            response = JsonResponse(response_data)
+            if etag is not None:
+                response["ETag"] = etag
+                response["Cache-Control"] = _REVALIDATE_CACHE_CONTROL
+            return response
 
         return wrapper
 
@@ -6,7 +6,10 @@ from recipeyak.models import User
 
 class AuthedHttpRequest(HttpRequest):
     user: User
+    # from the `endpoint`'s `version`, so the view doesn't need to recompute it
+    response_version: str | None
 
 
 class AnonymousHttpRequest(HttpRequest):
     user: AnonymousUser | User
+    response_version: str | None
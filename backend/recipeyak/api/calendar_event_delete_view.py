@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from django.db import transaction
+
+from recipeyak import calendar_day_ingredients
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
@@ -18,9 +21,28 @@ def calendar_event_delete_view(
 ) -> None:
     team_id = get_team(request.user).id
     calendar_id = get_pinned_calendar(request.user, team_id).id
-    get_scheduled_recipes(team_id, calendar_id).filter(
-        id=params.scheduled_recipe_id
-    ).delete()
+    scheduled_recipe = (
+        get_scheduled_recipes(team_id, calendar_id)
+        .filter(id=params.scheduled_recipe_id)
+        .first()
+    )
+    with transaction.atomic():
+        if scheduled_recipe is not None:
+            calendar_day_ingredients.lock_recipe(recipe_id=scheduled_recipe.recipe_id)
+            # skip the delta if a concurrent delete beat us to it
+            scheduled_recipe = (
+                get_scheduled_recipes(team_id, calendar_id)
+                .select_for_update(of=("self",))
+                .filter(id=params.scheduled_recipe_id)
+                .first()
+            )
+        if scheduled_recipe is not None:
+            calendar_day_ingredients.remove_scheduled_recipe(
+                calendar_id=calendar_id,
+                on=scheduled_recipe.on,
+                recipe_id=scheduled_recipe.recipe_id,
+            )
+            scheduled_recipe.delete()
     publish_calendar_event_deleted(
         recipe_id=params.scheduled_recipe_id, team_id=team_id, calendar_id=calendar_id
     )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 
+from django.db import connection
 from django.db.models import QuerySet
 from typing_extensions import TypedDict
 
@@ -38,7 +39,65 @@ class CalendarListResponse(TypedDict):
     scheduledRecipes: list[ScheduleRecipeSerializer]
 
 
-@endpoint()
+def _calendar_version(request: AuthedHttpRequest, params: CalendarListParams) -> str:
+    """
+    Changes with any of the scheduled recipes in the range, their recipes,
+    their recipes' primary images or their creators.
+
+    Image placeholders are backfilled without touching the recipe, so we
+    include the image fields directly. The response includes the user id.
+    """
+    team_id = get_team(request.user).id
+    # the view checks the calendar belongs to the team
+    calendar_id = request.user.pinned_calendar_id
+    assert calendar_id is not None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select
+  md5(
+    coalesce(
+      string_agg(
+        concat_ws(
+          ':',
+          scheduled_recipe.id,
+          scheduled_recipe.modified,
+          recipe.modified,
+          recipe.primary_image_id,
+          primary_image.key,
+          primary_image.background_url,
+          creator.name,
+          creator.email,
+          creator.profile_upload_id
+        ),
+        ','
+        order by scheduled_recipe.id
+      ),
+      ''
+    )
+  )
+from core_scheduledrecipe scheduled_recipe
+join core_recipe recipe on recipe.id = scheduled_recipe.recipe_id
+left join core_upload primary_image on primary_image.id = recipe.primary_image_id
+left join core_myuser creator on creator.id = scheduled_recipe.created_by_id
+where scheduled_recipe.team_id = %(team_id)s
+  and scheduled_recipe.calendar_id = %(calendar_id)s
+  and scheduled_recipe."on" >= %(start)s::date
+  and scheduled_recipe."on" <= %(end)s::date
+""",
+            {
+                "team_id": team_id,
+                "calendar_id": calendar_id,
+                "start": params.start.isoformat(),
+                "end": params.end.isoformat(),
+            },
+        )
+        row = cursor.fetchone()
+    assert row is not None
+    return f"{request.user.id}:{team_id}:{calendar_id}:{row[0]}"
+
+
+@endpoint(version=_calendar_version)
 def calendar_list_view(
     request: AuthedHttpRequest, params: CalendarListParams
 ) -> CalendarListResponse:
@@ -0,0 +1,112 @@
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.client import Client
+
+from recipeyak.models import Recipe, Team, Upload, User
+
+pytestmark = pytest.mark.django_db
+
+
+def test_calendar_list_etag(
+    client: Client, user: User, team: Team, recipe: Recipe
+) -> None:
+    recipe.team = team
+    recipe.save()
+    client.force_login(user)
+    start = date(1976, 7, 6)
+    params = {"start": start, "end": start + timedelta(days=7)}
+
+    res = client.get("/api/v1/calendar/", params)
+    assert res.status_code == 200
+    assert res.json() == {"scheduledRecipes": []}
+    etag = res["ETag"]
+
+    res = client.get("/api/v1/calendar/", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+
+    res = client.post(
+        "/api/v1/calendar/",
+        {"recipe": recipe.id, "on": str(start)},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    scheduled_recipe_id = res.json()["id"]
+
+    res = client.get("/api/v1/calendar/", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert [r["id"] for r in res.json()["scheduledRecipes"]] == [scheduled_recipe_id]
+    assert res["ETag"] != etag
+    etag = res["ETag"]
+
+    # outside the range
+    res = client.post(
+        "/api/v1/calendar/",
+        {"recipe": recipe.id, "on": str(start + timedelta(days=30))},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    res = client.get("/api/v1/calendar/", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+
+    res = client.delete(f"/api/v1/calendar/{scheduled_recipe_id}/")
+    assert res.status_code == 204
+    res = client.get("/api/v1/calendar/", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res.json() == {"scheduledRecipes": []}
+
+
+def test_calendar_list_etag_primary_image_and_user(
+    client: Client, user: User, user2: User, team: Team, recipe: Recipe
+) -> None:
+    recipe.team = team
+    recipe.save()
+    client.force_login(user)
+    start = date(1976, 7, 6)
+    params = {"start": start, "end": start + timedelta(days=7)}
+    res = client.post(
+        "/api/v1/calendar/",
+        {"recipe": recipe.id, "on": str(start)},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    res = client.get("/api/v1/calendar/", params)
+    assert res.status_code == 200
+    etag = res["ETag"]
+
+    upload = Upload.objects.create(
+        created_by=user, bucket="bucket", key="1/abc/photo.jpg", recipe=recipe
+    )
+    # set without touching the recipe
+    Recipe.objects.filter(id=recipe.id).update(
+        primary_image=upload, modified=recipe.modified
+    )
+    res = client.get("/api/v1/calendar/", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res["ETag"] != etag
+    etag = res["ETag"]
+
+    # like `jobs/backfill_image_placeholders.py`
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "update core_upload set background_url = 'data:image/jpeg;base64,abc' where id = %s",
+            [upload.id],
+        )
+    res = client.get("/api/v1/calendar/", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert (
+        res.json()["scheduledRecipes"][0]["recipe"]["primaryImage"]["backgroundUrl"]
+        == "data:image/jpeg;base64,abc"
+    )
+    etag = res["ETag"]
+
+    # the response includes the user
+    team.force_join(user2)
+    user2.schedule_team = team
+    user2.pinned_calendar = user.pinned_calendar
+    user2.save()
+    client.force_login(user2)
+    res = client.get("/api/v1/calendar/", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res.json()["scheduledRecipes"][0]["user"] == user2.id
@@ -1,7 +1,9 @@
 from datetime import date
 
 from django.db import transaction
+from django.shortcuts import get_object_or_404
 
+from recipeyak import calendar_day_ingredients
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
@@ -29,6 +31,18 @@ def calendar_update_view(
         id=params.scheduled_recipe_id
     )
     with transaction.atomic():
+        calendar_day_ingredients.lock_recipe(recipe_id=scheduled_recipe.recipe_id)
+        # move from the day it's on now, not the one we read before locking
+        scheduled_recipe = get_object_or_404(
+            get_scheduled_recipes(team_id, calendar_id).select_for_update(of=("self",)),
+            id=params.scheduled_recipe_id,
+        )
+        calendar_day_ingredients.move_scheduled_recipe(
+            calendar_id=calendar_id,
+            recipe_id=scheduled_recipe.recipe_id,
+            before=scheduled_recipe.on,
+            after=params.on,
+        )
         scheduled_recipe.on = params.on
         scheduled_recipe.save()
         ScheduleEvent.objects.create(
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import pydantic
-from django.db import connection
+from django.db import connection, transaction
 
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
@@ -30,7 +30,7 @@ def cook_checklist_create_view(
 ) -> CookChecklistCreateResponse:
     team = get_team(request.user)
     recipe = filter_recipe_or_404(recipe_id=params.recipe_id, team=team)
-    with connection.cursor() as cursor:
+    with transaction.atomic(), connection.cursor() as cursor:
         cursor.execute(
             """
             insert into recipe_cook_checklist_check (recipe_id, ingredient_id, checked, created, modified)
@@ -45,13 +45,12 @@ def cook_checklist_create_view(
                 "checked": params.checked,
             },
         )
-
-    publish_cook_checklist(
-        recipe_id=recipe.id,
-        team_id=team.id,
-        ingredient_id=params.ingredient_id,
-        checked=params.checked,
-    )
+        publish_cook_checklist(
+            recipe_id=recipe.id,
+            team_id=team.id,
+            ingredient_id=params.ingredient_id,
+            checked=params.checked,
+        )
 
     return CookChecklistCreateResponse(
         ingredient_id=params.ingredient_id, checked=params.checked
@@ -6,6 +6,7 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404
 from pydantic import StringConstraints
 
+from recipeyak import calendar_day_ingredients
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
@@ -42,7 +43,7 @@ def ingredient_create_view(
     recipe = get_object_or_404(filter_recipes(team=team), pk=params.recipe_id)
 
     with transaction.atomic():
-        ingredient = Ingredient.objects.create(
+        ingredient = Ingredient(
             quantity=params.quantity,
             name=params.name,
             description=params.description,
@@ -50,6 +51,11 @@ def ingredient_create_view(
             optional=params.optional is not None and params.optional,
             position=params.position,
         )
+        ingredient.set_parsed_fields()
+        ingredient.save()
+        calendar_day_ingredients.update_ingredient(
+            recipe_id=recipe.id, before=None, after=ingredient.to_parsed()
+        )
         RecipeChange.objects.create(
             recipe=recipe,
             actor=request.user,
@@ -3,6 +3,7 @@ from __future__ import annotations
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 
+from recipeyak import calendar_day_ingredients
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
@@ -25,14 +26,24 @@ def ingredient_delete_view(
         filter_ingredients(team=team), pk=params.ingredient_id
     )
     with transaction.atomic():
-        recipe_id = ingredient.recipe.id
+        calendar_day_ingredients.lock_recipe(recipe_id=ingredient.recipe_id)
+        # compute the delta from the current row, not the one we read before
+        # locking
+        ingredient = get_object_or_404(
+            filter_ingredients(team=team).select_for_update(),
+            pk=params.ingredient_id,
+        )
+        recipe_id = ingredient.recipe_id
         RecipeChange.objects.create(
-            recipe=ingredient.recipe,
+            recipe_id=recipe_id,
             actor=request.user,
             before=ingredient_to_text(ingredient),
             after="",
             change_type=ChangeType.INGREDIENT_DELETE,
         )
-        filter_ingredients(team=team).filter(pk=params.ingredient_id).delete()
+        calendar_day_ingredients.update_ingredient(
+            recipe_id=recipe_id, before=ingredient.to_parsed(), after=None
+        )
+        ingredient.delete()
         save_recipe_version(recipe_id=recipe_id, actor=request.user)
-    publish_recipe(recipe_id=ingredient.recipe_id, team_id=team.id)
+    publish_recipe(recipe_id=recipe_id, team_id=team.id)
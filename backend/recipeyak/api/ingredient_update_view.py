@@ -6,6 +6,7 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404
 from pydantic import Field, StringConstraints
 
+from recipeyak import calendar_day_ingredients
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
@@ -51,7 +52,15 @@ def ingredient_update_view(
     )
 
     with transaction.atomic():
+        calendar_day_ingredients.lock_recipe(recipe_id=ingredient.recipe_id)
+        # compute the delta from the current row, not the one we read before
+        # locking
+        ingredient = get_object_or_404(
+            filter_ingredients(team=team).select_for_update(),
+            pk=params.ingredient_id,
+        )
         before = ingredient_to_text(ingredient)
+        before_parsed = ingredient.to_parsed()
         if params.quantity is not None:
             ingredient.quantity = params.quantity
         if params.name is not None:
@@ -62,7 +71,13 @@ def ingredient_update_view(
             ingredient.position = params.position
         if params.optional is not None:
             ingredient.optional = params.optional
+        ingredient.set_parsed_fields()
         ingredient.save()
+        calendar_day_ingredients.update_ingredient(
+            recipe_id=ingredient.recipe_id,
+            before=before_parsed,
+            after=ingredient.to_parsed(),
+        )
         RecipeChange.objects.create(
             recipe=ingredient.recipe,
             actor=request.user,
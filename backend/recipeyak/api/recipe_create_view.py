@@ -7,8 +7,10 @@ import requests
 import structlog
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.http import Http404
 from pydantic import StringConstraints
 from recipe_scrapers._exceptions import RecipeScrapersExceptions
+from structlog.stdlib import BoundLogger
 
 from recipeyak import ordering
 from recipeyak.api.base.decorators import endpoint
@@ -17,7 +19,7 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.serializers.recipe import (
     RecipeSerializer,
-    serialize_recipe,
+    serialize_recipe_detail,
 )
 from recipeyak.models import (
     Ingredient,
@@ -28,6 +30,7 @@ from recipeyak.models.recipe import Recipe
 from recipeyak.models.section import Section
 from recipeyak.models.team import Team
 from recipeyak.models.upload import Upload
+from recipeyak.models.user import User
 from recipeyak.parsing import parse_ingredient
 from recipeyak.scraper.scrape_recipe import ScrapeResult, scrape_recipe
 from recipeyak.versioning import save_recipe_version
@@ -72,16 +75,16 @@ def _create_recipe_from_scrape(*, scrape: ScrapeResult, team: Team) -> Recipe:
             position = ordering.position_after(position)
         for ingredient in group.ingredients:
             parsed_ingredient = parse_ingredient(ingredient)
-            ingredients.append(
-                Ingredient(
-                    position=position,
-                    recipe=recipe,
-                    quantity=parsed_ingredient.quantity,
-                    name=parsed_ingredient.name,
-                    description=parsed_ingredient.description,
-                    optional=parsed_ingredient.optional,
-                )
+            db_ingredient = Ingredient(
+                position=position,
+                recipe=recipe,
+                quantity=parsed_ingredient.quantity,
+                name=parsed_ingredient.name,
+                description=parsed_ingredient.description,
+                optional=parsed_ingredient.optional,
             )
+            db_ingredient.set_parsed_fields()
+            ingredients.append(db_ingredient)
             position = ordering.position_after(position)
     Ingredient.objects.bulk_create(ingredients)
     Section.objects.bulk_create(sections)
@@ -96,6 +99,60 @@ def _create_recipe_from_scrape(*, scrape: ScrapeResult, team: Team) -> Recipe:
     return recipe
 
 
+def _scrape_recipe(*, url: str, user: User, log: BoundLogger) -> ScrapeResult:
+    try:
+        return scrape_recipe(url=url, user=user)
+    except (
+        advocate.exceptions.UnacceptableAddressException,
+        ValidationError,
+        RecipeScrapersExceptions,
+    ) as e:
+        log.info("invalid url")
+        raise APIError(code="invalid_url", message="Invalid url.") from e
+    except requests.exceptions.ConnectionError as e:
+        log.info("probably connecting to url")
+        raise APIError(
+            code="connection_error", message="Problem connecting to url."
+        ) from e
+
+
+def _save_created_recipe(*, recipe: Recipe, user: User) -> None:
+    TimelineEvent(
+        action="created",
+        created_by=user,
+        recipe=recipe,
+    ).save()
+    # We save a version now to simplify the diff view -- no need to
+    # construct a versions from both the "historical" tables and the current
+    # table, instead we only look at historical, with the assumption that
+    # this recipe version is the same as the one we create above in the
+    # transaction
+    save_recipe_version(recipe_id=recipe.id, actor=user)
+
+
+def create_recipe_from_url(
+    *, url: str, team: Team, user: User, log: BoundLogger
+) -> Recipe:
+    """
+    Scrape the url & create a recipe from it, or return the team's existing
+    recipe for it.
+
+    Also used by `jobs/scrape_queue.py` to run imports in the background.
+    """
+    scrape_result = _scrape_recipe(url=url, user=user, log=log)
+    with transaction.atomic():
+        # bail out if we've already scraped that recipe
+        if scrape_result.canonical_url is not None and (
+            existing_recipe := Recipe.objects.filter(
+                team=team, source=scrape_result.canonical_url
+            ).first()
+        ):
+            return existing_recipe
+        recipe = _create_recipe_from_scrape(scrape=scrape_result, team=team)
+        _save_created_recipe(recipe=recipe, user=user)
+    return recipe
+
+
 @endpoint()
 def recipe_create_view(
     request: AuthedHttpRequest, params: RecipeCreateParams
@@ -107,46 +164,21 @@ def recipe_create_view(
     if team is None:
         raise APIError(code="unknown_team", message="Unknown Team")
 
-    scrape_result: ScrapeResult | None = None
     if params.from_url is not None:
-        log = log.bind(from_url=params.from_url)
-        try:
-            scrape_result = scrape_recipe(url=params.from_url, user=request.user)
-        except (
-            advocate.exceptions.UnacceptableAddressException,
-            ValidationError,
-            RecipeScrapersExceptions,
-        ) as e:
-            log.info("invalid url")
-            raise APIError(code="invalid_url", message="Invalid url.") from e
-        except requests.exceptions.ConnectionError as e:
-            log.info("probably connecting to url")
-            raise APIError(
-                code="connection_error", message="Problem connecting to url."
-            ) from e
-
-    with transaction.atomic():
-        if scrape_result is not None:
-            # bail out if we've already scraped that recipe
-            if scrape_result.canonical_url is not None and (
-                existing_recipe := Recipe.objects.filter(
-                    team=team, source=scrape_result.canonical_url
-                ).first()
-            ):
-                return serialize_recipe(existing_recipe, user=request.user)
-            recipe = _create_recipe_from_scrape(scrape=scrape_result, team=team)
-        else:
+        recipe = create_recipe_from_url(
+            url=params.from_url,
+            team=team,
+            user=request.user,
+            log=log.bind(from_url=params.from_url),
+        )
+    else:
+        with transaction.atomic():
             recipe = Recipe.objects.create(team=team, name=params.name)
-        TimelineEvent(
-            action="created",
-            created_by=request.user,
-            recipe=recipe,
-        ).save()
-        # We save a version now to simplify the diff view -- no need to
-        # construct a versions from both the "historical" tables and the current
-        # table, instead we only look at historical, with the assumption that
-        # this recipe version is the same as the one we create above in the
-        # transaction
-        save_recipe_version(recipe_id=recipe.id, actor=request.user)
-
-    return serialize_recipe(recipe, user=request.user)
+            _save_created_recipe(recipe=recipe, user=request.user)
+
+    serialized = serialize_recipe_detail(
+        recipe_id=recipe.id, team_id=team.id, user=request.user
+    )
+    if serialized is None:
+        raise Http404
+    return serialized
@@ -66,10 +66,15 @@ def test_cache_headers(client: Client, user: User, recipe: Recipe, team: Team) -
     recipe.team = team
     recipe.save()
 
-    res = client.get(f"/api/v1/recipes/{recipe.id}/")
+    res = client.get(f"/api/v1/recipes/{recipe.id}/timeline")
     assert res.status_code == 200
     assert res["Cache-Control"] == "no-store, no-cache, must-revalidate"
 
+    # endpoints with an ETag are stored but revalidated
+    res = client.get(f"/api/v1/recipes/{recipe.id}/")
+    assert res.status_code == 200
+    assert res["Cache-Control"] == "private, no-cache"
+
 
 def test_recipe_creation_for_a_team(client: Client, team: Team, user: User) -> None:
     """
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from django.db import transaction
 
+from recipeyak import calendar_day_ingredients
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
@@ -21,6 +22,7 @@ def recipe_delete_view(request: AuthedHttpRequest, params: RecipeDeleteParams) -
     team = get_team(request.user)
     with transaction.atomic():
         recipe = filter_recipe_or_404(team=team, recipe_id=params.recipe_id)
+        calendar_day_ingredients.remove_recipe(recipe_id=recipe.id)
         recipe.delete()
         # no need to save version, since we aren't "updating" the recipe, we
         # have the previous post-update version saved already
@@ -3,6 +3,7 @@ from django.test.client import Client
 
 from recipeyak.models import Recipe, RecipeView, User
 from recipeyak.models.team import Team
+from recipeyak.recipe_views import flush_recipe_views
 
 
 @pytest.mark.django_db()
@@ -18,6 +19,7 @@ def test_recently_viewed(
     res = client.get(f"/api/v1/recipes/{recipe.pk}/")
 
     assert res.status_code == 200
+    flush_recipe_views()
     assert RecipeView.objects.count() == 1
 
     res = client.get("/api/v1/recipes/recently_viewed")
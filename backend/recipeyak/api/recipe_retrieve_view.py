@@ -1,49 +1,52 @@
 from __future__ import annotations
 
-from django.db import connection
+from django.http import Http404
 
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
-from recipeyak.api.serializers.recipe import RecipeSerializer, serialize_recipe
-from recipeyak.models import (
-    filter_recipe_or_404,
-    get_team,
+from recipeyak.api.serializers.recipe import (
+    RecipeSerializer,
+    get_recipe_detail_version,
+    serialize_recipe_detail,
 )
+from recipeyak.models import get_team
+from recipeyak.recipe_views import record_recipe_view
 
 
 class RecipeRetrieveParams(Params):
     recipe_id: int
+    include_versions: bool = True
 
 
-@endpoint()
+def _recipe_version(
+    request: AuthedHttpRequest, params: RecipeRetrieveParams
+) -> str | None:
+    version = get_recipe_detail_version(
+        recipe_id=params.recipe_id,
+        team_id=get_team(request.user).id,
+        user=request.user,
+    )
+    if version is None:
+        return None
+    return f"{version}:{params.include_versions}"
+
+
+def _record_view(request: AuthedHttpRequest, params: RecipeRetrieveParams) -> None:
+    record_recipe_view(recipe_id=params.recipe_id, user_id=request.user.id)
+
+
+@endpoint(version=_recipe_version, on_get=_record_view)
 def recipe_retrieve_view(
     request: AuthedHttpRequest, params: RecipeRetrieveParams
 ) -> RecipeSerializer:
     team = get_team(request.user)
-    recipe = filter_recipe_or_404(recipe_id=params.recipe_id, team=team)
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO recipe_view (recipe_id, user_id, last_visited_at, count, created, modified)
-            VALUES (%(recipe_id)s, %(user_id)s, now(), 1, now(), now())
-            ON CONFLICT
-            ON CONSTRAINT one_user_view_row_per_recipe
-            DO UPDATE SET
-                last_visited_at =
-                    CASE WHEN recipe_view.last_visited_at < now() - '1 hour'::interval THEN
-                        now()
-                    ELSE
-                        recipe_view.last_visited_at
-                    END,
-                count =
-                    CASE WHEN recipe_view.last_visited_at < now() - '1 hour'::interval THEN
-                        recipe_view.count + 1
-                    ELSE
-                        recipe_view.count
-                    END
-            """,
-            {"user_id": request.user.id, "recipe_id": recipe.id},
-        )
-
-    return serialize_recipe(recipe, user=request.user)
+    recipe = serialize_recipe_detail(
+        recipe_id=params.recipe_id,
+        team_id=team.id,
+        user=request.user,
+        include_versions=params.include_versions,
+    )
+    if recipe is None:
+        raise Http404
+    return recipe
@@ -1,7 +1,10 @@
+from unittest.mock import patch
+
 import pytest
+from django.db import connection
 from django.test.client import Client
 
-from recipeyak.models import Recipe, User
+from recipeyak.models import Recipe, Upload, User
 from recipeyak.models.team import Team
 
 pytestmark = pytest.mark.django_db
@@ -30,3 +33,112 @@ def test_accessing_recipes(
 
     res = client.get(f"/api/v1/recipes/{recipe.id}/")
     assert res.status_code == 403
+
+
+def test_recipe_etag(client: Client, user: User, recipe: Recipe, team: Team) -> None:
+    """
+    Refetching an unchanged recipe with its ETag responds with a 304, any change
+    to the recipe gives it a new ETag.
+    """
+    client.force_login(user)
+
+    res = client.get(f"/api/v1/recipes/{recipe.id}/")
+    assert res.status_code == 200
+    etag = res["ETag"]
+
+    res = client.get(f"/api/v1/recipes/{recipe.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+    assert res.content == b""
+    assert res["ETag"] == etag
+
+    res = client.get(
+        f"/api/v1/recipes/{recipe.id}/",
+        {"include_versions": False},
+        HTTP_IF_NONE_MATCH=etag,
+    )
+    assert res.status_code == 200
+
+    for edit in [
+        lambda: client.patch(
+            f"/api/v1/recipes/{recipe.id}/",
+            {"user_favorite": True},
+            content_type="application/json",
+        ),
+        lambda: client.delete(
+            f"/api/v1/ingredients/{recipe.ingredient_set.all()[0].id}/"
+        ),
+        lambda: client.post(
+            f"/api/v1/recipes/{recipe.id}/notes/",
+            {"text": "a note", "attachment_upload_ids": []},
+            content_type="application/json",
+        ),
+    ]:
+        assert edit().status_code in {200, 204}
+        res = client.get(f"/api/v1/recipes/{recipe.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 200
+        assert res["ETag"] != etag
+        etag = res["ETag"]
+
+
+def test_recipe_etag_other_team(
+    client: Client, user: User, user2: User, recipe: Recipe, team: Team
+) -> None:
+    client.force_login(user)
+    res = client.get(f"/api/v1/recipes/{recipe.id}/")
+    assert res.status_code == 200
+
+    client.force_login(user2)
+    res = client.get(f"/api/v1/recipes/{recipe.id}/", HTTP_IF_NONE_MATCH=res["ETag"])
+    assert res.status_code == 404
+
+
+def test_recipe_etag_image_placeholder(
+    client: Client, user: User, recipe: Recipe, team: Team
+) -> None:
+    """
+    Image placeholders are backfilled without touching `modified`, the ETag
+    still changes.
+    """
+    client.force_login(user)
+    upload = Upload.objects.create(
+        created_by=user, bucket="bucket", key="1/abc/photo.jpg", recipe=recipe
+    )
+    recipe.primary_image = upload
+    recipe.save()
+    res = client.get(f"/api/v1/recipes/{recipe.id}/")
+    assert res.status_code == 200
+    etag = res["ETag"]
+
+    # like `jobs/backfill_image_placeholders.py`
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "update core_upload set background_url = 'data:image/jpeg;base64,abc' where id = %s",
+            [upload.id],
+        )
+    res = client.get(f"/api/v1/recipes/{recipe.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res["ETag"] != etag
+    assert res.json()["primaryImage"]["backgroundUrl"] == "data:image/jpeg;base64,abc"
+
+
+def test_recipe_retrieve_records_view(
+    client: Client, user: User, recipe: Recipe, team: Team
+) -> None:
+    """
+    GETs record a view, including those we respond to with a 304.
+    """
+    client.force_login(user)
+    with patch(
+        "recipeyak.api.recipe_retrieve_view.record_recipe_view"
+    ) as record_recipe_view:
+        res = client.get(f"/api/v1/recipes/{recipe.id}/")
+        assert res.status_code == 200
+        res = client.get(
+            f"/api/v1/recipes/{recipe.id}/", HTTP_IF_NONE_MATCH=res["ETag"]
+        )
+        assert res.status_code == 304
+        assert record_recipe_view.call_count == 2
+
+        res = client.get(f"/api/v1/recipes/{recipe.id + 1_000}/")
+        assert res.status_code == 404
+        assert record_recipe_view.call_count == 2
@@ -10,7 +10,10 @@ from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.exceptions import APIError
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
-from recipeyak.api.serializers.recipe import RecipeSerializer, serialize_recipe
+from recipeyak.api.serializers.recipe import (
+    RecipeSerializer,
+    serialize_recipe_detail,
+)
 from recipeyak.models import (
     ChangeType,
     RecipeChange,
@@ -38,6 +41,7 @@ class RecipeUpdateParams(Params):
     primaryImageId: str | None = None
 
     recipe_id: int
+    include_versions: bool = True
 
 
 @endpoint()
@@ -128,8 +132,13 @@ def recipe_update_view(
                 ).save()
         recipe.save()
         save_recipe_version(recipe_id=recipe.id, actor=request.user)
-    publish_recipe(recipe_id=recipe.id, team_id=team.id)
-
-    team = get_team(request.user)
-    recipe = filter_recipe_or_404(team=team, recipe_id=params.recipe_id)
-    return serialize_recipe(recipe, user=request.user)
+        publish_recipe(recipe_id=recipe.id, team_id=team.id)
+
+    res = serialize_recipe_detail(
+        recipe_id=recipe.id,
+        team_id=team.id,
+        user=request.user,
+        include_versions=params.include_versions,
+    )
+    assert res is not None
+    return res
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+import pydantic
+from pydantic import Field
+
+from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.request import AuthedHttpRequest
+from recipeyak.api.base.serialization import Params
+from recipeyak.api.serializers.recipe import (
+    RecipeVersionResponse,
+    get_recipe_versions,
+)
+from recipeyak.models import filter_recipe_or_404, get_team
+
+
+class RecipeVersionListParams(Params):
+    recipe_id: int
+    cursor: Annotated[
+        int | None,
+        Field(description="The `next_cursor` from the previous page."),
+    ] = None
+    limit: Annotated[int, Field(ge=1, le=100)] = 20
+
+
+class RecipeVersionListResponse(pydantic.BaseModel):
+    versions: Annotated[
+        list[RecipeVersionResponse],
+        Field(description="The previous versions of the Recipe, newest first."),
+    ]
+    next_cursor: Annotated[
+        int | None,
+        Field(description="Pass as the `cursor` to fetch the next page."),
+    ]
+
+
+@endpoint()
+def recipe_version_list_view(
+    request: AuthedHttpRequest, params: RecipeVersionListParams
+) -> RecipeVersionListResponse:
+    team = get_team(request.user)
+    recipe = filter_recipe_or_404(recipe_id=params.recipe_id, team=team)
+    # fetch an extra row to see if there's another page
+    versions = get_recipe_versions(
+        recipe_id=recipe.id, before_id=params.cursor, limit=params.limit + 1
+    )
+    next_cursor = (
+        versions[params.limit - 1].id if len(versions) > params.limit else None
+    )
+    return RecipeVersionListResponse(
+        versions=versions[: params.limit], next_cursor=next_cursor
+    )
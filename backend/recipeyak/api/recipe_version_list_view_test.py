@@ -0,0 +1,66 @@
+import pytest
+from django.test.client import Client
+
+from recipeyak.models import Recipe, Team, User
+from recipeyak.versioning import save_recipe_version
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recipe_version_list_paginates(
+    client: Client, user: User, team: Team, recipe: Recipe
+) -> None:
+    for _ in range(5):
+        save_recipe_version(recipe_id=recipe.id, actor=user)
+    client.force_login(user)
+
+    res = client.get(f"/api/v1/recipes/{recipe.id}/")
+    assert res.status_code == 200
+    all_versions = res.json()["versions"]
+    assert len(all_versions) == 5
+
+    versions = []
+    cursor = None
+    pages = 0
+    while True:
+        res = client.get(
+            f"/api/v1/recipes/{recipe.id}/versions/",
+            {"limit": 2} | ({"cursor": cursor} if cursor is not None else {}),
+        )
+        assert res.status_code == 200
+        pages += 1
+        versions += res.json()["versions"]
+        cursor = res.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert versions == all_versions
+
+
+def test_recipe_version_list_other_team(
+    client: Client, user2: User, recipe: Recipe
+) -> None:
+    client.force_login(user2)
+    res = client.get(f"/api/v1/recipes/{recipe.id}/versions/")
+    assert res.status_code == 404
+
+
+def test_recipe_retrieve_without_versions(
+    client: Client, user: User, team: Team, recipe: Recipe
+) -> None:
+    save_recipe_version(recipe_id=recipe.id, actor=user)
+    client.force_login(user)
+
+    res = client.get(f"/api/v1/recipes/{recipe.id}/", {"include_versions": False})
+    assert res.status_code == 200
+    assert res.json()["versions"] == []
+
+    res = client.patch(
+        f"/api/v1/recipes/{recipe.id}/",
+        {"name": "updated", "include_versions": False},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    assert res.json()["name"] == "updated"
+    assert res.json()["versions"] == []
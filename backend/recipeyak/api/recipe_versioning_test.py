@@ -1,7 +1,24 @@
+import threading
+from typing import Any
+
 import pytest
+from django.db import connection, transaction
 from django.test.client import Client
 
-from recipeyak.fixtures import create_recipe, create_team, create_user
+from recipeyak import versioning
+from recipeyak.api.serializers.recipe import get_recipe_versions
+from recipeyak.fixtures import (
+    create_ingredient,
+    create_recipe,
+    create_team,
+    create_user,
+)
+from recipeyak.models import (
+    IngredientHistorical,
+    Recipe,
+    SectionHistorical,
+    StepHistorical,
+)
 from recipeyak.models.recipe_historical import RecipeHistorical
 
 pytestmark = pytest.mark.django_db
@@ -212,3 +229,176 @@ def test_ingredient_delete_saves_version() -> None:
 
     assert res.status_code == 204
     assert RecipeHistorical.objects.filter(recipe_id=recipe.id).count() == before + 1
+
+
+def test_version_only_stores_changed_items() -> None:
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    ingredient = recipe.ingredient_set.all()[:1].get()
+    step = recipe.step_set.all()[:1].get()
+    client.force_login(user)
+
+    res = client.patch(
+        f"/api/v1/ingredients/{ingredient.id}/",
+        {"name": "Updated ingredient name"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    res = client.delete(f"/api/v1/steps/{step.id}/")
+    assert res.status_code == 204
+
+    first, update, delete = RecipeHistorical.objects.filter(
+        recipe_id=recipe.id
+    ).order_by("id")
+    assert first.is_snapshot
+    assert not update.is_snapshot
+    assert not delete.is_snapshot
+    assert list(
+        IngredientHistorical.objects.filter(recipe_historical=update).values_list(
+            "ingredient_id", "name"
+        )
+    ) == [(ingredient.id, "Updated ingredient name")]
+    assert not SectionHistorical.objects.filter(recipe_historical=update).exists()
+    assert not StepHistorical.objects.filter(recipe_historical=update).exists()
+    assert list(
+        StepHistorical.objects.filter(recipe_historical=delete).values_list(
+            "step_id", "deleted"
+        )
+    ) == [(step.id, True)]
+
+
+def _current_items(recipe: Recipe) -> dict[str, list[dict[str, Any]]]:
+    ingredients: list[dict[str, Any]] = [
+        {
+            "id": ingredient.id,
+            "type": "ingredient",
+            "description": ingredient.description,
+            "quantity": ingredient.quantity,
+            "name": ingredient.name,
+            "position": ingredient.position,
+            "optional": ingredient.optional,
+        }
+        for ingredient in recipe.ingredient_set.all()
+    ]
+    ingredients += [
+        {
+            "id": section.id,
+            "type": "section",
+            "title": section.title,
+            "position": section.position,
+        }
+        for section in recipe.section_set.all()
+    ]
+    return {
+        "ingredients": sorted(ingredients, key=lambda x: x["position"]),
+        "steps": [
+            {"id": step.id, "text": step.text, "position": step.position}
+            for step in recipe.step_set.order_by("position")
+        ],
+    }
+
+
+def test_versions_rebuilt_from_deltas(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Every version, whether a snapshot or delta, has the items the recipe had
+    when it was saved.
+    """
+    monkeypatch.setattr(versioning, "SNAPSHOT_INTERVAL", 3)
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    client.force_login(user)
+    expected = [_current_items(recipe)]
+
+    def edit(method: str, url: str, data: dict[str, Any] | None = None) -> None:
+        res = getattr(client, method)(url, data, content_type="application/json")
+        assert res.status_code in {200, 204}
+        expected.append(_current_items(recipe))
+
+    ingredient = recipe.ingredient_set.all()[:1].get()
+    section = recipe.section_set.all()[:1].get()
+    step = recipe.step_set.all()[:1].get()
+    edit("patch", f"/api/v1/ingredients/{ingredient.id}/", {"name": "salt"})
+    edit(
+        "post",
+        f"/api/v1/recipes/{recipe.id}/ingredients/",
+        {"quantity": "1 cup", "name": "cilantro", "description": "", "position": "z"},
+    )
+    edit("patch", f"/api/v1/steps/{step.id}/", {"text": "boil"})
+    edit("delete", f"/api/v1/ingredients/{ingredient.id}/")
+    edit("patch", f"/api/v1/sections/{section.id}/", {"title": "sauce"})
+    edit(
+        "post",
+        f"/api/v1/recipes/{recipe.id}/steps/",
+        {"text": "serve", "position": "zz"},
+    )
+    edit("delete", f"/api/v1/sections/{section.id}/")
+    edit("delete", f"/api/v1/steps/{step.id}/")
+    edit("patch", f"/api/v1/recipes/{recipe.id}/", {"name": "renamed"})
+
+    assert list(
+        RecipeHistorical.objects.filter(recipe_id=recipe.id)
+        .order_by("id")
+        .values_list("is_snapshot", flat=True)
+    ) == [True, False, False] * 3 + [True]
+    versions = get_recipe_versions(recipe_id=recipe.id, before_id=None, limit=100)
+    assert [
+        {
+            "ingredients": [x.model_dump() for x in version.ingredients],
+            "steps": [x.model_dump() for x in version.steps],
+        }
+        for version in reversed(versions)
+    ] == expected
+
+
+@pytest.mark.django_db(transaction=True)
+def test_save_recipe_version_concurrent_child_inserts() -> None:
+    """
+    Two transactions that each add an ingredient then save a version don't
+    deadlock, inserting the ingredients holds a `for key share` lock on the
+    recipe.
+    """
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    version_count = RecipeHistorical.objects.filter(recipe_id=recipe.id).count()
+    inserted = [threading.Event(), threading.Event()]
+    errors = list[BaseException]()
+    ingredient_ids = list[int]()
+
+    def edit(index: int) -> None:
+        try:
+            with transaction.atomic():
+                ingredient = create_ingredient(
+                    recipe=recipe,
+                    quantity="1",
+                    name=f"ingredient {index}",
+                    position=f"z{index}",
+                )
+                ingredient_ids.append(ingredient.id)
+                inserted[index].set()
+                assert inserted[1 - index].wait(timeout=5)
+                versioning.save_recipe_version(recipe_id=recipe.id, actor=user)
+        except BaseException as e:  # noqa: BLE001
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=edit, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert errors == []
+
+    versions = RecipeHistorical.objects.filter(recipe_id=recipe.id).order_by("id")
+    assert versions.count() == version_count + 2
+    # the second delta is against the first, so between them they have both
+    assert sorted(
+        IngredientHistorical.objects.filter(
+            recipe_historical__in=list(versions)[-2:]
+        ).values_list("ingredient_id", flat=True)
+    ) == sorted(ingredient_ids)
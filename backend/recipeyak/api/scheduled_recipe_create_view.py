@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import date
 
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from recipeyak.api.base.decorators import endpoint
@@ -29,14 +30,14 @@ def scheduled_recipe_create_view(
 
     recipe = get_object_or_404(filter_recipes(team=team), id=params.recipe)
     calendar = get_pinned_calendar(request.user, team.id)
-    scheduled_recipe = recipe.schedule(
-        on=params.on,
-        user=request.user,
-        team=get_object_or_404(get_teams(request.user), pk=team.id),
-    )
-    res = serialize_scheduled_recipe(
-        scheduled_recipe, user_id=request.user.id, team_id=team.id
-    )
-
-    publish_calendar_event(res, team_id=team.id, calendar_id=calendar.id)
+    with transaction.atomic():
+        scheduled_recipe = recipe.schedule(
+            on=params.on,
+            user=request.user,
+            team=get_object_or_404(get_teams(request.user), pk=team.id),
+        )
+        res = serialize_scheduled_recipe(
+            scheduled_recipe, user_id=request.user.id, team_id=team.id
+        )
+        publish_calendar_event(res, team_id=team.id, calendar_id=calendar.id)
     return res
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from pydantic import StringConstraints
+
+from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.exceptions import APIError
+from recipeyak.api.base.request import AuthedHttpRequest
+from recipeyak.api.base.serialization import Params
+from recipeyak.api.scrape_job_retrieve_view import (
+    ScrapeJobSerializer,
+    serialize_scrape_job,
+)
+from recipeyak.models import ScrapeJob, Team
+
+
+class ScrapeJobCreateParams(Params):
+    team: int
+    url: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+
+@endpoint()
+def scrape_job_create_view(
+    request: AuthedHttpRequest, params: ScrapeJobCreateParams
+) -> ScrapeJobSerializer:
+    """
+    Import a recipe from a url in the background, poll
+    `scrape_job_retrieve_view` for the recipe.
+    """
+    team = Team.objects.filter(id=params.team, membership__user=request.user).first()
+    if team is None:
+        raise APIError(code="unknown_team", message="Unknown Team")
+    scrape_job = ScrapeJob.objects.create(
+        url=params.url, team=team, created_by=request.user
+    )
+    return serialize_scrape_job(scrape_job, user=request.user)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+import requests
+import structlog
+from django.test.client import Client
+from django.utils import timezone
+
+from recipeyak.jobs.scrape_queue import (
+    MAX_ATTEMPTS,
+    STALE_JOB_AGE,
+    claim_job,
+    requeue_stale_jobs,
+    run_job,
+)
+from recipeyak.models import Membership, Recipe, ScrapeJob, Team, TimelineEvent, User
+from recipeyak.scraper.scrape_recipe import ScrapeResult
+
+pytestmark = pytest.mark.django_db
+
+URL = "https://cooking.nytimes.com/recipes/1021424-amus-chicken-korma"
+SCRAPE_RESULT = ScrapeResult(
+    title="Amu's Chicken Korma",
+    total_time=None,
+    yields=None,
+    image=None,
+    upload_id=None,
+    instructions=["cook"],
+    ingredient_groups=[],
+    author=None,
+    canonical_url=URL,
+)
+
+
+def _run_next_job() -> None:
+    scrape_job = claim_job()
+    assert scrape_job is not None
+    assert scrape_job.status == "running"
+    run_job(scrape_job, log=structlog.stdlib.get_logger())
+
+
+def test_scrape_job(client: Client, user: User, team: Team) -> None:
+    client.force_login(user)
+
+    res = client.post(
+        "/api/v1/scrape-jobs/",
+        {"team": team.id, "url": URL},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    assert res.json() == {
+        "id": res.json()["id"],
+        "status": "queued",
+        "recipe": None,
+        "error": None,
+    }
+    scrape_job_id = res.json()["id"]
+
+    with patch(
+        "recipeyak.api.recipe_create_view.scrape_recipe",
+        return_value=SCRAPE_RESULT,
+    ):
+        _run_next_job()
+    assert claim_job() is None, "queue should be empty"
+
+    res = client.get(f"/api/v1/scrape-jobs/{scrape_job_id}/")
+    assert res.status_code == 200
+    assert res.json()["status"] == "succeeded"
+    assert res.json()["error"] is None
+    recipe = Recipe.objects.get(id=res.json()["recipe"]["id"])
+    assert recipe.name == "Amu's Chicken Korma"
+    assert recipe.team == team
+    assert TimelineEvent.objects.filter(
+        recipe=recipe, action="created", created_by=user
+    ).exists()
+
+
+def test_scrape_job_failed(client: Client, user: User, team: Team) -> None:
+    client.force_login(user)
+    res = client.post(
+        "/api/v1/scrape-jobs/",
+        {"team": team.id, "url": URL},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    scrape_job_id = res.json()["id"]
+
+    with patch(
+        "recipeyak.api.recipe_create_view.scrape_recipe",
+        side_effect=requests.exceptions.ConnectionError(),
+    ):
+        _run_next_job()
+
+    res = client.get(f"/api/v1/scrape-jobs/{scrape_job_id}/")
+    assert res.status_code == 200
+    assert res.json()["status"] == "failed"
+    assert res.json()["recipe"] is None
+    assert res.json()["error"] == {
+        "code": "connection_error",
+        "message": "Problem connecting to url.",
+    }
+
+
+def test_scrape_job_permissions(
+    client: Client, user: User, user2: User, team: Team
+) -> None:
+    client.force_login(user2)
+    res = client.post(
+        "/api/v1/scrape-jobs/",
+        {"team": team.id, "url": URL},
+        content_type="application/json",
+    )
+    assert res.status_code == 400
+    assert res.json()["error"]["code"] == "unknown_team"
+
+    scrape_job = ScrapeJob.objects.create(url=URL, team=team, created_by=user)
+    res = client.get(f"/api/v1/scrape-jobs/{scrape_job.id}/")
+    assert res.status_code == 404, "can only see our own jobs"
+
+
+def test_requeue_stale_jobs(user: User, team: Team) -> None:
+    """
+    Jobs abandoned by a worker are run again, until they run out of attempts.
+    """
+    scrape_job = ScrapeJob.objects.create(url=URL, team=team, created_by=user)
+    log = structlog.stdlib.get_logger()
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        claimed_job = claim_job()
+        assert claimed_job is not None
+        assert claimed_job.attempts == attempt
+        # the worker exits mid-scrape
+        ScrapeJob.objects.filter(id=scrape_job.id).update(
+            started_at=timezone.now() - STALE_JOB_AGE - timedelta(seconds=1)
+        )
+        requeue_stale_jobs(log=log)
+
+    scrape_job.refresh_from_db()
+    assert scrape_job.status == "failed"
+    assert scrape_job.error_code == "scrape_timeout"
+    assert scrape_job.finished_at is not None
+    assert claim_job() is None
+
+
+def test_scrape_job_requeued_while_running(user: User, team: Team) -> None:
+    """
+    A job requeued while its worker was still scraping keeps its new status,
+    and the rerun picks up the recipe the first worker created.
+    """
+    scrape_job = ScrapeJob.objects.create(url=URL, team=team, created_by=user)
+    log = structlog.stdlib.get_logger()
+    claimed_job = claim_job()
+    assert claimed_job is not None
+    ScrapeJob.objects.filter(id=scrape_job.id).update(
+        started_at=timezone.now() - STALE_JOB_AGE - timedelta(seconds=1)
+    )
+    requeue_stale_jobs(log=log)
+
+    with patch(
+        "recipeyak.api.recipe_create_view.scrape_recipe", return_value=SCRAPE_RESULT
+    ):
+        run_job(claimed_job, log=log)
+        scrape_job.refresh_from_db()
+        assert scrape_job.status == "queued"
+        assert scrape_job.recipe is None
+
+        _run_next_job()
+    scrape_job.refresh_from_db()
+    assert scrape_job.status == "succeeded"
+    assert scrape_job.recipe == Recipe.objects.get(team=team, source=URL)
+
+
+def test_scrape_job_creator_left_team(user: User, team: Team) -> None:
+    """
+    Membership is checked again when the job runs, not just when it's queued.
+    """
+    scrape_job = ScrapeJob.objects.create(url=URL, team=team, created_by=user)
+    Membership.objects.filter(team=team, user=user).delete()
+
+    with patch(
+        "recipeyak.api.recipe_create_view.scrape_recipe", return_value=SCRAPE_RESULT
+    ) as scrape_recipe:
+        _run_next_job()
+    assert not scrape_recipe.called
+
+    scrape_job.refresh_from_db()
+    assert scrape_job.status == "failed"
+    assert scrape_job.error_code == "unknown_team"
+    assert scrape_job.recipe is None
+    assert not Recipe.objects.filter(team=team).exists()
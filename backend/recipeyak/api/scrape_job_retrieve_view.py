@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pydantic
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from recipeyak.api.base.decorators import endpoint
+from recipeyak.api.base.request import AuthedHttpRequest
+from recipeyak.api.base.serialization import Params
+from recipeyak.api.serializers.recipe import (
+    RecipeSerializer,
+    serialize_recipe_detail,
+)
+from recipeyak.models import ScrapeJob, User
+from recipeyak.models.scrape_job import ScrapeJobStatus
+
+
+class ScrapeJobError(pydantic.BaseModel):
+    code: str
+    message: str
+
+
+class ScrapeJobSerializer(pydantic.BaseModel):
+    id: int
+    status: ScrapeJobStatus
+    # set once the job has succeeded
+    recipe: RecipeSerializer | None
+    # set if the job failed
+    error: ScrapeJobError | None
+
+
+def serialize_scrape_job(scrape_job: ScrapeJob, *, user: User) -> ScrapeJobSerializer:
+    recipe = None
+    if scrape_job.recipe_id is not None:
+        recipe = serialize_recipe_detail(
+            recipe_id=scrape_job.recipe_id, team_id=scrape_job.team_id, user=user
+        )
+        if recipe is None:
+            # the recipe was moved to another team
+            raise Http404
+    return ScrapeJobSerializer(
+        id=scrape_job.id,
+        status=scrape_job.status,  # type: ignore[arg-type]
+        recipe=recipe,
+        error=ScrapeJobError(
+            code=scrape_job.error_code, message=scrape_job.error_message or ""
+        )
+        if scrape_job.error_code is not None
+        else None,
+    )
+
+
+class ScrapeJobRetrieveParams(Params):
+    scrape_job_id: int
+
+
+@endpoint()
+def scrape_job_retrieve_view(
+    request: AuthedHttpRequest, params: ScrapeJobRetrieveParams
+) -> ScrapeJobSerializer:
+    scrape_job = get_object_or_404(
+        ScrapeJob,
+        id=params.scrape_job_id,
+        created_by=request.user,
+    )
+    return serialize_scrape_job(scrape_job, user=request.user)
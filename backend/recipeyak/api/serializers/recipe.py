@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import UTC, date, datetime, timedelta
-from typing import Annotated, Literal, cast
+from typing import Annotated, Any, Literal, cast
 
 import pydantic
 import tldextract
@@ -20,7 +20,7 @@ from recipeyak.models import (
 from recipeyak.models.reaction import Reaction
 from recipeyak.models.recipe_favorite import RecipeFavorite
 from recipeyak.models.timeline_event import TimelineEvent
-from recipeyak.models.upload import Upload
+from recipeyak.models.upload import Upload, public_url
 from recipeyak.models.user import get_avatar_url
 
 IGNORED_TIMELINE_EVENTS = {"set_primary_image", "remove_primary_image"}
@@ -305,7 +305,9 @@ class RecipeSerializer(pydantic.BaseModel):
     ]
     versions: Annotated[
         list[RecipeVersionResponse],
-        Field(description="The previous versions of the Recipe."),
+        Field(
+            description="The previous versions of the Recipe, empty if `include_versions` is false."
+        ),
     ]
 
 
@@ -396,11 +398,43 @@ def serialize_section(section: Section) -> SectionSerializer:
     )
 
 
-def _get_versions(recipe_id: int) -> list[RecipeVersionResponse]:
-    with connection.cursor() as cur:
-        cur.execute(
-            """
-select 
+def _in_recipe_version(table: str, item_id: str) -> str:
+    """
+    Filter `table` to the items of the `recipe_historical` version.
+
+    Versions only store the items that changed, so we take the latest row of
+    each item from the version, back to the last snapshot, see `versioning.py`.
+    """
+    return f"""
+    {table}.recipe_historical_id in (
+      select chain.id
+      from recipe_historical chain
+      where chain.recipe_id = recipe_historical.recipe_id
+        and chain.id <= recipe_historical.id
+        and chain.id >= (
+          select max(snapshot.id)
+          from recipe_historical snapshot
+          where snapshot.recipe_id = recipe_historical.recipe_id
+            and snapshot.is_snapshot
+            and snapshot.id <= recipe_historical.id
+        )
+    )
+    and not {table}.deleted
+    and not exists (
+      select 1
+      from {table} later
+      join recipe_historical later_version
+        on later_version.id = later.recipe_historical_id
+      where later.{item_id} = {table}.{item_id}
+        and later_version.recipe_id = recipe_historical.recipe_id
+        and later.recipe_historical_id > {table}.recipe_historical_id
+        and later.recipe_historical_id <= recipe_historical.id
+    )
+"""
+
+
+# `json_object` for a `recipe_historical` row, matches `RecipeVersionResponse`
+_RECIPE_VERSION_JSON = f"""
   json_object(
     'id': recipe_historical.id,
     'created_at': recipe_historical.created,
@@ -453,8 +487,7 @@ select
             ) as ingredient
           from
             ingredient_historical
-          where
-            ingredient_historical.recipe_historical_id = recipe_historical.id
+          where {_in_recipe_version("ingredient_historical", "ingredient_id")}
           union all (
             select
               json_object(
@@ -465,8 +498,7 @@ select
              ) AS ingredient
            from
             section_historical
-           where
-            section_historical.recipe_historical_id = recipe_historical.id
+           where {_in_recipe_version("section_historical", "section_id")}
           )
        )
       order by 
@@ -484,13 +516,20 @@ select
           ) AS step
         from
           step_historical
-        where
-          step_historical.recipe_historical_id = recipe_historical.id
+        where {_in_recipe_version("step_historical", "step_id")}
         order by
           position asc
       ) sub
   )
 )
+"""
+
+
+def _get_versions(recipe_id: int) -> list[RecipeVersionResponse]:
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+select {_RECIPE_VERSION_JSON}
 from recipe_historical 
 join core_recipe on core_recipe.id = recipe_historical.recipe_id
 where core_recipe.id = %(recipe_id)s
@@ -509,6 +548,35 @@ order by recipe_historical.created desc
         return out
 
 
+def get_recipe_versions(
+    *, recipe_id: int, before_id: int | None, limit: int
+) -> list[RecipeVersionResponse]:
+    """
+    Newest first, starting after the version with `before_id`, if provided.
+    """
+    with connection.cursor() as cur:
+        cur.execute(
+            f"""
+select {_RECIPE_VERSION_JSON}
+from recipe_historical
+where recipe_historical.recipe_id = %(recipe_id)s
+  and (
+    %(before_id)s::bigint is null
+    or (recipe_historical.created, recipe_historical.id) < (
+      select created, id
+      from recipe_historical
+      where id = %(before_id)s
+        and recipe_id = %(recipe_id)s
+    )
+  )
+order by recipe_historical.created desc, recipe_historical.id desc
+limit %(limit)s
+""",
+            {"recipe_id": recipe_id, "before_id": before_id, "limit": limit},
+        )
+        return [RecipeVersionResponse.model_validate(row[0]) for row in cur.fetchall()]
+
+
 def serialize_recipe(recipe: Recipe, user: User) -> RecipeSerializer:
     ingredients = [serialize_ingredient(x) for x in recipe.ingredient_set.all()]
     steps = [serialize_step(x) for x in recipe.step_set.all()]
@@ -544,3 +612,397 @@ def serialize_recipe(recipe: Recipe, user: User) -> RecipeSerializer:
         user_favorite=RecipeFavorite.objects.filter(recipe=recipe, user=user).exists(),
         versions=versions,
     )
+
+
+def _public_user_json(user_id: str) -> str:
+    """
+    `PublicUser`, minus the `avatar_url` which `_set_avatar_url` fills in from
+    the `profile_upload_key` so it matches `get_avatar_url`.
+    """
+    return f"""(
+      select json_object(
+        'id': core_myuser.id,
+        'name': coalesce(nullif(core_myuser.name, ''), core_myuser.email),
+        'email': core_myuser.email,
+        'profile_upload_key': core_upload.key
+      )
+      from core_myuser
+      left join core_upload on core_upload.id = core_myuser.profile_upload_id
+      where core_myuser.id = {user_id}
+    )"""
+
+
+_RECIPE_DETAIL_SQL = f"""
+select
+  json_object(
+    'id': core_recipe.id,
+    'name': core_recipe.name,
+    'author': core_recipe.author,
+    'source': core_recipe.source,
+    'time': core_recipe.time,
+    'servings': core_recipe.servings,
+    'modified': core_recipe.modified,
+    'created': core_recipe.created,
+    'archived_at': core_recipe.archived_at,
+    'tags': core_recipe.tags,
+    'ingredients': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': core_ingredient.id,
+            'quantity': core_ingredient.quantity,
+            'name': core_ingredient.name,
+            'description': core_ingredient.description,
+            'position': core_ingredient.position,
+            'optional': core_ingredient.optional
+          )
+          order by core_ingredient.position
+        ),
+        '[]'::json
+      )
+      from core_ingredient
+      where core_ingredient.recipe_id = core_recipe.id
+    ),
+    'steps': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': core_step.id,
+            'text': core_step.text,
+            'position': core_step.position
+          )
+          order by core_step.position
+        ),
+        '[]'::json
+      )
+      from core_step
+      where core_step.recipe_id = core_recipe.id
+    ),
+    'sections': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': core_section.id,
+            'title': core_section.title,
+            'position': core_section.position
+          )
+          order by core_section.position
+        ),
+        '[]'::json
+      )
+      from core_section
+      where core_section.recipe_id = core_recipe.id
+    ),
+    'recentSchedules': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': core_scheduledrecipe.id,
+            'on': core_scheduledrecipe."on"
+          )
+          order by core_scheduledrecipe."on" desc
+        ),
+        '[]'::json
+      )
+      from core_scheduledrecipe
+      where core_scheduledrecipe.recipe_id = core_recipe.id
+        and core_scheduledrecipe.calendar_id = %(calendar_id)s
+        and core_scheduledrecipe."on" >= %(schedules_start)s::date
+        and core_scheduledrecipe."on" <= %(schedules_end)s::date
+    ),
+    'notes': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': core_note.id::text,
+            'type': 'note',
+            'text': core_note.text,
+            'created_by': {_public_user_json("core_note.created_by_id")},
+            'created': core_note.created,
+            'modified': core_note.modified,
+            'attachments': (
+              select coalesce(
+                json_agg(
+                  json_object(
+                    'id': core_upload.id::text,
+                    'type': 'upload',
+                    'key': core_upload.key,
+                    'backgroundUrl': core_upload.background_url,
+                    'contentType': core_upload.content_type,
+                    'isPrimary': coalesce(
+                      core_upload.id = core_recipe.primary_image_id, false
+                    )
+                  )
+                  order by core_upload.id
+                ),
+                '[]'::json
+              )
+              from core_upload
+              where core_upload.note_id = core_note.id
+            ),
+            'reactions': (
+              select coalesce(
+                json_agg(
+                  json_object(
+                    'id': core_reaction.id::text,
+                    'type': core_reaction.emoji,
+                    'note_id': core_reaction.note_id,
+                    'user': {_public_user_json("core_reaction.created_by_id")},
+                    'created': core_reaction.created
+                  )
+                  order by core_reaction.created desc
+                ),
+                '[]'::json
+              )
+              from core_reaction
+              where core_reaction.note_id = core_note.id
+            )
+          )
+          order by core_note.created desc
+        ),
+        '[]'::json
+      )
+      from core_note
+      where core_note.recipe_id = core_recipe.id
+    ),
+    'timeline_events': (
+      select coalesce(
+        json_agg(
+          json_object(
+            'id': timeline_event.id,
+            'type': 'recipe',
+            'action': timeline_event.action,
+            'created_by': {_public_user_json("timeline_event.created_by_id")},
+            'is_scraped': core_recipe.scrape_id is not null,
+            'created': timeline_event.created
+          )
+          order by timeline_event.created desc
+        ),
+        '[]'::json
+      )
+      from timeline_event
+      where timeline_event.recipe_id = core_recipe.id
+        and not timeline_event.action = any(%(ignored_timeline_events)s)
+    ),
+    'primaryImage': (
+      select json_object(
+        'id': core_upload.id::text,
+        'key': core_upload.key,
+        'backgroundUrl': core_upload.background_url,
+        'contentType': core_upload.content_type,
+        'author': core_myuser.name,
+        'created_by_id': core_upload.created_by_id,
+        'recipe_source': upload_recipe.source
+      )
+      from core_upload
+      left join core_myuser on core_myuser.id = core_upload.created_by_id
+      left join core_recipe upload_recipe on upload_recipe.id = core_upload.recipe_id
+      where core_upload.id = core_recipe.primary_image_id
+    ),
+    'user_favorite': exists (
+      select 1
+      from recipe_favorite
+      where recipe_favorite.recipe_id = core_recipe.id
+        and recipe_favorite.user_id = %(user_id)s
+    ),
+    'versions': case when %(include_versions)s then (
+      select coalesce(
+        json_agg({_RECIPE_VERSION_JSON} order by recipe_historical.created desc),
+        '[]'::json
+      )
+      from recipe_historical
+      where recipe_historical.recipe_id = core_recipe.id
+    ) else '[]'::json end
+  )
+from core_recipe
+where core_recipe.id = %(recipe_id)s
+  and core_recipe.team_id = %(team_id)s
+"""
+
+
+def _set_avatar_url(user: dict[str, Any] | None) -> None:
+    if user is not None:
+        user["avatar_url"] = get_avatar_url(
+            email=user["email"], profile_upload_key=user["profile_upload_key"]
+        )
+
+
+def serialize_recipe_detail(
+    *, recipe_id: int, team_id: int, user: User, include_versions: bool = True
+) -> RecipeSerializer | None:
+    """
+    Equivalent to `serialize_recipe`, but built in a single query instead of
+    the prefetches & version query. Returns None if the team doesn't have the
+    recipe.
+
+    With `include_versions=False`, `versions` is left empty, callers can page
+    through them with `get_recipe_versions` instead.
+    """
+    now = datetime.now(UTC).date()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _RECIPE_DETAIL_SQL,
+            {
+                "recipe_id": recipe_id,
+                "team_id": team_id,
+                "user_id": user.id,
+                "calendar_id": user.pinned_calendar_id,
+                "schedules_start": (now - timedelta(weeks=3)).isoformat(),
+                "schedules_end": (now + timedelta(weeks=3)).isoformat(),
+                "ignored_timeline_events": list(IGNORED_TIMELINE_EVENTS),
+                "include_versions": include_versions,
+            },
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    assert user.pinned_calendar_id is not None
+    recipe = row[0]
+
+    # The bits we can't do in postgres, URLs are built with yarl which quotes
+    # some characters & the upload author uses tldextract.
+    for note in recipe["notes"]:
+        _set_avatar_url(note["created_by"])
+        for attachment in note["attachments"]:
+            attachment["url"] = public_url(attachment["key"])
+        for reaction in note["reactions"]:
+            _set_avatar_url(reaction["user"])
+    for timeline_event in recipe["timeline_events"]:
+        _set_avatar_url(timeline_event["created_by"])
+    recipe["timelineItems"] = recipe.pop("notes") + recipe.pop("timeline_events")
+    primary_image = recipe["primaryImage"]
+    if primary_image is not None:
+        primary_image["url"] = public_url(primary_image["key"])
+        if primary_image["created_by_id"] is None:
+            source = primary_image["recipe_source"]
+            primary_image["author"] = (
+                # added by scraper
+                tldextract.extract(source).domain
+                if source is not None and source.startswith("http")
+                else None
+            )
+
+    return RecipeSerializer.model_validate(recipe)
+
+
+_RECIPE_DETAIL_VERSION_SQL = """
+select
+  md5(
+    concat_ws(
+      ':',
+      core_recipe.modified,
+      core_recipe.primary_image_id,
+      (
+        select concat(count(*), '/', max(modified))
+        from core_ingredient
+        where core_ingredient.recipe_id = core_recipe.id
+      ),
+      (
+        select concat(count(*), '/', max(modified))
+        from core_step
+        where core_step.recipe_id = core_recipe.id
+      ),
+      (
+        select concat(count(*), '/', max(modified))
+        from core_section
+        where core_section.recipe_id = core_recipe.id
+      ),
+      (
+        select concat(count(*), '/', max(modified))
+        from core_note
+        where core_note.recipe_id = core_recipe.id
+      ),
+      (
+        select concat(count(*), '/', max(core_reaction.modified))
+        from core_reaction
+        join core_note on core_note.id = core_reaction.note_id
+        where core_note.recipe_id = core_recipe.id
+      ),
+      -- image placeholders are backfilled without touching `modified`, see
+      -- `jobs/backfill_image_placeholders.py`, so include the image fields.
+      (
+        select string_agg(
+          concat_ws('/', core_upload.id, core_upload.modified, core_upload.key, core_upload.background_url),
+          ',' order by core_upload.id
+        )
+        from core_upload
+        left join core_note on core_note.id = core_upload.note_id
+        where core_note.recipe_id = core_recipe.id
+          or core_upload.id = core_recipe.primary_image_id
+      ),
+      (
+        select concat(count(*), '/', max(modified))
+        from timeline_event
+        where timeline_event.recipe_id = core_recipe.id
+      ),
+      (
+        select concat(count(*), '/', max(modified))
+        from core_scheduledrecipe
+        where core_scheduledrecipe.recipe_id = core_recipe.id
+          and core_scheduledrecipe.calendar_id = %(calendar_id)s
+      ),
+      (
+        select concat(count(*), '/', max(id))
+        from recipe_historical
+        where recipe_historical.recipe_id = core_recipe.id
+      ),
+      exists (
+        select 1
+        from recipe_favorite
+        where recipe_favorite.recipe_id = core_recipe.id
+          and recipe_favorite.user_id = %(user_id)s
+      ),
+      -- names & avatars of everyone shown on the recipe
+      (
+        select string_agg(
+          concat_ws('/', core_myuser.id, core_myuser.name, core_myuser.email, core_myuser.profile_upload_id),
+          ',' order by core_myuser.id
+        )
+        from core_myuser
+        where core_myuser.id in (
+          select created_by_id from core_note where core_note.recipe_id = core_recipe.id
+          union
+          select core_reaction.created_by_id
+          from core_reaction
+          join core_note on core_note.id = core_reaction.note_id
+          where core_note.recipe_id = core_recipe.id
+          union
+          select created_by_id from timeline_event where timeline_event.recipe_id = core_recipe.id
+          union
+          select actor_id from recipe_historical where recipe_historical.recipe_id = core_recipe.id
+          union
+          select created_by_id from core_upload where core_upload.id = core_recipe.primary_image_id
+        )
+      )
+    )
+  )
+from core_recipe
+where core_recipe.id = %(recipe_id)s
+  and core_recipe.team_id = %(team_id)s
+"""
+
+
+def get_recipe_detail_version(
+    *, recipe_id: int, team_id: int, user: User
+) -> str | None:
+    """
+    Changes whenever `serialize_recipe_detail` would return something
+    different, without building the recipe.
+
+    Deletes don't leave behind a modification time, so we include counts.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _RECIPE_DETAIL_VERSION_SQL,
+            {
+                "recipe_id": recipe_id,
+                "team_id": team_id,
+                "user_id": user.id,
+                "calendar_id": user.pinned_calendar_id,
+            },
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    # recent schedules are relative to today
+    return f"{row[0]}:{user.pinned_calendar_id}:{datetime.now(UTC).date()}"
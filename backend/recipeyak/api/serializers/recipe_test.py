@@ -0,0 +1,124 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from recipeyak.api.base.json import json_dumps
+from recipeyak.api.serializers.recipe import serialize_recipe, serialize_recipe_detail
+from recipeyak.models import (
+    Calendar,
+    Note,
+    Reaction,
+    Recipe,
+    RecipeFavorite,
+    ScheduledRecipe,
+    Section,
+    Team,
+    TimelineEvent,
+    Upload,
+    User,
+    filter_recipe_or_404,
+)
+from recipeyak.versioning import save_recipe_version
+
+pytestmark = pytest.mark.django_db
+
+
+def _assert_parity(*, recipe: Recipe, team: Team, user: User) -> None:
+    expected = serialize_recipe(
+        filter_recipe_or_404(recipe_id=recipe.id, team=team), user=user
+    )
+    actual = serialize_recipe_detail(recipe_id=recipe.id, team_id=team.id, user=user)
+    assert actual is not None
+    assert json_dumps(actual) == json_dumps(expected)
+
+
+def test_serialize_recipe_detail_matches_serialize_recipe(
+    user: User, user2: User, team: Team, recipe: Recipe
+) -> None:
+    _assert_parity(recipe=recipe, team=team, user=user)
+
+    user2.name = ""
+    user2.profile_upload = Upload.objects.create(
+        created_by=user2, bucket="bucket", key="profile/with space é.png"
+    )
+    user2.save()
+    Section.objects.create(recipe=recipe, title="for the sauce", position="b")
+
+    note = Note.objects.create(text="first note", created_by=user, recipe=recipe)
+    other_note = Note.objects.create(text="second", created_by=user2, recipe=recipe)
+    other_note.created = note.created + timedelta(seconds=1)
+    other_note.save()
+    Upload.objects.create(
+        created_by=user,
+        bucket="bucket",
+        key="1/abc/photo.jpg",
+        background_url="data:image/jpeg;base64,abc",
+        content_type="image/jpeg",
+        note=note,
+        recipe=recipe,
+    )
+    primary_image = Upload.objects.create(
+        created_by=None,
+        bucket="bucket",
+        key="scraper/def.jpg",
+        content_type="image/jpeg",
+        note=note,
+        recipe=recipe,
+    )
+    reaction = Reaction.objects.create(emoji="❤️", created_by=user2, note=note)
+    Reaction.objects.create(
+        emoji="😆", created_by=user, note=note, created=reaction.created + timedelta(1)
+    )
+
+    recipe.source = "https://www.example.com/recipe/123"
+    recipe.primary_image = primary_image
+    recipe.archived_at = datetime(2024, 1, 2, 3, 4, 5, 120000, tzinfo=UTC)
+    recipe.tags = ["dinner", "quick"]
+    recipe.save()
+    now = datetime.now(UTC)
+    for days, action in enumerate(["created", "set_primary_image", "archived"]):
+        TimelineEvent.objects.create(
+            action=action,
+            created_by=user if action != "created" else None,
+            recipe=recipe,
+            created=now + timedelta(days=days),
+        )
+
+    calendar = Calendar.objects.get(team=team)
+    other_calendar = Calendar.objects.create(team=team, name="Other")
+    today = now.date()
+    for days, scheduled_calendar in [
+        (-2, calendar),
+        (1, calendar),
+        (-30, calendar),
+        (30, calendar),
+        (3, other_calendar),
+    ]:
+        ScheduledRecipe.objects.create(
+            recipe=recipe,
+            team=team,
+            on=today + timedelta(days=days),
+            calendar=scheduled_calendar,
+        )
+
+    save_recipe_version(recipe_id=recipe.id, actor=user)
+    save_recipe_version(recipe_id=recipe.id, actor=None)
+    RecipeFavorite.objects.create(recipe=recipe, user=user)
+
+    _assert_parity(recipe=recipe, team=team, user=user)
+
+    # image uploaded by a user
+    primary_image.created_by = user2
+    primary_image.save()
+    _assert_parity(recipe=recipe, team=team, user=user)
+
+
+def test_serialize_recipe_detail_other_team(
+    user: User, user2: User, team: Team, recipe: Recipe
+) -> None:
+    other_team = user2.schedule_team
+    assert other_team is not None
+    assert (
+        serialize_recipe_detail(recipe_id=recipe.id, team_id=other_team.id, user=user)
+        is None
+    )
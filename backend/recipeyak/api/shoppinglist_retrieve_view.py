@@ -1,26 +1,21 @@
 from datetime import date
+from typing import Any
 
 import pydantic
-from django.core.exceptions import ValidationError
-from django.db.models import QuerySet
+from django.db import connection
 from typing_extensions import TypedDict
 
 from recipeyak.api.base.decimal import fmt_decimal
 from recipeyak.api.base.decorators import endpoint
-from recipeyak.api.base.exceptions import APIError
-from recipeyak.api.base.json import json_dumps
+from recipeyak.api.base.json import json_dumps, json_loads
 from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
-from recipeyak.category import category
-from recipeyak.combine import Ingredient, combine_ingredients
-from recipeyak.models import Ingredient as DBIngredient
-from recipeyak.models import (
-    ScheduledRecipe,
-    ShoppingList,
-    Team,
-    get_pinned_calendar,
-    get_team,
+from recipeyak.calendar_day_ingredients import (
+    ensure_built,
+    get_combined_ingredients,
 )
+from recipeyak.category import categorize_many
+from recipeyak.models import ShoppingList, get_pinned_calendar, get_team
 from recipeyak.parsing import Unit
 
 
@@ -31,18 +26,92 @@ class ShoppinglistRetrieveParams(Params):
 
 def get_scheduled_recipes(
     *, params: ShoppinglistRetrieveParams, team_id: int, calendar_id: int
-) -> QuerySet[ScheduledRecipe] | None:
-    team = Team.objects.filter(pk=team_id).first()
-    if team is None:
-        return None
-    try:
-        return (
-            team.scheduledrecipe_set.filter(on__gte=params.start)
-            .filter(on__lte=params.end)
-            .filter(calendar=calendar_id)
+) -> list[dict[str, Any]]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select
+  json_object(
+    'id': scheduled_recipe.id,
+    'recipe_id': recipe.id,
+    'recipe_name': recipe.name
+  )
+from core_scheduledrecipe scheduled_recipe
+join core_recipe recipe on recipe.id = scheduled_recipe.recipe_id
+where scheduled_recipe.team_id = %(team_id)s
+  and scheduled_recipe.calendar_id = %(calendar_id)s
+  and scheduled_recipe."on" >= %(start)s::date
+  and scheduled_recipe."on" <= %(end)s::date
+order by scheduled_recipe."on" desc, scheduled_recipe.id
+""",
+            {
+                "team_id": team_id,
+                "calendar_id": calendar_id,
+                "start": params.start.isoformat(),
+                "end": params.end.isoformat(),
+            },
         )
-    except (ValueError, ValidationError):
-        return None
+        return [row[0] for row in cursor.fetchall()]
+
+
+# Bump when changing how shopping lists are generated to invalidate the cache.
+_CACHE_VERSION = "3"
+
+
+def get_shopping_list_version(
+    *, params: ShoppinglistRetrieveParams, team_id: int, calendar_id: int
+) -> str:
+    """
+    Hash of the modification times of everything that goes into the shopping
+    list, changes to a scheduled recipe, its recipe or its ingredients result
+    in a new version.
+
+    Ingredient deletes don't leave behind a modification time so we also
+    include the count of ingredients.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select
+  md5(
+    coalesce(
+      string_agg(
+        concat_ws(
+          ':',
+          scheduled_recipe.id,
+          scheduled_recipe.modified,
+          recipe.modified,
+          ingredients.count,
+          ingredients.modified
+        ),
+        ','
+        order by scheduled_recipe.id
+      ),
+      ''
+    )
+  )
+from core_scheduledrecipe scheduled_recipe
+join core_recipe recipe on recipe.id = scheduled_recipe.recipe_id
+join lateral (
+  select count(*) count, max(core_ingredient.modified) modified
+  from core_ingredient
+  where core_ingredient.recipe_id = recipe.id
+) ingredients on true
+where scheduled_recipe.team_id = %(team_id)s
+  and scheduled_recipe.calendar_id = %(calendar_id)s
+  and scheduled_recipe."on" >= %(start)s::date
+  and scheduled_recipe."on" <= %(end)s::date
+""",
+            {
+                "team_id": team_id,
+                "calendar_id": calendar_id,
+                "start": params.start.isoformat(),
+                "end": params.end.isoformat(),
+            },
+        )
+        row = cursor.fetchone()
+        assert row is not None
+        return f"{_CACHE_VERSION}:{row[0]}"
 
 
 class ShoppingListRecipe(pydantic.BaseModel):
@@ -67,34 +136,64 @@ class ShoppinglistRetrieveResponse(TypedDict):
     recipes: list[ShoppingListRecipe]
 
 
-@endpoint()
+def _shopping_list_version(
+    request: AuthedHttpRequest, params: ShoppinglistRetrieveParams
+) -> str:
+    team_id = get_team(request.user).id
+    # the view checks the calendar belongs to the team
+    calendar_id = request.user.pinned_calendar_id
+    assert calendar_id is not None
+    version = get_shopping_list_version(
+        params=params, team_id=team_id, calendar_id=calendar_id
+    )
+    return f"{calendar_id}:{version}"
+
+
+@endpoint(version=_shopping_list_version)
 def shoppinglist_retrieve_view(
     request: AuthedHttpRequest, params: ShoppinglistRetrieveParams
 ) -> ShoppinglistRetrieveResponse:
     team_id = get_team(request.user).id
     calendar = get_pinned_calendar(request.user, team_id)
+
+    version = request.response_version or _shopping_list_version(request, params)
+    cached = (
+        ShoppingList.objects.filter(
+            calendar_id=calendar.id,
+            start=params.start,
+            end=params.end,
+            version=version,
+        )
+        .order_by("-created")
+        .first()
+    )
+    if cached is not None and cached.recipes is not None:
+        return {
+            "ingredients": json_loads(cached.ingredients),
+            "recipes": [ShoppingListRecipe.model_validate(r) for r in cached.recipes],
+        }
+
     scheduled_recipes = get_scheduled_recipes(
         params=params, team_id=team_id, calendar_id=calendar.id
     )
-    if scheduled_recipes is None:
-        raise APIError(code="invalid_params", message="Couldn't find scheduled recipes")
     recipes = dict[int, ShoppingListRecipe]()
-    db_ingredients: list[DBIngredient] = []
     for scheduled_recipe in scheduled_recipes:
-        db_ingredients += scheduled_recipe.recipe.ingredient_set.all()
-        recipes[scheduled_recipe.recipe.id] = ShoppingListRecipe(
-            scheduledRecipeId=scheduled_recipe.id,
-            recipeId=scheduled_recipe.recipe.id,
-            recipeName=scheduled_recipe.recipe.name,
+        recipes[scheduled_recipe["recipe_id"]] = ShoppingListRecipe(
+            scheduledRecipeId=scheduled_recipe["id"],
+            recipeId=scheduled_recipe["recipe_id"],
+            recipeName=scheduled_recipe["recipe_name"],
         )
 
-    ingredients = [
-        Ingredient(quantity=i.quantity, name=i.name, description=i.description)
-        for i in db_ingredients
-    ]
-
+    if not calendar.day_ingredients_built:
+        ensure_built(calendar_id=calendar.id)
+    combined = get_combined_ingredients(
+        calendar_id=calendar.id, start=params.start, end=params.end
+    )
+    categories = categorize_many(combined.keys())
     ingredient_mapping: dict[str, IngredientResponse] = {}
-    for ingredient, quantities in combine_ingredients(ingredients).items():
+    for (ingredient, quantities), ingredient_category in zip(
+        combined.items(), categories, strict=True
+    ):
         ingredient_mapping[ingredient] = {
             "quantities": [
                 {
@@ -104,9 +203,16 @@ def shoppinglist_retrieve_view(
                 }
                 for q in quantities
             ],
-            "category": category(ingredient),
+            "category": ingredient_category,
         }
 
-    ShoppingList.objects.create(ingredients=json_dumps(ingredient_mapping).decode())
+    ShoppingList.objects.create(
+        ingredients=json_dumps(ingredient_mapping).decode(),
+        recipes=[r.model_dump() for r in recipes.values()],
+        calendar_id=calendar.id,
+        start=params.start,
+        end=params.end,
+        version=version,
+    )
 
     return {"ingredients": ingredient_mapping, "recipes": list(recipes.values())}
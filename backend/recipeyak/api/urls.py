@@ -42,7 +42,10 @@ from recipeyak.api.recipe_recently_viewed_view import recipe_recently_viewed_vie
 from recipeyak.api.recipe_retrieve_view import recipe_retrieve_view
 from recipeyak.api.recipe_timeline_view import recipe_timeline_view
 from recipeyak.api.recipe_update_view import recipe_update_view
+from recipeyak.api.recipe_version_list_view import recipe_version_list_view
 from recipeyak.api.scheduled_recipe_create_view import scheduled_recipe_create_view
+from recipeyak.api.scrape_job_create_view import scrape_job_create_view
+from recipeyak.api.scrape_job_retrieve_view import scrape_job_retrieve_view
 from recipeyak.api.section_create_view import section_create_view
 from recipeyak.api.section_delete_view import section_delete_view
 from recipeyak.api.section_update_view import section_update_view
@@ -275,6 +278,11 @@ routes = [
         method="get",
         view=recipe_timeline_view,
     ),
+    route(
+        "api/v1/recipes/<int:recipe_id>/versions/",
+        method="get",
+        view=recipe_version_list_view,
+    ),
     route(
         "api/v1/recipes/recently_viewed",
         method="get",
@@ -285,6 +293,16 @@ routes = [
         method="get",
         view=recipe_recently_created_view,
     ),
+    route(
+        "api/v1/scrape-jobs/",
+        method="post",
+        view=scrape_job_create_view,
+    ),
+    route(
+        "api/v1/scrape-jobs/<int:scrape_job_id>/",
+        method="get",
+        view=scrape_job_retrieve_view,
+    ),
     route(
         "api/v1/sections/<int:section_id>/",
         method="delete",
@@ -1,5 +1,7 @@
 from django.contrib.auth import logout
+from django.db import transaction
 
+from recipeyak import calendar_day_ingredients
 from recipeyak.api.base.decorators import endpoint
 from recipeyak.api.base.request import AuthedHttpRequest
 
@@ -8,4 +10,6 @@ from recipeyak.api.base.request import AuthedHttpRequest
 def user_delete_view(request: AuthedHttpRequest, params: None) -> None:
     user = request.user
     logout(request)
-    user.delete()
+    with transaction.atomic():
+        calendar_day_ingredients.remove_user(user_id=user.id)
+        user.delete()
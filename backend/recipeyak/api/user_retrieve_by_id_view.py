@@ -11,6 +11,7 @@ from recipeyak.api.base.request import AuthedHttpRequest
 from recipeyak.api.base.serialization import Params
 from recipeyak.api.unwrap import unwrap
 from recipeyak.models.note import Note
+from recipeyak.models.recipe_stats import RecipeStats
 from recipeyak.models.scheduled_recipe import ScheduledRecipe
 from recipeyak.models.upload import Upload
 from recipeyak.models.user import User, get_avatar_url
@@ -52,25 +53,15 @@ class UserRetrieveByIdResponse(pydantic.BaseModel):
 
 
 def get_recipes_added_count(*, user_id: str) -> int:
-    with connection.cursor() as cursor:
-        cursor.execute(
-            """
-SELECT
-    count(distinct recipe_id) as "total"
-FROM
-    timeline_event
-    JOIN core_recipe ON core_recipe.id = timeline_event.recipe_id
-WHERE
-    action = 'created'
-    AND created_by_id = %(user_id)s;
-""",
-            {"user_id": user_id},
-        )
-        (total,) = unwrap(cursor.fetchone())
-    return total  # type: ignore[no-any-return]
+    return RecipeStats.objects.filter(created_by_id=user_id).count()
 
 
 def get_recipes_archived_count(*, user_id: str) -> int:
+    """
+    Recipes whose latest archive/unarchive by the user was an archive, even if
+    someone else unarchived it since. So this can't use
+    `RecipeStats.archived_by_id`, which only tracks the latest event by anyone.
+    """
     with connection.cursor() as cursor:
         cursor.execute(
             """
@@ -84,9 +75,9 @@ WITH ranked_events AS (
         timeline_event
     WHERE
         action IN ('archived', 'unarchived')
-        and created_by_id = %(user_id)s 
+        and created_by_id = %(user_id)s
 )
-select count(*) as "total archived recipes" 
+select count(*) as "total archived recipes"
 FROM
     ranked_events
 WHERE
@@ -1,7 +1,7 @@
 import pytest
 from django.test.client import Client
 
-from recipeyak.models import Recipe, Team, User
+from recipeyak.models import Recipe, Team, TimelineEvent, User
 
 pytestmark = pytest.mark.django_db
 
@@ -26,3 +26,30 @@ def test_user_not_on_shared_team(
     res = c.get(f"/api/v1/user/{user2.pk}/")
     assert res.status_code == 200, "can fetch when user joins team"
     assert res.json()["id"] == user2.id
+
+
+def test_recipes_archived_count(
+    user: User, user2: User, team: Team, recipe: Recipe
+) -> None:
+    """
+    Counts recipes whose latest archive/unarchive by the user is an archive,
+    even if another user unarchived them after.
+    """
+    team.force_join(user2)
+    c = Client()
+    c.force_login(user)
+
+    TimelineEvent.objects.create(action="archived", created_by=user, recipe=recipe)
+    res = c.get(f"/api/v1/user/{user.pk}/")
+    assert res.status_code == 200
+    assert res.json()["stats"]["recipesArchived"] == 1
+
+    TimelineEvent.objects.create(action="unarchived", created_by=user2, recipe=recipe)
+    res = c.get(f"/api/v1/user/{user.pk}/")
+    assert res.json()["stats"]["recipesArchived"] == 1
+    res = c.get(f"/api/v1/user/{user2.pk}/")
+    assert res.json()["stats"]["recipesArchived"] == 0
+
+    TimelineEvent.objects.create(action="unarchived", created_by=user, recipe=recipe)
+    res = c.get(f"/api/v1/user/{user.pk}/")
+    assert res.json()["stats"]["recipesArchived"] == 0
@@ -0,0 +1,482 @@
+"""
+Maintain `CalendarDayIngredient`, a per calendar day sum of the scheduled
+ingredients, so a shopping list for a range is a merge of a few precomputed
+rows per day instead of parsing & combining every ingredient of every
+scheduled recipe.
+
+Rows are keyed by the parsed name & exact unit, so adding and subtracting is
+lossless, converting between units happens when merging the days via
+`combine_parsed_ingredients`.
+
+Anything that changes what's scheduled on a day must apply its delta in the
+same transaction as the change:
+
+- scheduling, moving or deleting a scheduled recipe
+- creating, updating or deleting an ingredient of a scheduled recipe
+- deleting a recipe that's scheduled
+- deleting a user, which cascades to the recipes they scheduled
+
+Calendars are built from scratch the first time they're read, see
+`ensure_built`, after which deltas keep them current. If a writer forgets to
+apply its delta, `invalidate` has the calendar rebuilt on its next read.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from django.db import connection, transaction
+
+from recipeyak.combine import (
+    ParsedIngredient,
+    combine_parsed_ingredients,
+    to_parsed_ingredient_from_fields,
+)
+from recipeyak.parsing import Quantity, Unit
+
+# (calendar_id, on, ingredient, multiplier), a negative multiplier subtracts
+_Change = tuple[int, date, ParsedIngredient, int]
+
+
+def _lock_calendars(calendar_ids: Iterable[int]) -> None:
+    """
+    Serialize deltas with `ensure_built` so a rebuild can't double count a
+    change that's applying its delta concurrently.
+    """
+    with connection.cursor() as cursor:
+        for calendar_id in sorted(set(calendar_ids)):
+            cursor.execute(
+                "select pg_advisory_xact_lock(hashtext('calendar_day_ingredient'), %(calendar_id)s)",
+                {"calendar_id": calendar_id},
+            )
+
+
+def _lock_recipes(recipe_ids: Iterable[int]) -> None:
+    """
+    Serialize changes to a recipe's schedule with changes to its ingredients,
+    otherwise scheduling a recipe while adding an ingredient to it would have
+    each miss the other's uncommitted row.
+
+    Lock before reading the schedule or the ingredients, and before locking
+    any calendars.
+
+    `for no key update` since inserting a scheduled recipe or an ingredient
+    takes a `for key share` lock on the recipe, which `for update` would
+    deadlock with.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select id
+from core_recipe
+where id = any(%(recipe_ids)s::int[])
+order by id
+for no key update
+""",
+            {"recipe_ids": sorted(set(recipe_ids))},
+        )
+
+
+def lock_recipe(*, recipe_id: int) -> None:
+    """
+    Take the recipe's lock before locking & reading the ingredient or
+    scheduled recipe a delta is computed from, so concurrent edits of the
+    same row can't both apply it.
+    """
+    _lock_recipes([recipe_id])
+
+
+def _apply(changes: Sequence[_Change]) -> None:
+    if not changes:
+        return
+    calendar_ids = list[int]()
+    days = list[str]()
+    names = list[str]()
+    normalized_names = list[str]()
+    units = list[str]()
+    unknown_units = list[str]()
+    quantities = list[str]()
+    multipliers = list[int]()
+    for calendar_id, on, ingredient, multiplier in changes:
+        calendar_ids.append(calendar_id)
+        days.append(on.isoformat())
+        names.append(ingredient.name)
+        normalized_names.append(ingredient.normalized_name)
+        units.append(ingredient.quantity.unit.value)
+        unknown_units.append(ingredient.quantity.unknown_unit or "")
+        quantities.append(str(ingredient.quantity.quantity))
+        multipliers.append(multiplier)
+
+    with connection.cursor() as cursor:
+        # Sum in postgres rather than python, `numeric` is arbitrary precision
+        # while `Decimal` rounds to 28 significant digits, which would leave
+        # behind crumbs when subtracting.
+        cursor.execute(
+            """
+insert into calendar_day_ingredient (
+  created,
+  modified,
+  calendar_id,
+  "on",
+  name,
+  normalized_name,
+  unit,
+  unknown_unit,
+  quantity,
+  count
+)
+select
+  now(),
+  now(),
+  change.calendar_id,
+  change."on",
+  change.name,
+  change.normalized_name,
+  change.unit,
+  change.unknown_unit,
+  sum(change.quantity::numeric * change.multiplier)::text,
+  sum(change.multiplier)
+from unnest(
+  %(calendar_ids)s::int[],
+  %(days)s::date[],
+  %(names)s::text[],
+  %(normalized_names)s::text[],
+  %(units)s::text[],
+  %(unknown_units)s::text[],
+  %(quantities)s::text[],
+  %(multipliers)s::int[]
+) as change(
+  calendar_id,
+  "on",
+  name,
+  normalized_name,
+  unit,
+  unknown_unit,
+  quantity,
+  multiplier
+)
+group by
+  change.calendar_id,
+  change."on",
+  change.name,
+  change.normalized_name,
+  change.unit,
+  change.unknown_unit
+on conflict (calendar_id, "on", name, normalized_name, unit, unknown_unit)
+do update set
+  quantity = (
+    calendar_day_ingredient.quantity::numeric + excluded.quantity::numeric
+  )::text,
+  count = calendar_day_ingredient.count + excluded.count,
+  modified = excluded.modified
+""",
+            {
+                "calendar_ids": calendar_ids,
+                "days": days,
+                "names": names,
+                "normalized_names": normalized_names,
+                "units": units,
+                "unknown_units": unknown_units,
+                "quantities": quantities,
+                "multipliers": multipliers,
+            },
+        )
+        cursor.execute(
+            """
+delete from calendar_day_ingredient
+where calendar_id = any(%(calendar_ids)s::int[])
+  and count <= 0
+""",
+            {"calendar_ids": sorted(set(calendar_ids))},
+        )
+
+
+def _to_parsed_ingredient(ingredient: dict[str, Any]) -> ParsedIngredient:
+    return to_parsed_ingredient_from_fields(
+        quantity=ingredient["quantity"],
+        name=ingredient["name"],
+        parsed_name=ingredient["parsed_name"],
+        parsed_unit=ingredient["parsed_unit"],
+        parsed_quantity=ingredient["parsed_quantity"],
+        parsed_unknown_unit=ingredient["parsed_unknown_unit"],
+    )
+
+
+def _get_ingredients(*, recipe_id: int) -> list[ParsedIngredient]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select
+  json_object(
+    'quantity': quantity,
+    'name': name,
+    'parsed_name': parsed_name,
+    'parsed_unit': parsed_unit,
+    'parsed_quantity': parsed_quantity,
+    'parsed_unknown_unit': parsed_unknown_unit
+  )
+from core_ingredient
+where recipe_id = %(recipe_id)s
+order by position
+""",
+            {"recipe_id": recipe_id},
+        )
+        return [_to_parsed_ingredient(row[0]) for row in cursor.fetchall()]
+
+
+def _get_schedule(*, recipe_id: int) -> list[tuple[int, date, int]]:
+    """
+    Calendar days the recipe is scheduled on, with the number of times it's
+    scheduled on each.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select calendar_id, "on", count(*)
+from core_scheduledrecipe
+where recipe_id = %(recipe_id)s
+  and calendar_id is not null
+group by calendar_id, "on"
+""",
+            {"recipe_id": recipe_id},
+        )
+        return cursor.fetchall()
+
+
+def _change_scheduled_recipe(
+    *, calendar_id: int, on: date, recipe_id: int, multiplier: int
+) -> None:
+    with transaction.atomic():
+        _lock_recipes([recipe_id])
+        _lock_calendars([calendar_id])
+        _apply(
+            [
+                (calendar_id, on, ingredient, multiplier)
+                for ingredient in _get_ingredients(recipe_id=recipe_id)
+            ]
+        )
+
+
+def add_scheduled_recipe(*, calendar_id: int, on: date, recipe_id: int) -> None:
+    _change_scheduled_recipe(
+        calendar_id=calendar_id, on=on, recipe_id=recipe_id, multiplier=1
+    )
+
+
+def remove_scheduled_recipe(*, calendar_id: int, on: date, recipe_id: int) -> None:
+    _change_scheduled_recipe(
+        calendar_id=calendar_id, on=on, recipe_id=recipe_id, multiplier=-1
+    )
+
+
+def move_scheduled_recipe(
+    *, calendar_id: int, recipe_id: int, before: date, after: date
+) -> None:
+    if before == after:
+        return
+    with transaction.atomic():
+        _lock_recipes([recipe_id])
+        _lock_calendars([calendar_id])
+        ingredients = _get_ingredients(recipe_id=recipe_id)
+        _apply(
+            [(calendar_id, before, ingredient, -1) for ingredient in ingredients]
+            + [(calendar_id, after, ingredient, 1) for ingredient in ingredients]
+        )
+
+
+def update_ingredient(
+    *,
+    recipe_id: int,
+    before: ParsedIngredient | None,
+    after: ParsedIngredient | None,
+) -> None:
+    """
+    Apply an ingredient create (`before` is None), update or delete (`after`
+    is None) to every day the recipe is scheduled.
+    """
+    if before == after:
+        return
+    with transaction.atomic():
+        _lock_recipes([recipe_id])
+        schedule = _get_schedule(recipe_id=recipe_id)
+        _lock_calendars(calendar_id for calendar_id, _, _ in schedule)
+        changes = list[_Change]()
+        for calendar_id, on, count in schedule:
+            if before is not None:
+                changes.append((calendar_id, on, before, -count))
+            if after is not None:
+                changes.append((calendar_id, on, after, count))
+        _apply(changes)
+
+
+def remove_recipe(*, recipe_id: int) -> None:
+    """
+    Call before deleting a recipe, which cascades to its scheduled recipes.
+    """
+    with transaction.atomic():
+        _lock_recipes([recipe_id])
+        schedule = _get_schedule(recipe_id=recipe_id)
+        _lock_calendars(calendar_id for calendar_id, _, _ in schedule)
+        ingredients = _get_ingredients(recipe_id=recipe_id)
+        _apply(
+            [
+                (calendar_id, on, ingredient, -count)
+                for calendar_id, on, count in schedule
+                for ingredient in ingredients
+            ]
+        )
+
+
+def _get_user_schedule(*, user_id: int) -> list[tuple[int, int, date, int]]:
+    """
+    Recipes the user scheduled, with the calendar days they're on and the
+    number of times the user scheduled them on each.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select recipe_id, calendar_id, "on", count(*)
+from core_scheduledrecipe
+where created_by_id = %(user_id)s
+  and calendar_id is not null
+group by recipe_id, calendar_id, "on"
+""",
+            {"user_id": user_id},
+        )
+        return cursor.fetchall()
+
+
+def remove_user(*, user_id: int) -> None:
+    """
+    Call before deleting a user, which cascades to the recipes they scheduled.
+    """
+    with transaction.atomic():
+        _lock_recipes(
+            recipe_id for recipe_id, _, _, _ in _get_user_schedule(user_id=user_id)
+        )
+        # read again now that the recipes are locked
+        schedule = _get_user_schedule(user_id=user_id)
+        _lock_calendars(calendar_id for _, calendar_id, _, _ in schedule)
+        ingredients = {
+            recipe_id: _get_ingredients(recipe_id=recipe_id)
+            for recipe_id in {recipe_id for recipe_id, _, _, _ in schedule}
+        }
+        _apply(
+            [
+                (calendar_id, on, ingredient, -count)
+                for recipe_id, calendar_id, on, count in schedule
+                for ingredient in ingredients[recipe_id]
+            ]
+        )
+
+
+def invalidate(*, calendar_id: int) -> None:
+    """
+    Have the calendar rebuilt from scratch the next time it's read.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        _lock_calendars([calendar_id])
+        cursor.execute(
+            "update core_calendar set day_ingredients_built = false where id = %(calendar_id)s",
+            {"calendar_id": calendar_id},
+        )
+
+
+def ensure_built(*, calendar_id: int) -> None:
+    """
+    Build the calendar's rows from scratch if they haven't been yet.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        _lock_calendars([calendar_id])
+        cursor.execute(
+            "select day_ingredients_built from core_calendar where id = %(calendar_id)s",
+            {"calendar_id": calendar_id},
+        )
+        row = cursor.fetchone()
+        if row is None or row[0]:
+            return
+        cursor.execute(
+            "delete from calendar_day_ingredient where calendar_id = %(calendar_id)s",
+            {"calendar_id": calendar_id},
+        )
+        cursor.execute(
+            """
+select
+  scheduled_recipe."on",
+  json_object(
+    'quantity': core_ingredient.quantity,
+    'name': core_ingredient.name,
+    'parsed_name': core_ingredient.parsed_name,
+    'parsed_unit': core_ingredient.parsed_unit,
+    'parsed_quantity': core_ingredient.parsed_quantity,
+    'parsed_unknown_unit': core_ingredient.parsed_unknown_unit
+  )
+from core_scheduledrecipe scheduled_recipe
+join core_ingredient on core_ingredient.recipe_id = scheduled_recipe.recipe_id
+where scheduled_recipe.calendar_id = %(calendar_id)s
+order by
+  scheduled_recipe."on" desc,
+  scheduled_recipe.id,
+  core_ingredient.position
+""",
+            {"calendar_id": calendar_id},
+        )
+        _apply(
+            [
+                (calendar_id, on, _to_parsed_ingredient(ingredient), 1)
+                for on, ingredient in cursor.fetchall()
+            ]
+        )
+        cursor.execute(
+            "update core_calendar set day_ingredients_built = true where id = %(calendar_id)s",
+            {"calendar_id": calendar_id},
+        )
+
+
+def get_combined_ingredients(
+    *, calendar_id: int, start: date, end: date
+) -> dict[str, list[Quantity]]:
+    """
+    Merge the calendar's days in the range into a shopping list, the calendar
+    must have been built, see `ensure_built`.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+select
+  name,
+  normalized_name,
+  unit,
+  unknown_unit,
+  trim_scale(sum(quantity::numeric))::text
+from calendar_day_ingredient
+where calendar_id = %(calendar_id)s
+  and "on" >= %(start)s::date
+  and "on" <= %(end)s::date
+group by name, normalized_name, unit, unknown_unit
+-- Order by the rows' contents rather than their ids, which depend on the
+-- order the deltas were applied, so an edited calendar merges the same as a
+-- rebuilt one.
+order by max("on") desc, normalized_name, name, unit, unknown_unit
+""",
+            {
+                "calendar_id": calendar_id,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+            },
+        )
+        return combine_parsed_ingredients(
+            ParsedIngredient(
+                name=name,
+                normalized_name=normalized_name,
+                quantity=Quantity(
+                    quantity=Decimal(quantity),
+                    unit=Unit(unit),
+                    unknown_unit=unknown_unit or None,
+                ),
+            )
+            for name, normalized_name, unit, unknown_unit, quantity in cursor.fetchall()
+        )
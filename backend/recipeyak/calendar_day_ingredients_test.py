@@ -0,0 +1,365 @@
+import threading
+from collections.abc import Callable
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test.client import Client
+
+from recipeyak.calendar_day_ingredients import ensure_built, get_combined_ingredients
+from recipeyak.fixtures import (
+    create_ingredient,
+    create_recipe,
+    create_team,
+    create_user,
+)
+from recipeyak.models import Calendar, CalendarDayIngredient, User
+from recipeyak.parsing import Unit
+
+pytestmark = pytest.mark.django_db
+
+
+def _rows(calendar_id: int) -> list[tuple[object, ...]]:
+    return [
+        (*key, Decimal(quantity))
+        for *key, quantity in CalendarDayIngredient.objects.filter(
+            calendar_id=calendar_id
+        )
+        .order_by("on", "name", "normalized_name", "unit", "unknown_unit")
+        .values_list(
+            "on", "name", "normalized_name", "unit", "unknown_unit", "count", "quantity"
+        )
+    ]
+
+
+def _combined(
+    calendar_id: int, start: date, end: date
+) -> list[tuple[str, list[tuple[Decimal, Unit, str | None]]]]:
+    """
+    Shopping list with its ingredients & their quantities in order.
+    """
+    return [
+        (name, [(q.quantity, q.unit, q.unknown_unit) for q in quantities])
+        for name, quantities in get_combined_ingredients(
+            calendar_id=calendar_id, start=start, end=end
+        ).items()
+    ]
+
+
+def _assert_matches_rebuild(calendar_id: int, start: date, end: date) -> None:
+    incremental_rows = _rows(calendar_id)
+    incremental = _combined(calendar_id, start, end)
+    Calendar.objects.filter(id=calendar_id).update(day_ingredients_built=False)
+    ensure_built(calendar_id=calendar_id)
+    assert _rows(calendar_id) == incremental_rows
+    assert _combined(calendar_id, start, end) == incremental
+
+
+def test_day_ingredients_match_rebuild_after_edits() -> None:
+    """
+    Every write path applies a delta that leaves the calendar's day
+    ingredients identical to building them from scratch.
+    """
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    other_recipe = create_recipe(team=team, user=user)
+    create_ingredient(
+        recipe=other_recipe, quantity="1/3 cup", name="sugar", position="z"
+    )
+    client.force_login(user)
+    calendar = Calendar.objects.get(team=team)
+    start = date(1976, 7, 6)
+    end = start + timedelta(days=7)
+    ensure_built(calendar_id=calendar.id)
+
+    # schedule
+    for on, recipe_id in [
+        (start, recipe.id),
+        (start, recipe.id),
+        (start + timedelta(days=1), other_recipe.id),
+    ]:
+        res = client.post(
+            "/api/v1/calendar/",
+            {"recipe": recipe_id, "on": str(on)},
+            content_type="application/json",
+        )
+        assert res.status_code == 200
+    scheduled_recipe_id = res.json()["id"]
+    _assert_matches_rebuild(calendar.id, start, end)
+    combined = get_combined_ingredients(calendar_id=calendar.id, start=start, end=end)
+    assert [q.quantity for q in combined["egg"]] == [3]
+
+    # move
+    res = client.patch(
+        f"/api/v1/calendar/{scheduled_recipe_id}/",
+        {"on": str(start + timedelta(days=2))},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    _assert_matches_rebuild(calendar.id, start, end)
+
+    # ingredient create, update & delete
+    res = client.post(
+        f"/api/v1/recipes/{recipe.id}/ingredients/",
+        {
+            "quantity": "2 tbs",
+            "name": "sugar",
+            "description": "",
+            "position": "y",
+        },
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    sugar_id = res.json()["id"]
+    _assert_matches_rebuild(calendar.id, start, end)
+    res = client.patch(
+        f"/api/v1/ingredients/{sugar_id}/",
+        {"quantity": "1 tsp", "name": "sugars"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    _assert_matches_rebuild(calendar.id, start, end)
+    res = client.delete(f"/api/v1/ingredients/{sugar_id}/")
+    assert res.status_code == 204
+    _assert_matches_rebuild(calendar.id, start, end)
+
+    # scheduled recipe delete
+    res = client.delete(f"/api/v1/calendar/{scheduled_recipe_id}/")
+    assert res.status_code == 204
+    _assert_matches_rebuild(calendar.id, start, end)
+
+    # recipe delete
+    res = client.delete(f"/api/v1/recipes/{recipe.id}/")
+    assert res.status_code == 204
+    _assert_matches_rebuild(calendar.id, start, end)
+    assert _rows(calendar.id) == []
+
+
+def test_day_ingredients_match_rebuild_after_user_delete() -> None:
+    """
+    Deleting a user cascades to the recipes they scheduled, which must be
+    subtracted from the calendar.
+    """
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    other_user = create_user(email="b.person@example.com")
+    team.force_join(user=other_user)
+    recipe = create_recipe(team=team, user=user)
+    other_recipe = create_recipe(team=team, user=user)
+    create_ingredient(
+        recipe=other_recipe, quantity="1/3 cup", name="sugar", position="z"
+    )
+    calendar = Calendar.objects.get(team=team)
+    other_user.schedule_team = team
+    other_user.pinned_calendar = calendar
+    other_user.save()
+    start = date(1976, 7, 6)
+    end = start + timedelta(days=7)
+    ensure_built(calendar_id=calendar.id)
+
+    for scheduled_by, recipe_id in [
+        (user, recipe.id),
+        (other_user, recipe.id),
+        (other_user, other_recipe.id),
+    ]:
+        client.force_login(scheduled_by)
+        res = client.post(
+            "/api/v1/calendar/",
+            {"recipe": recipe_id, "on": str(start)},
+            content_type="application/json",
+        )
+        assert res.status_code == 200
+
+    res = client.delete("/api/v1/user/")
+    assert res.status_code == 204
+    _assert_matches_rebuild(calendar.id, start, end)
+    combined = get_combined_ingredients(calendar_id=calendar.id, start=start, end=end)
+    assert "sugar" not in combined
+    assert [q.quantity for q in combined["egg"]] == [1]
+
+
+def test_day_ingredients_order_independent_of_edits() -> None:
+    """
+    The order of the shopping list depends on what's scheduled, not on the
+    order the ingredients were added in.
+    """
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    client.force_login(user)
+    calendar = Calendar.objects.get(team=team)
+    start = date(1976, 7, 6)
+    end = start + timedelta(days=7)
+    ensure_built(calendar_id=calendar.id)
+    res = client.post(
+        "/api/v1/calendar/",
+        {"recipe": recipe.id, "on": str(start)},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+
+    for quantity, name, position in [
+        ("1", "limes", "x"),
+        ("", "onion", "y"),
+        ("2 tsp", "limes", "w"),
+        ("", "tomato", "v"),
+    ]:
+        res = client.post(
+            f"/api/v1/recipes/{recipe.id}/ingredients/",
+            {
+                "quantity": quantity,
+                "name": name,
+                "description": "",
+                "position": position,
+            },
+            content_type="application/json",
+        )
+        assert res.status_code == 200
+    _assert_matches_rebuild(calendar.id, start, end)
+
+
+def _new_connection() -> Any:
+    return connection.get_new_connection(connection.get_connection_params())
+
+
+def _concurrently(
+    *requests: Callable[[Client], HttpResponse], recipe_id: int, user: User
+) -> list[int]:
+    """
+    Start the requests while holding the recipe's lock so they all read their
+    rows before any of them can apply its delta, returning their status codes.
+    """
+    status_codes = list[int]()
+
+    def run(request: Callable[[Client], HttpResponse]) -> None:
+        try:
+            client = Client()
+            client.force_login(user)
+            status_codes.append(request(client).status_code)
+        finally:
+            connection.close()
+
+    lock = _new_connection()
+    try:
+        with lock.cursor() as cursor:
+            cursor.execute(
+                "select id from core_recipe where id = %s for no key update",
+                [recipe_id],
+            )
+        threads = [threading.Thread(target=run, args=(r,)) for r in requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            # waiting on the lock
+            thread.join(timeout=0.5)
+            assert thread.is_alive()
+        lock.commit()
+        for thread in threads:
+            thread.join(timeout=10)
+    finally:
+        lock.close()
+    return sorted(status_codes)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_day_ingredients_concurrent_ingredient_edits() -> None:
+    """
+    Concurrent edits or deletes of an ingredient apply their deltas against
+    the row as the previous one left it.
+    """
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    calendar = Calendar.objects.get(team=team)
+    start = date(1976, 7, 6)
+    end = start + timedelta(days=7)
+    ensure_built(calendar_id=calendar.id)
+    client.force_login(user)
+    res = client.post(
+        "/api/v1/calendar/",
+        {"recipe": recipe.id, "on": str(start)},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    egg, soy_sauce = recipe.ingredient_set.order_by("position")
+
+    assert _concurrently(
+        lambda client: client.patch(
+            f"/api/v1/ingredients/{egg.id}/",
+            {"quantity": "2 lbs"},
+            content_type="application/json",
+        ),
+        lambda client: client.patch(
+            f"/api/v1/ingredients/{egg.id}/",
+            {"quantity": "3 lbs"},
+            content_type="application/json",
+        ),
+        recipe_id=recipe.id,
+        user=user,
+    ) == [200, 200]
+    _assert_matches_rebuild(calendar.id, start, end)
+
+    assert _concurrently(
+        lambda client: client.delete(f"/api/v1/ingredients/{soy_sauce.id}/"),
+        lambda client: client.delete(f"/api/v1/ingredients/{soy_sauce.id}/"),
+        recipe_id=recipe.id,
+        user=user,
+    ) == [204, 404]
+    _assert_matches_rebuild(calendar.id, start, end)
+    combined = get_combined_ingredients(calendar_id=calendar.id, start=start, end=end)
+    assert "soy sauce" not in combined
+
+
+@pytest.mark.django_db(transaction=True)
+def test_day_ingredients_concurrent_scheduled_recipe_edits() -> None:
+    """
+    Concurrent moves or deletes of a scheduled recipe apply their deltas
+    against the day it's on as the previous one left it.
+    """
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    calendar = Calendar.objects.get(team=team)
+    start = date(1976, 7, 6)
+    end = start + timedelta(days=7)
+    ensure_built(calendar_id=calendar.id)
+    client.force_login(user)
+    res = client.post(
+        "/api/v1/calendar/",
+        {"recipe": recipe.id, "on": str(start)},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    scheduled_recipe_id = res.json()["id"]
+
+    assert _concurrently(
+        *(
+            lambda client, on=on: client.patch(
+                f"/api/v1/calendar/{scheduled_recipe_id}/",
+                {"on": str(on)},
+                content_type="application/json",
+            )
+            for on in [start + timedelta(days=1), start + timedelta(days=2)]
+        ),
+        recipe_id=recipe.id,
+        user=user,
+    ) == [200, 200]
+    _assert_matches_rebuild(calendar.id, start, end)
+
+    assert _concurrently(
+        lambda client: client.delete(f"/api/v1/calendar/{scheduled_recipe_id}/"),
+        lambda client: client.delete(f"/api/v1/calendar/{scheduled_recipe_id}/"),
+        recipe_id=recipe.id,
+        user=user,
+    ) == [204, 204]
+    _assert_matches_rebuild(calendar.id, start, end)
+    assert _rows(calendar.id) == []
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import csv
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from functools import cache
-from typing import Any
+from pathlib import Path
 
 from recipeyak.inflect import singularize
 
@@ -487,44 +490,83 @@ _DEPARTMENT_MAPPING = {
 }
 
 
+@dataclass(slots=True, eq=False)
+class _Node:
+    children: dict[str, _Node] = field(default_factory=dict)
+    # longest proper suffix of this node's words that's also in the trie
+    fail: _Node | None = None
+    # (category, len(ingredient)) of the ingredient ending at this node
+    match: tuple[str, int] | None = None
+    # next node along the fail chain that has a match
+    output: _Node | None = None
+    depth: int = 0
+
+
 @cache
-def _create_trie() -> dict[str, Any]:
-    trie: dict[str, Any] = {}
+def _create_automaton() -> _Node:
+    """
+    Aho-Corasick automaton over the (singularized) words of each ingredient in
+    _DEPARTMENT_MAPPING so we find every mapped ingredient in a name in a
+    single pass over its words.
+    """
+    root = _Node()
     for category, ingredients in _DEPARTMENT_MAPPING.items():
         for ingredient in ingredients:
-            tree = trie
-            words = [singularize(x) for x in ingredient.replace("-", " ").split()]
-            for idx, word in enumerate(words):
-                if word in tree:
-                    tree = tree[word]
-                else:
-                    tree[word] = {}
-                    tree = tree[word]
-                is_last = idx == len(words) - 1
-                if is_last and "$" not in tree:
-                    tree["$"] = (category, len(ingredient))
+            node = root
+            for word in ingredient.replace("-", " ").split():
+                word = singularize(word)
+                if word not in node.children:
+                    node.children[word] = _Node(depth=node.depth + 1)
+                node = node.children[word]
+            if node.match is None:
+                node.match = (category, len(ingredient))
 
-    return trie
+    queue = deque[_Node]()
+    for child in root.children.values():
+        child.fail = root
+        queue.append(child)
+    while queue:
+        node = queue.popleft()
+        for word, child in node.children.items():
+            fail = node.fail
+            while fail is not None and word not in fail.children:
+                fail = fail.fail
+            child.fail = fail.children[word] if fail is not None else root
+            child.output = (
+                child.fail if child.fail.match is not None else child.fail.output
+            )
+            queue.append(child)
+    return root
 
 
-def _search(item: str) -> dict[str, set[int]]:
-    trie = _create_trie()
-    items = [singularize(x) for x in item.split()]
-    counts = defaultdict(set)
-    for start in range(len(items)):
-        tree = trie
-        for word in items[start:]:
-            if word not in tree:
-                break
-            tree = tree[word]
-            if "$" in tree:
-                cat, cnt = tree["$"]
-                counts[cat].add(cnt)
-    return counts
+def _search(words: list[str]) -> str | None:
+    root = _create_automaton()
+    # every match as a tuple of: start, end, category, length
+    matches = list[tuple[int, int, str, int]]()
+    node = root
+    for end, word in enumerate(words):
+        while node is not root and word not in node.children:
+            assert node.fail is not None
+            node = node.fail
+        node = node.children.get(word, root)
+        matched: _Node | None = node if node.match is not None else node.output
+        while matched is not None:
+            assert matched.match is not None
+            category, length = matched.match
+            matches.append((end - matched.depth + 1, end, category, length))
+            matched = matched.output
+    if not matches:
+        return None
+    # The longest matching ingredient wins, ties go to the category whose
+    # match starts first.
+    longest = dict[str, int]()
+    for _, _, category, length in sorted(matches):
+        longest[category] = max(length, longest.get(category, 0))
+    return max(longest.items(), key=lambda x: x[1])[0]
 
 
-def category(ingredient: str) -> str:
-    ingredient = (
+def _normalize(ingredient: str) -> str:
+    return (
         ingredient.lower()
         .replace("-", " ")
         .replace(",", "")
@@ -533,11 +575,46 @@ def category(ingredient: str) -> str:
         .replace("’", "'")  # noqa: RUF001
     )
 
-    if "frozen" in ingredient:
-        return "frozen"
 
-    res = _search(ingredient)
-    if not res:
-        return "unknown"
+def categorize_many(ingredients: Iterable[str]) -> list[str]:
+    """
+    Categorize a batch of ingredients, e.g., a whole shopping list.
+    """
+    results = dict[str, str]()
+    output = list[str]()
+    for ingredient in ingredients:
+        if (cached := results.get(ingredient)) is not None:
+            output.append(cached)
+            continue
+        normalized = _normalize(ingredient)
+        if "frozen" in normalized:
+            result = "frozen"
+        else:
+            words = [singularize(word) for word in normalized.split()]
+            result = _search(words) or "unknown"
+        results[ingredient] = result
+        output.append(result)
+    return output
+
+
+def category(ingredient: str) -> str:
+    return categorize_many([ingredient])[0]
+
+
+_HISTORICAL_INGREDIENTS = Path(__file__).parent.parent / "ingredients.csv"
 
-    return sorted(res.items(), key=lambda x: -max(x[1]))[0][0]
+
+def common_words(top_n: int = 1_000) -> Iterator[str]:
+    """
+    Words from the department mapping along with the `top_n` most common words
+    from historical ingredient names, useful for precomputing singulars.
+    """
+    for ingredients in _DEPARTMENT_MAPPING.values():
+        for ingredient in ingredients:
+            yield from ingredient.replace("-", " ").split()
+    counts = Counter[str]()
+    with _HISTORICAL_INGREDIENTS.open() as f:
+        for row in csv.DictReader(f):
+            counts.update(_normalize(row["name"]).split())
+    for word, _ in counts.most_common(top_n):
+        yield word
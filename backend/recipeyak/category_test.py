@@ -5,7 +5,9 @@ from textwrap import dedent
 
 from syrupy.assertion import SnapshotAssertion
 
-from recipeyak.category import _DEPARTMENT_MAPPING, category
+from recipeyak.category import _DEPARTMENT_MAPPING, categorize_many, category
+
+_INGREDIENTS_CSV = Path(__file__).parent.parent / "ingredients.csv"
 
 
 def test_categorize_ingredients() -> None:
@@ -13,7 +15,7 @@ def test_categorize_ingredients() -> None:
     Ensure we have a category set for each ingredient
     """
     out = defaultdict(set)
-    with (Path() / "ingredients.csv").open() as f:
+    with _INGREDIENTS_CSV.open() as f:
         reader = csv.DictReader(f)
         for row in reader:
             item = row["name"]
@@ -146,3 +148,14 @@ def test_no_overlap_between_categories() -> None:
                 continue
             overlap = value & other_value
             assert not overlap, f"{overlap} in {key} and {other_key}"
+
+
+def test_categorize_many_matches_linear_scan(snapshot: SnapshotAssertion) -> None:
+    """
+    The snapshot was generated with the linear scan `category()` that preceded
+    the automaton, only update it when a change in categorization is intended.
+    """
+    with _INGREDIENTS_CSV.open() as f:
+        names = [row["name"].lower() for row in csv.DictReader(f)]
+
+    assert list(zip(names, categorize_many(names), strict=True)) == snapshot()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from decimal import Decimal
 
 from recipeyak.inflect import singularize
-from recipeyak.parsing import BaseUnit, Quantity, parse_quantity
+from recipeyak.parsing import BaseUnit, Quantity, Unit, parse_quantity
 
 
 @dataclass(frozen=True, kw_only=True, slots=True)
@@ -15,21 +16,71 @@ class Ingredient:
     description: str = ""
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ParsedIngredient:
+    # singular form of `normalized_name`, used for grouping
+    name: str
+    normalized_name: str
+    quantity: Quantity
+
+
 def normalize_ingredient_name(*, name: str) -> str:
     return name.replace("-", " ").lower()
 
 
+def to_parsed_ingredient(ingr: Ingredient) -> ParsedIngredient:
+    normalized_name = normalize_ingredient_name(name=ingr.name)
+    return ParsedIngredient(
+        name=singularize(normalized_name),
+        normalized_name=normalized_name,
+        quantity=parse_quantity(ingr.quantity),
+    )
+
+
+def to_parsed_ingredient_from_fields(
+    *,
+    quantity: str,
+    name: str,
+    parsed_name: str | None,
+    parsed_unit: str | None,
+    parsed_quantity: str | None,
+    parsed_unknown_unit: str | None,
+) -> ParsedIngredient:
+    """
+    Parsed form of a stored ingredient, using its parsed fields when they've
+    been computed and parsing `quantity` & `name` otherwise.
+    """
+    if parsed_name is None or parsed_quantity is None:
+        # hasn't been backfilled yet
+        return to_parsed_ingredient(Ingredient(quantity=quantity, name=name))
+    return ParsedIngredient(
+        name=parsed_name,
+        normalized_name=normalize_ingredient_name(name=name),
+        quantity=Quantity(
+            quantity=Decimal(parsed_quantity),
+            unit=Unit(parsed_unit),
+            unknown_unit=parsed_unknown_unit,
+        ),
+    )
+
+
 def combine_ingredients(ingredients: Sequence[Ingredient]) -> dict[str, list[Quantity]]:
+    return combine_parsed_ingredients(to_parsed_ingredient(i) for i in ingredients)
+
+
+def combine_parsed_ingredients(
+    ingredients: Iterable[ParsedIngredient],
+) -> dict[str, list[Quantity]]:
     # being kind of dynamic with the types here so not the easiest on the eyes.
     ingredient_map: dict[str, dict[BaseUnit | str | None, Quantity]] = defaultdict(dict)
 
     plural_name = dict[str, str]()
 
     for ingr in ingredients:
-        normalized_name = normalize_ingredient_name(name=ingr.name)
-        quantity = parse_quantity(ingr.quantity)
+        normalized_name = ingr.normalized_name
+        quantity = ingr.quantity
         base_unit = quantity.unit.base_unit()
-        name = singularize(normalized_name)
+        name = ingr.name
 
         # keep track of whether an ingredient should be plural
         if name != normalized_name:
@@ -7,6 +7,8 @@ from recipeyak.combine import (
     Ingredient,
     Quantity,
     combine_ingredients,
+    to_parsed_ingredient,
+    to_parsed_ingredient_from_fields,
 )
 from recipeyak.parsing import Unit
 
@@ -49,3 +51,38 @@ def test_combining_ingredients(
     ingredients: Sequence[Ingredient], expected: dict[str, list[Quantity]]
 ) -> None:
     assert combine_ingredients(ingredients) == expected
+
+
+@pytest.mark.parametrize(
+    ("parsed_name", "parsed_quantity"),
+    [
+        (None, None),
+        ("onion", None),
+        (None, "2"),
+    ],
+)
+def test_to_parsed_ingredient_from_fields_falls_back_to_parsing(
+    parsed_name: str | None, parsed_quantity: str | None
+) -> None:
+    assert to_parsed_ingredient_from_fields(
+        quantity="2 cups",
+        name="Onions",
+        parsed_name=parsed_name,
+        parsed_unit=None,
+        parsed_quantity=parsed_quantity,
+        parsed_unknown_unit=None,
+    ) == to_parsed_ingredient(Ingredient(quantity="2 cups", name="Onions"))
+
+
+def test_to_parsed_ingredient_from_fields_uses_stored_fields() -> None:
+    parsed = to_parsed_ingredient_from_fields(
+        quantity="2 cups",
+        name="Onions",
+        parsed_name="onion",
+        parsed_unit="CUP",
+        parsed_quantity="2",
+        parsed_unknown_unit=None,
+    )
+    assert parsed.name == "onion"
+    assert parsed.normalized_name == "onions"
+    assert parsed.quantity == Quantity(quantity=Decimal(2), unit=Unit.CUP)
@@ -10,3 +10,7 @@ ALGOLIA_ADMIN_API_KEY = os.getenv("ALGOLIA_ADMIN_API_KEY", "")
 ALGOLIA_SEARCH_ONLY_API_KEY = os.getenv("ALGOLIA_SEARCH_ONLY_API_KEY", "")
 
 IMAGE_TRANSFORM_FORMAT = os.getenv("IMAGE_TRANSFORM_FORMAT", "twicpics")
+
+# How long to reuse a previous scrape of a url instead of fetching it again,
+# 0 disables the cache.
+SCRAPE_CACHE_TTL_SEC = int(os.getenv("SCRAPE_CACHE_TTL_SEC", str(7 * 24 * 60 * 60)))
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
 from datetime import date
-from unittest.mock import patch
 
 import pytest
 from django.test.client import Client
@@ -204,24 +202,3 @@ def scheduled_recipe(recipe: Recipe, team: Team) -> ScheduledRecipe:
     return ScheduledRecipe.objects.create(
         recipe=recipe, team=team, on=date(1976, 7, 6), calendar=calendar
     )
-
-
-@pytest.fixture(scope="session", autouse=True)
-def patch_publish_calendar_event() -> Iterator[None]:
-    with (
-        patch("recipeyak.realtime.publish_calendar_event", return_value=None),
-        patch("recipeyak.realtime.publish_calendar_event_deleted", return_value=None),
-    ):
-        yield
-
-
-@pytest.fixture(scope="session", autouse=True)
-def patch_publish_cook_checklist() -> Iterator[None]:
-    with patch("recipeyak.realtime.publish_cook_checklist", return_value=None):
-        yield
-
-
-@pytest.fixture(scope="session", autouse=True)
-def patch_publish_recipe_modified() -> Iterator[None]:
-    with patch("recipeyak.realtime.publish_recipe", return_value=None):
-        yield
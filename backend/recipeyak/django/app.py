@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = "recipeyak"
+
+    def ready(self) -> None:
+        from recipeyak import category, inflect
+
+        # singularize is called for every ingredient word on the shopping
+        # list, so avoid its regexes for the common ones.
+        inflect.load_singular_table(category.common_words())
@@ -19,6 +19,9 @@ https://github.com/clips/pattern/blob/ec95f97b2e34c2232e7c43ef1e34e3f0dea6654b/p
 """
 
 import re
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import NamedTuple
 
 VERB, NOUN, ADJECTIVE, ADVERB = "VB", "NN", "JJ", "RB"
 
@@ -550,7 +553,7 @@ plural_categories = {
 }
 
 
-def pluralize(
+def _pluralize(
     word: str,
     pos: str = NOUN,
     custom: dict[str, str] | None = None,
@@ -829,7 +832,7 @@ singular_irregular = {
 }
 
 
-def singularize(
+def _singularize(
     word: str, pos: str = NOUN, custom: dict[str, str] | None = None
 ) -> str:
     """Returns the singular of a given word."""
@@ -864,3 +867,86 @@ def singularize(
         if suffix.search(word):
             return suffix.sub(inflection, word)
     return word
+
+
+# Memoization
+#
+# The rules above are a long list of regexes, but ingredient vocabularies are
+# small & repetitive, so we memoize the common case, i.e., without `custom`.
+
+_CACHE_SIZE = 4096
+
+# Precomputed singulars for common words, see `load_singular_table`.
+_singular_table = dict[str, str]()
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _singularize_cached(word: str, pos: str) -> str:
+    return _singularize(word, pos)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _pluralize_cached(word: str, pos: str, classical: bool) -> str:
+    return _pluralize(word, pos, classical=classical)
+
+
+def singularize(
+    word: str, pos: str = NOUN, custom: dict[str, str] | None = None
+) -> str:
+    """Returns the singular of a given word."""
+    if custom:
+        return _singularize(word, pos, custom)
+    if pos == NOUN and (singular := _singular_table.get(word)) is not None:
+        return singular
+    return _singularize_cached(word, pos)
+
+
+def pluralize(
+    word: str,
+    pos: str = NOUN,
+    custom: dict[str, str] | None = None,
+    classical: bool = True,
+) -> str:
+    """Returns the plural of a given word, e.g., child => children.
+    Handles nouns and adjectives, using classical inflection by default
+    (i.e., where "matrix" pluralizes to "matrices" and not "matrixes").
+    The custom dictionary is for user-defined replacements.
+    """
+    if custom:
+        return _pluralize(word, pos, custom, classical)
+    return _pluralize_cached(word, pos, classical)
+
+
+def load_singular_table(words: Iterable[str]) -> None:
+    """
+    Precompute the singular of each noun so lookups skip the LRU cache,
+    unlike the cache these entries are never evicted.
+    """
+    for word in words:
+        _singular_table[word] = _singularize(word)
+
+
+class LruCacheInfo(NamedTuple):
+    # same fields as `functools.lru_cache`'s `cache_info()`
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class CacheInfo(NamedTuple):
+    singularize: LruCacheInfo
+    pluralize: LruCacheInfo
+    singular_table_size: int
+
+
+def cache_info() -> CacheInfo:
+    """
+    Hit & miss counts for the memoization layer, lookups served by the
+    singular table aren't counted.
+    """
+    return CacheInfo(
+        singularize=LruCacheInfo(*_singularize_cached.cache_info()),
+        pluralize=LruCacheInfo(*_pluralize_cached.cache_info()),
+        singular_table_size=len(_singular_table),
+    )
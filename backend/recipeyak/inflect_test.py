@@ -0,0 +1,37 @@
+import pytest
+
+from recipeyak import inflect
+
+
+@pytest.mark.parametrize(
+    ("word", "expected"),
+    [("tomatoes", "tomato"), ("leaves", "leaf"), ("mice", "mouse")],
+)
+def test_singularize(word: str, expected: str) -> None:
+    assert inflect.singularize(word) == expected
+    # cached result should match
+    assert inflect.singularize(word) == expected
+
+
+def test_singularize_cache_counts_hits() -> None:
+    word = "kumquats"
+    before = inflect.cache_info().singularize
+    inflect.singularize(word)
+    inflect.singularize(word)
+    after = inflect.cache_info().singularize
+    assert after.misses == before.misses + 1
+    assert after.hits == before.hits + 1
+
+
+def test_singularize_with_custom_skips_cache() -> None:
+    assert inflect.singularize("geese", custom={"geese": "goose"}) == "goose"
+    assert inflect.singularize("geese") == "goose"
+    assert inflect.singularize("cacti", custom={"cacti": "cactus"}) == "cactus"
+
+
+def test_load_singular_table() -> None:
+    inflect.load_singular_table(["anchovies"])
+    before = inflect.cache_info().singularize
+    assert inflect.singularize("anchovies") == "anchovy"
+    assert inflect.cache_info().singularize == before
+    assert inflect.cache_info().singular_table_size >= 1
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import asyncpg
+import sentry_sdk
+import structlog
+import typer
+from dotenv import load_dotenv
+from pydantic import PostgresDsn
+from pydantic_settings import BaseSettings
+from structlog.stdlib import BoundLogger
+
+from recipeyak.combine import Ingredient, to_parsed_ingredient
+
+logger = structlog.stdlib.get_logger()
+
+load_dotenv()
+
+BATCH_SIZE = 1_000
+
+
+class Config(BaseSettings):
+    DATABASE_URL: PostgresDsn
+    SENTRY_DSN: str
+
+
+async def job(
+    *, log: BoundLogger, dry_run: bool, reparse_all: bool, database_url: str
+) -> None:
+    """
+    Populate the `parsed_*` columns of `core_ingredient` for rows saved before
+    we started computing them, or for every row with `reparse_all`, e.g., after
+    changing the parsing logic.
+
+    The calendar day sums, see `recipeyak.calendar_day_ingredients`, are keyed
+    by the parsed fields, so calendars with a changed ingredient scheduled are
+    rebuilt on their next read.
+    """
+    log = log.bind(dry_run=dry_run, reparse_all=reparse_all)
+    log.info("starting up")
+    pg = await asyncpg.connect(dsn=database_url)
+    last_id = 0
+    updated_count = 0
+    invalidated_calendar_count = 0
+    while True:
+        rows = await pg.fetch(
+            """
+select id, quantity, name
+from core_ingredient
+where id > $1
+  and ($2 or parsed_name is null)
+order by id
+limit $3
+""",
+            last_id,
+            reparse_all,
+            BATCH_SIZE,
+        )
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+
+        ids = list[int]()
+        quantities = list[str]()
+        names = list[str]()
+        parsed_names = list[str]()
+        parsed_units = list[str]()
+        parsed_quantities = list[str]()
+        parsed_unknown_units = list[str | None]()
+        for row in rows:
+            parsed = to_parsed_ingredient(
+                Ingredient(quantity=row["quantity"], name=row["name"])
+            )
+            ids.append(row["id"])
+            quantities.append(row["quantity"])
+            names.append(row["name"])
+            parsed_names.append(parsed.name)
+            parsed_units.append(parsed.quantity.unit.value)
+            parsed_quantities.append(str(parsed.quantity.quantity))
+            parsed_unknown_units.append(parsed.quantity.unknown_unit)
+
+        if dry_run:
+            updated_count += len(rows)
+            log.info("parsed batch", last_id=last_id, updated_count=updated_count)
+            continue
+        async with pg.transaction():
+            updated_rows = await pg.fetch(
+                """
+update core_ingredient
+set parsed_name = parsed.parsed_name,
+    parsed_unit = parsed.parsed_unit,
+    parsed_quantity = parsed.parsed_quantity,
+    parsed_unknown_unit = parsed.parsed_unknown_unit
+from unnest(
+  $1::int[],
+  $2::text[],
+  $3::text[],
+  $4::text[],
+  $5::text[],
+  $6::text[],
+  $7::text[]
+) as parsed(
+  id,
+  quantity,
+  name,
+  parsed_name,
+  parsed_unit,
+  parsed_quantity,
+  parsed_unknown_unit
+)
+where core_ingredient.id = parsed.id
+  -- skip rows that were edited since we fetched them, they'll have been
+  -- parsed when they were saved.
+  and core_ingredient.quantity = parsed.quantity
+  and core_ingredient.name = parsed.name
+  and (
+    core_ingredient.parsed_name,
+    core_ingredient.parsed_unit,
+    core_ingredient.parsed_quantity,
+    core_ingredient.parsed_unknown_unit
+  ) is distinct from (
+    parsed.parsed_name,
+    parsed.parsed_unit,
+    parsed.parsed_quantity,
+    parsed.parsed_unknown_unit
+  )
+returning core_ingredient.recipe_id
+""",
+                ids,
+                quantities,
+                names,
+                parsed_names,
+                parsed_units,
+                parsed_quantities,
+                parsed_unknown_units,
+            )
+            calendar_ids = [
+                row["calendar_id"]
+                for row in await pg.fetch(
+                    """
+select distinct calendar_id
+from core_scheduledrecipe
+where recipe_id = any($1)
+  and calendar_id is not null
+order by calendar_id
+""",
+                    sorted({row["recipe_id"] for row in updated_rows}),
+                )
+            ]
+            # Wait for any rebuild in progress, like
+            # `calendar_day_ingredients.invalidate`, otherwise it could mark
+            # the calendar built from the old parsed fields after we reset it.
+            for calendar_id in calendar_ids:
+                await pg.execute(
+                    "select pg_advisory_xact_lock(hashtext('calendar_day_ingredient'), $1)",
+                    calendar_id,
+                )
+            await pg.execute(
+                "update core_calendar set day_ingredients_built = false where id = any($1)",
+                calendar_ids,
+            )
+        updated_count += len(updated_rows)
+        invalidated_calendar_count += len(calendar_ids)
+        log.info(
+            "parsed batch",
+            last_id=last_id,
+            updated_count=updated_count,
+            invalidated_calendar_count=invalidated_calendar_count,
+        )
+
+    log.info(
+        "finished",
+        updated_count=updated_count,
+        invalidated_calendar_count=invalidated_calendar_count,
+    )
+
+
+def main(dry_run: bool = False, reparse_all: bool = False) -> None:
+    config = Config()
+    log = logger.bind(run_id=uuid4().hex)
+    log.info("initiate")
+    sentry_sdk.init(
+        send_default_pii=True,
+        traces_sample_rate=1.0,
+        profiles_sample_rate=1.0,
+    )
+    start = time.monotonic()
+    asyncio.run(
+        job(
+            log=log,
+            dry_run=dry_run,
+            reparse_all=reparse_all,
+            database_url=str(config.DATABASE_URL),
+        )
+    )
+    log.info("done!", total_time_sec=time.monotonic() - start)
+    log.info("exiting")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,73 @@
+import asyncio
+from dataclasses import replace
+from datetime import date, timedelta
+
+import pytest
+import structlog
+from django.db import connection
+from django.test.client import Client
+
+from recipeyak.calendar_day_ingredients import ensure_built, get_combined_ingredients
+from recipeyak.combine import Ingredient, ParsedIngredient, to_parsed_ingredient
+from recipeyak.fixtures import create_recipe, create_team, create_user
+from recipeyak.jobs import backfill_parsed_ingredients
+from recipeyak.models import Calendar
+
+
+def _database_url() -> str:
+    settings = connection.settings_dict
+    host = settings["HOST"] or "localhost"
+    port = settings["PORT"] or 5432
+    return f"postgres://{settings['USER']}:{settings['PASSWORD']}@{host}:{port}/{settings['NAME']}"
+
+
+# the job writes on its own connection, so the rows must be committed
+@pytest.mark.django_db(transaction=True)
+def test_reparse_rebuilds_day_ingredients(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Reparsing changes the keys of the calendar day sums, so calendars are
+    rebuilt instead of later edits subtracting keys that were never added.
+    """
+    client = Client()
+    user = create_user()
+    team = create_team(user=user)
+    recipe = create_recipe(team=team, user=user)
+    calendar = Calendar.objects.get(team=team)
+    start = date(1976, 7, 6)
+    end = start + timedelta(days=7)
+    ensure_built(calendar_id=calendar.id)
+    client.force_login(user)
+    res = client.post(
+        "/api/v1/calendar/",
+        {"recipe": recipe.id, "on": str(start)},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+
+    def reparse(ingredient: Ingredient) -> ParsedIngredient:
+        # like a change to the parser
+        parsed = to_parsed_ingredient(ingredient)
+        return replace(parsed, name=parsed.name + " (reparsed)")
+
+    monkeypatch.setattr(backfill_parsed_ingredients, "to_parsed_ingredient", reparse)
+    asyncio.run(
+        backfill_parsed_ingredients.job(
+            log=structlog.stdlib.get_logger(),
+            dry_run=False,
+            reparse_all=True,
+            database_url=_database_url(),
+        )
+    )
+    calendar.refresh_from_db()
+    assert not calendar.day_ingredients_built
+
+    egg = recipe.ingredient_set.get(name="egg")
+    res = client.patch(
+        f"/api/v1/ingredients/{egg.id}/",
+        {"quantity": "2 lbs"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    ensure_built(calendar_id=calendar.id)
+    combined = get_combined_ingredients(calendar_id=calendar.id, start=start, end=end)
+    assert [q.quantity for q in combined["egg"]] == [2]
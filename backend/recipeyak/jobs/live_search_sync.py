@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
-import random
 import time
-from typing import Any
+from datetime import UTC, datetime
+from typing import Annotated, Any
 from uuid import uuid4
 
 import asyncpg
@@ -12,6 +13,7 @@ import sentry_sdk
 import structlog
 import typer
 from algoliasearch.search_client import SearchClient
+from algoliasearch.search_index_async import SearchIndexAsync
 from dotenv import load_dotenv
 from pydantic import PostgresDsn
 from pydantic_settings import BaseSettings
@@ -22,6 +24,22 @@ logger = structlog.stdlib.get_logger()
 load_dotenv()
 
 
+# Queue rows claimed per transaction.
+BATCH_SIZE = 1_000
+# Documents per Algolia request.
+UPLOAD_CHUNK_SIZE = 200
+MAX_CONCURRENT_UPLOADS = 4
+# Recipes fetched from the cursor at a time when backfilling.
+BACKFILL_PAGE_SIZE = 1_000
+# After a notification, wait until they've been quiet this long so a burst,
+# e.g., saving a recipe with 200 ingredients, is indexed in one go...
+COALESCE_WINDOW_SEC = 0.25
+# ...but don't hold off indexing for longer than this under constant writes.
+MAX_INDEXING_DELAY_SEC = 2
+# Drain the queue even without a notification, in case we missed one.
+POLL_INTERVAL_SEC = 60
+
+
 class Config(BaseSettings):
     DATABASE_URL: PostgresDsn
     SENTRY_DSN: str
@@ -29,188 +47,454 @@ class Config(BaseSettings):
     ALGOLIA_ADMIN_API_KEY: str
 
 
+# The search document for a `core_recipe` row.
+_DOCUMENT_JSON = """
+    json_object(
+        'objectID': id,
+        'id': id,
+        'name': name,
+        'author': author,
+        'source': source,
+        'time': time,
+        'servings': servings,
+        'archived': archived_at is distinct from null,
+        'archived_at': archived_at,
+        'tags': tags,
+        'team_id': team_id,
+        'primary_image': (
+            select json_object(
+                'url': 'https://images-cdn.recipeyak.com/' || "key" ,
+                'background_url': "background_url",
+                'created_by_id': "created_by_id"
+            )
+            from core_upload
+            where core_upload.id = core_recipe.primary_image_id
+        ),
+        'archived_by_id': (
+            select archived_by_id
+            from recipe_stats
+            where recipe_stats.recipe_id = core_recipe.id
+        ),
+        'favorite_by_user_id': (
+            select to_json(favorite_by_user_ids)
+            from recipe_stats
+            where recipe_stats.recipe_id = core_recipe.id
+        ),
+        'created_by_id': (
+            select created_by_id
+            from recipe_stats
+            where recipe_stats.recipe_id = core_recipe.id
+        ),
+        'scheduled_by_id': (
+            select to_json(scheduled_by_ids)
+            from recipe_stats
+            where recipe_stats.recipe_id = core_recipe.id
+        ),
+        -- relative to today, so it isn't precomputed in recipe_stats
+        'scheduled_count': (
+            SELECT
+                count(*)
+            FROM
+                core_scheduledrecipe
+            WHERE
+                core_scheduledrecipe.recipe_id = core_recipe.id
+                and core_scheduledrecipe.on > (now() - '1.5 years'::interval)
+                and core_scheduledrecipe.on < now()
+        ),
+        'scheduled_count_all_time': coalesce((
+            select scheduled_count_all_time
+            from recipe_stats
+            where recipe_stats.recipe_id = core_recipe.id
+        ), 0),
+        'ingredients': (
+            SELECT
+                json_agg(ingredient)
+            FROM (
+                SELECT
+                    json_object(
+                        'id': id,
+                        'description': "description",
+                        'quantity_name': "quantity" || ' ' || "name",
+                        'quantity_name_description': "quantity" || ' ' || "name" || ', ' || "description",
+                        'recipe_id': "recipe_id",
+                        'quantity': "quantity",
+                        'name': "name",
+                        'optional': "optional"
+                    ) AS ingredient
+                FROM
+                    core_ingredient
+                WHERE
+                    recipe_id = core_recipe.id
+                ORDER BY
+                    position ASC
+            ) sub
+        )
+    )
+"""
+
+_DOCUMENTS_SQL = f"""
+select {_DOCUMENT_JSON} recipe
+from core_recipe
+where team_id is not null
+    and core_recipe.id = any($1)
+"""
+
+_BACKFILL_DOCUMENTS_SQL = f"""
+select core_recipe.id, {_DOCUMENT_JSON} recipe
+from core_recipe
+where team_id is not null
+    and core_recipe.id > $1
+order by core_recipe.id
+"""
+
+
+def _chunks(items: list[Any], size: int) -> list[list[Any]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def attribute_hashes(document: dict[str, Any]) -> dict[str, str]:
+    return {
+        key: hashlib.md5(
+            json.dumps(value, sort_keys=True).encode(), usedforsecurity=False
+        ).hexdigest()
+        for key, value in document.items()
+    }
+
+
+def diff_documents(
+    documents: list[dict[str, Any]], *, previous_hashes: dict[int, dict[str, str]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Compare the documents to what we last pushed, returning the documents to
+    save in full & the partial updates for the ones where only some
+    attributes changed. Unchanged documents are left out.
+    """
+    full = []
+    partial = []
+    for document in documents:
+        previous = previous_hashes.get(document["id"])
+        hashes = attribute_hashes(document)
+        if previous is None or previous.keys() != hashes.keys():
+            full.append(document)
+            continue
+        changed = {
+            key: value
+            for key, value in document.items()
+            if hashes[key] != previous[key]
+        }
+        if changed:
+            partial.append({"objectID": document["objectID"], **changed})
+    return full, partial
+
+
+async def get_pushed_hashes(
+    connection: asyncpg.Connection[Any], recipe_ids: list[int]
+) -> dict[int, dict[str, str]]:
+    rows = await connection.fetch(
+        """
+select recipe_id, attribute_hashes
+from recipe_search_document
+where recipe_id = any($1)
+""",
+        recipe_ids,
+    )
+    return {row["recipe_id"]: json.loads(row["attribute_hashes"]) for row in rows}
+
+
+async def save_pushed_hashes(
+    connection: asyncpg.Connection[Any],
+    *,
+    documents: list[dict[str, Any]],
+    deleted_recipe_ids: list[int],
+) -> None:
+    await connection.execute(
+        """
+insert into recipe_search_document (created, modified, recipe_id, attribute_hashes)
+select now(), now(), document.recipe_id, document.attribute_hashes
+from unnest($1::int[], $2::jsonb[]) as document(recipe_id, attribute_hashes)
+on conflict (recipe_id)
+do update set
+  attribute_hashes = excluded.attribute_hashes,
+  modified = excluded.modified
+""",
+        [document["id"] for document in documents],
+        [json.dumps(attribute_hashes(document)) for document in documents],
+    )
+    await connection.execute(
+        "delete from recipe_search_document where recipe_id = any($1)",
+        deleted_recipe_ids,
+    )
+
+
+async def upload(
+    index: SearchIndexAsync,
+    *,
+    documents: list[dict[str, Any]],
+    partial_updates: list[dict[str, Any]],
+    deleted_recipe_ids: list[int],
+) -> None:
+    """
+    Push the documents in chunks, a few requests at a time.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+    async def save(chunk: list[dict[str, Any]]) -> None:
+        async with semaphore:
+            await index.save_objects_async(chunk)
+
+    async def partial_update(chunk: list[dict[str, Any]]) -> None:
+        async with semaphore:
+            await index.partial_update_objects_async(chunk)
+
+    async def delete(chunk: list[int]) -> None:
+        async with semaphore:
+            await index.delete_objects_async([str(recipe_id) for recipe_id in chunk])
+
+    await asyncio.gather(
+        *(save(chunk) for chunk in _chunks(documents, UPLOAD_CHUNK_SIZE)),
+        *(
+            partial_update(chunk)
+            for chunk in _chunks(partial_updates, UPLOAD_CHUNK_SIZE)
+        ),
+        *(delete(chunk) for chunk in _chunks(deleted_recipe_ids, UPLOAD_CHUNK_SIZE)),
+    )
+
+
 async def process_queue(
     connection: asyncpg.Connection[Any],
     *,
-    config: Config,
-    backfill_all: bool,
+    index: SearchIndexAsync,
     log: BoundLogger,
 ) -> None:
-    async with SearchClient.create(
-        app_id=config.ALGOLIA_APPLICATION_ID, api_key=config.ALGOLIA_ADMIN_API_KEY
-    ) as client:
-        index = client.init_index("recipes")
+    """
+    Index the queued recipes, a batch at a time.
+
+    Rows are claimed with `skip locked` so multiple workers can drain the queue
+    in parallel. A recipe's rows can be split across workers, so we also lock
+    each recipe until the batch commits. Otherwise a worker could upload an
+    older document after another's newer one & overwrite its hashes.
+    """
+    while True:
         async with connection.transaction():
-            recipes_to_index = await connection.fetch(
+            queued = await connection.fetch(
                 """
-select id, recipe_id, deleted
+select id, recipe_id, created
 from recipe_index_queue
-"""
+order by id
+limit $1
+for update skip locked
+""",
+                BATCH_SIZE,
             )
-            res = await connection.fetch(
+            if not queued:
+                return
+            # ingredient triggers queue a row per ingredient change
+            recipe_ids = sorted({row["recipe_id"] for row in queued})
+            # sorted so workers take the locks in the same order
+            await connection.execute(
                 """
-        SELECT
-            json_object(
-                'objectID': id,
-                'id': id,
-                'name': name,
-                'author': author,
-                'source': source,
-                'time': time,
-                'servings': servings,
-                'archived': archived_at is distinct from null,
-                'archived_at': archived_at,
-                'tags': tags,
-                'team_id': team_id,
-                'primary_image': (
-                    select json_object(
-                        'url': 'https://images-cdn.recipeyak.com/' || "key" ,
-                        'background_url': "background_url",
-                        'created_by_id': "created_by_id"
-                    )
-                    from core_upload
-                    where core_upload.id = core_recipe.primary_image_id
-                ),
-                'archived_by_id': (
-                    select
-                        created_by_id
-                    from (
-                        select distinct on (recipe_id)
-                            recipe_id,
-                            action,
-                            created_by_id
-                        from
-                            timeline_event
-                        where
-                            action in ('archived', 'unarchived')
-                        order by
-                            recipe_id,
-                            created desc
-                    ) sub
-                    where
-                        action = 'archived'
-                        and created_by_id is not null
-                        and recipe_id = core_recipe.id
-                ),
-                'favorite_by_user_id': (
-                    select json_agg(distinct user_id)
-                    from recipe_favorite
-                    where recipe_id = core_recipe.id
-                ),
-                'created_by_id': (
-                    select
-                        created_by_id
-                    from
-                        timeline_event
-                    where recipe_id = core_recipe.id
-                        and action = 'created'
-                    limit 1
-                ),
-                'scheduled_by_id': (
-                    select json_agg(distinct created_by_id)
-                    from core_scheduledrecipe
-                    where recipe_id = core_recipe.id
-                        and created_by_id is not null
-                ),
-                'scheduled_count': (
-                    SELECT
-                        count(*)
-                    FROM
-                        core_scheduledrecipe
-                    WHERE
-                        core_scheduledrecipe.recipe_id = core_recipe.id
-                        and core_scheduledrecipe.on > (now() - '1.5 years'::interval)
-                        and core_scheduledrecipe.on < now()
-                ),
-                'scheduled_count_all_time': (
-                    SELECT
-                        count(*)
-                    FROM
-                        core_scheduledrecipe
-                    WHERE
-                        core_scheduledrecipe.recipe_id = core_recipe.id
-                ),
-                'ingredients': (
-                    SELECT
-                        json_agg(ingredient)
-                    FROM (
-                        SELECT
-                            json_object(
-                                'id': id,
-                                'description': "description",
-                                'quantity_name': "quantity" || ' ' || "name",
-                                'quantity_name_description': "quantity" || ' ' || "name" || ', ' || "description",
-                                'recipe_id': "recipe_id",
-                                'quantity': "quantity",
-                                'name': "name",
-                                'optional': "optional"
-                            ) AS ingredient
-                        FROM
-                            core_ingredient
-                        WHERE
-                            recipe_id = core_recipe.id
-                        ORDER BY
-                            position ASC
-                    ) sub
-                )
-            ) recipe
-        FROM
-            core_recipe
-        WHERE
-            team_id IS NOT NULL
-            and (core_recipe.id = ANY($1) or $2);
-        """,
-                [x["recipe_id"] for x in recipes_to_index],
-                backfill_all,
+select pg_advisory_xact_lock(hashtext('recipe_index'), recipe_id)
+from unnest($1::int[]) as recipe_id
+order by recipe_id
+""",
+                recipe_ids,
             )
-            updated_recipes = [json.loads(row["recipe"]) for row in res]
-            await index.save_objects_async(updated_recipes)
-
+            res = await connection.fetch(_DOCUMENTS_SQL, recipe_ids)
+            documents = [json.loads(row["recipe"]) for row in res]
+            # Deleted recipes, or those no longer on a team, won't have a
+            # document. We can't rely on `deleted` since deleting an ingredient
+            # also sets it.
+            indexed_recipe_ids = {document["id"] for document in documents}
             deleted_recipe_ids = [
-                x["recipe_id"] for x in recipes_to_index if x["deleted"]
+                recipe_id
+                for recipe_id in recipe_ids
+                if recipe_id not in indexed_recipe_ids
             ]
-            await index.delete_objects_async(deleted_recipe_ids)
-
-            ids_to_delete = [x["id"] for x in recipes_to_index]
-            recipes_to_index = await connection.fetch(
-                """
-delete from recipe_index_queue where id = ANY($1)
-""",
-                ids_to_delete,
+            full, partial = diff_documents(
+                documents,
+                previous_hashes=await get_pushed_hashes(connection, recipe_ids),
+            )
+            await upload(
+                index,
+                documents=full,
+                partial_updates=partial,
+                deleted_recipe_ids=deleted_recipe_ids,
+            )
+            await save_pushed_hashes(
+                connection,
+                documents=documents,
+                deleted_recipe_ids=deleted_recipe_ids,
+            )
+            await connection.execute(
+                "delete from recipe_index_queue where id = any($1)",
+                [row["id"] for row in queued],
             )
             log.info(
                 "indexed",
+                queued=len(queued),
+                # time from the oldest change in the batch to it being indexed
+                indexing_lag_sec=(
+                    datetime.now(UTC) - min(row["created"] for row in queued)
+                ).total_seconds(),
                 deleted=len(deleted_recipe_ids),
-                upserted=len(updated_recipes),
+                upserted=len(full),
+                partially_updated=len(partial),
+                unchanged=len(documents) - len(full) - len(partial),
             )
+        if len(queued) < BATCH_SIZE:
+            return
+
+
+async def backfill(
+    connection: asyncpg.Connection[Any],
+    *,
+    hashes_connection: asyncpg.Connection[Any],
+    index: SearchIndexAsync,
+    log: BoundLogger,
+    after_id: int,
+) -> None:
+    """
+    Index every recipe with an ID greater than `after_id`, in constant memory.
+
+    We page through a server-side cursor, uploading each page while building
+    the next. Progress logs include the `last_id` to resume from.
+
+    Every document is pushed in full, ignoring the hashes of what we last
+    pushed, so this also repairs the index. The hashes are saved on a separate
+    connection as each page is uploaded, outside the cursor's transaction.
+    """
+
+    async def push(documents: list[dict[str, Any]]) -> None:
+        await upload(
+            index, documents=documents, partial_updates=[], deleted_recipe_ids=[]
+        )
+        await save_pushed_hashes(
+            hashes_connection, documents=documents, deleted_recipe_ids=[]
+        )
+
+    total = await connection.fetchval(
+        "select count(*) from core_recipe where team_id is not null and id > $1",
+        after_id,
+    )
+    log = log.bind(total=total)
+    start = time.monotonic()
+    indexed = 0
+    last_id = after_id
+    previous_upload: asyncio.Task[None] | None = None
+    # cursors only live as long as their transaction
+    async with connection.transaction(readonly=True):
+        cursor = await connection.cursor(_BACKFILL_DOCUMENTS_SQL, after_id)
+        while rows := await cursor.fetch(BACKFILL_PAGE_SIZE):
+            documents = [json.loads(row["recipe"]) for row in rows]
+            if previous_upload is not None:
+                await previous_upload
+                log.info(
+                    "backfill progress",
+                    indexed=indexed,
+                    last_id=last_id,
+                    docs_per_sec=round(indexed / (time.monotonic() - start)),
+                )
+            previous_upload = asyncio.create_task(push(documents))
+            indexed += len(documents)
+            last_id = rows[-1]["id"]
+    if previous_upload is not None:
+        await previous_upload
+    log.info("backfilled", indexed=indexed, last_id=last_id)
 
 
-async def job(*, log: BoundLogger, config: Config, backfill_all: bool) -> None:
+async def job(
+    *,
+    log: BoundLogger,
+    config: Config,
+    backfill_all: bool,
+    backfill_after_id: int,
+) -> None:
     dsn = str(config.DATABASE_URL)
     pg = await asyncpg.connect(dsn=dsn)
 
-    if backfill_all:
-        await process_queue(pg, config=config, backfill_all=backfill_all, log=log)
-        return
+    async with SearchClient.create(
+        app_id=config.ALGOLIA_APPLICATION_ID, api_key=config.ALGOLIA_ADMIN_API_KEY
+    ) as client:
+        index = client.init_index("recipes")
 
-    async def callback(
-        conn: asyncpg.Connection[Any],
-        pid: int,
-        channel: str,
-        payload: object,
-    ) -> None:
-        await process_queue(conn, config=config, backfill_all=backfill_all, log=log)
+        if backfill_all:
+            hashes_pg = await asyncpg.connect(dsn=dsn)
+            await backfill(
+                pg,
+                hashes_connection=hashes_pg,
+                index=index,
+                log=log,
+                after_id=backfill_after_id,
+            )
+            await process_queue(pg, index=index, log=log)
+            return
 
-    await pg.add_listener("recipe_enqueued_for_indexing", callback)  # type: ignore[arg-type]
-    await pg.execute("notify recipe_enqueued_for_indexing")
+        notified = asyncio.Event()
+
+        def callback(
+            conn: asyncpg.Connection[Any],
+            pid: int,
+            channel: str,
+            payload: object,
+        ) -> None:
+            notified.set()
+
+        await pg.add_listener("recipe_enqueued_for_indexing", callback)  # type: ignore[arg-type]
+
+        # A single consumer drains the queue so runs never overlap on the
+        # connection. Notifications during a run trigger another one.
+        while True:
+            await process_queue(pg, index=index, log=log)
+            await log_queue_metrics(pg, log=log)
+            await wait_for_notifications(notified)
 
-    while True:
-        await asyncio.sleep(0.5)
-        if random.random() < 0.005:
-            log.info("tick")
 
+async def wait_for_notifications(notified: asyncio.Event) -> None:
+    """
+    Wait for a notification, then until they've been quiet for
+    `COALESCE_WINDOW_SEC`, or `MAX_INDEXING_DELAY_SEC` has passed.
+    """
+    try:
+        await asyncio.wait_for(notified.wait(), timeout=POLL_INTERVAL_SEC)
+    except TimeoutError:
+        return
+    deadline = time.monotonic() + MAX_INDEXING_DELAY_SEC
+    while (remaining := deadline - time.monotonic()) > 0:
+        notified.clear()
+        try:
+            await asyncio.wait_for(
+                notified.wait(), timeout=min(COALESCE_WINDOW_SEC, remaining)
+            )
+        except TimeoutError:
+            break
+    notified.clear()
+
+
+async def log_queue_metrics(
+    connection: asyncpg.Connection[Any], *, log: BoundLogger
+) -> None:
+    row = await connection.fetchrow(
+        """
+select
+  count(*) as queue_depth,
+  extract(epoch from now() - min(created))::float as oldest_queued_age_sec
+from recipe_index_queue
+"""
+    )
+    assert row is not None
+    log.info(
+        "queue metrics",
+        queue_depth=row["queue_depth"],
+        oldest_queued_age_sec=row["oldest_queued_age_sec"],
+    )
 
-def main(backfill_all: bool = False) -> None:
+
+def main(
+    backfill_all: bool = False,
+    backfill_after_id: Annotated[
+        int, typer.Option(help="Resume a backfill from the last_id it logged.")
+    ] = 0,
+) -> None:
     log = logger.bind(run_id=uuid4().hex)
     log.info("initiate")
     sentry_sdk.init(
@@ -219,7 +503,14 @@ def main(backfill_all: bool = False) -> None:
     )
     config = Config()
     start = time.monotonic()
-    asyncio.run(job(log=log, config=config, backfill_all=backfill_all))
+    asyncio.run(
+        job(
+            log=log,
+            config=config,
+            backfill_all=backfill_all,
+            backfill_after_id=backfill_after_id,
+        )
+    )
     log.info("done!", total_time_sec=time.monotonic() - start)
     log.info("exiting")
 
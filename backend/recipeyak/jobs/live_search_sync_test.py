@@ -0,0 +1,57 @@
+from typing import Any
+
+from recipeyak.jobs.live_search_sync import attribute_hashes, diff_documents
+
+
+def _document(**kwargs: Any) -> dict[str, Any]:
+    return {
+        "objectID": 1,
+        "id": 1,
+        "name": "Pasta",
+        "ingredients": [{"name": "tomato"}],
+        "archived": False,
+    } | kwargs
+
+
+def test_diff_documents_new_document() -> None:
+    document = _document()
+    assert diff_documents([document], previous_hashes={}) == ([document], [])
+
+
+def test_diff_documents_unchanged() -> None:
+    document = _document()
+    assert diff_documents(
+        [document], previous_hashes={1: attribute_hashes(document)}
+    ) == ([], [])
+
+
+def test_diff_documents_partial_update() -> None:
+    """
+    Only the changed attributes are sent, along with the objectID.
+    """
+    previous = attribute_hashes(_document())
+    document = _document(name="Pasta al pomodoro", ingredients=[{"name": "tomatoes"}])
+    assert diff_documents([document], previous_hashes={1: previous}) == (
+        [],
+        [
+            {
+                "objectID": 1,
+                "name": "Pasta al pomodoro",
+                "ingredients": [{"name": "tomatoes"}],
+            }
+        ],
+    )
+
+
+def test_diff_documents_changed_attributes() -> None:
+    """
+    Adding or removing an attribute saves the whole document, a partial update
+    can't remove one.
+    """
+    previous = attribute_hashes(_document())
+    added = _document(tags=["dinner"])
+    removed = _document(objectID=2, id=2)
+    del removed["archived"]
+    assert diff_documents(
+        [added, removed], previous_hashes={1: previous, 2: previous}
+    ) == ([added, removed], [])
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+from uuid import uuid4
+
+import asyncpg
+import sentry_sdk
+import structlog
+import typer
+from ably import AblyRest
+from ably.types.message import Message
+from dotenv import load_dotenv
+from pydantic import PostgresDsn
+from pydantic_settings import BaseSettings
+from structlog.stdlib import BoundLogger
+
+logger = structlog.stdlib.get_logger()
+
+load_dotenv()
+
+BATCH_SIZE = 500
+# Wait a moment after being notified so a burst of changes, e.g., a bulk
+# edit, is drained as one batch and its `recipe_modified` events coalesce.
+COALESCE_WINDOW_SEC = 0.25
+# Retry failed publishes even if nothing new is enqueued.
+RETRY_INTERVAL_SEC = 5
+MAX_CONCURRENT_PUBLISHES = 16
+# Give up on messages Ably keeps rejecting, e.g., a payload over the size
+# limit.
+MAX_PUBLISH_ATTEMPTS = 10
+# Clients refetch when they reconnect, so after an outage there's no point
+# replaying old events.
+MAX_MESSAGE_AGE = timedelta(minutes=10)
+
+
+class Config(BaseSettings):
+    DATABASE_URL: PostgresDsn
+    SENTRY_DSN: str
+    ABLY_API_KEY: str
+
+
+def coalesce(rows: Sequence[asyncpg.Record]) -> dict[str, list[Message]]:
+    """
+    Group the messages by channel, preserving order.
+
+    `recipe_modified` only tells clients to refetch the recipe, so we send it
+    once per channel.
+    """
+    messages: dict[str, list[Message]] = defaultdict(list)
+    recipe_modified = set[str]()
+    for row in rows:
+        if row["name"] == "recipe_modified":
+            if row["channel"] in recipe_modified:
+                continue
+            recipe_modified.add(row["channel"])
+        messages[row["channel"]].append(
+            Message(name=row["name"], data=json.loads(row["data"]))
+        )
+    return messages
+
+
+async def drain(
+    pg: asyncpg.Connection[Any], *, ably: AblyRest, log: BoundLogger
+) -> None:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PUBLISHES)
+
+    async def publish(channel: str, messages: list[Message]) -> None:
+        async with semaphore:
+            await ably.channels[channel].publish(messages=messages)
+
+    stale_rows = await pg.fetch(
+        """
+delete from realtime_outbox
+where id in (
+  select id
+  from realtime_outbox
+  where created < now() - $1::interval
+  for update skip locked
+)
+returning channel, name
+""",
+        MAX_MESSAGE_AGE,
+    )
+    if stale_rows:
+        log.warning(
+            "dropped stale messages",
+            messages=len(stale_rows),
+            channels=sorted({row["channel"] for row in stale_rows}),
+        )
+
+    while True:
+        async with pg.transaction():
+            rows = await pg.fetch(
+                """
+select id, channel, name, data
+from realtime_outbox
+order by id
+limit $1
+for update skip locked
+""",
+                BATCH_SIZE,
+            )
+            if not rows:
+                return
+            messages = coalesce(rows)
+            results = await asyncio.gather(
+                *(publish(channel, msgs) for channel, msgs in messages.items()),
+                return_exceptions=True,
+            )
+            failed_channels = set[str]()
+            for channel, result in zip(messages, results, strict=True):
+                if isinstance(result, BaseException):
+                    failed_channels.add(channel)
+                    log.error("failed to publish", channel=channel, exc_info=result)
+            await pg.execute(
+                "delete from realtime_outbox where id = any($1)",
+                [row["id"] for row in rows if row["channel"] not in failed_channels],
+            )
+            # failed messages stay in the outbox to be retried, until they run
+            # out of attempts
+            failed_ids = [
+                row["id"] for row in rows if row["channel"] in failed_channels
+            ]
+            dropped_rows = await pg.fetch(
+                """
+delete from realtime_outbox
+where id = any($1) and attempts + 1 >= $2
+returning channel, name
+""",
+                failed_ids,
+                MAX_PUBLISH_ATTEMPTS,
+            )
+            if dropped_rows:
+                log.warning(
+                    "dropped undeliverable messages",
+                    messages=len(dropped_rows),
+                    channels=sorted({row["channel"] for row in dropped_rows}),
+                    names=sorted({row["name"] for row in dropped_rows}),
+                )
+            await pg.execute(
+                "update realtime_outbox set attempts = attempts + 1 where id = any($1)",
+                failed_ids,
+            )
+            log.info(
+                "published",
+                messages=len(rows),
+                channels=len(messages),
+                coalesced=len(rows) - sum(len(msgs) for msgs in messages.values()),
+                failed_channels=len(failed_channels),
+            )
+        if failed_channels:
+            return
+
+
+async def job(*, log: BoundLogger, config: Config) -> None:
+    pg = await asyncpg.connect(dsn=str(config.DATABASE_URL))
+    enqueued = asyncio.Event()
+
+    def callback(
+        conn: asyncpg.Connection[Any], pid: int, channel: str, payload: object
+    ) -> None:
+        enqueued.set()
+
+    await pg.add_listener("realtime_outbox_enqueued", callback)  # type: ignore[arg-type]
+
+    async with AblyRest(config.ABLY_API_KEY) as ably:
+        while True:
+            try:
+                await asyncio.wait_for(enqueued.wait(), timeout=RETRY_INTERVAL_SEC)
+                await asyncio.sleep(COALESCE_WINDOW_SEC)
+            except TimeoutError:
+                pass
+            enqueued.clear()
+            await drain(pg, ably=ably, log=log)
+
+
+def main() -> None:
+    log = logger.bind(run_id=uuid4().hex)
+    log.info("initiate")
+    sentry_sdk.init(
+        send_default_pii=True,
+        traces_sample_rate=1.0,
+    )
+    config = Config()
+    start = time.monotonic()
+    asyncio.run(job(log=log, config=config))
+    log.info("done!", total_time_sec=time.monotonic() - start)
+    log.info("exiting")
+
+
+if __name__ == "__main__":
+    typer.run(main)
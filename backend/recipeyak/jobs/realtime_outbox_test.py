@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, cast
+
+import asyncpg
+import pytest
+import structlog
+from ably import AblyRest
+from ably.types.message import Message
+from django.db import connection
+
+from recipeyak.jobs.realtime_outbox import MAX_PUBLISH_ATTEMPTS, coalesce, drain
+from recipeyak.models import RealtimeOutbox
+
+
+def _row(channel: str, name: str, data: object) -> asyncpg.Record:
+    return cast(
+        asyncpg.Record, {"channel": channel, "name": name, "data": json.dumps(data)}
+    )
+
+
+def test_coalesce() -> None:
+    """
+    Messages are grouped by channel in order, with one `recipe_modified` per
+    channel.
+    """
+    messages = coalesce(
+        [
+            _row("team:1:recipe:1", "recipe_modified", {"recipeId": 1}),
+            _row("team:1:recipe:1", "note_created", {"id": 1}),
+            _row("team:1:recipe:2", "recipe_modified", {"recipeId": 2}),
+            _row("team:1:recipe:1", "recipe_modified", {"recipeId": 1}),
+            _row("team:1:recipe:1", "note_created", {"id": 2}),
+        ]
+    )
+    assert {
+        channel: [(m.name, m.data) for m in msgs] for channel, msgs in messages.items()
+    } == {
+        "team:1:recipe:1": [
+            ("recipe_modified", {"recipeId": 1}),
+            ("note_created", {"id": 1}),
+            ("note_created", {"id": 2}),
+        ],
+        "team:1:recipe:2": [("recipe_modified", {"recipeId": 2})],
+    }
+
+
+class _FakeChannel:
+    def __init__(self, name: str, ably: _FakeAbly) -> None:
+        self.name = name
+        self.ably = ably
+
+    async def publish(self, *, messages: list[Message]) -> None:
+        if self.name in self.ably.failing_channels:
+            raise Exception("publish failed")
+        self.ably.published[self.name] += [m.name for m in messages]
+
+
+class _FakeAbly:
+    def __init__(self, *, failing_channels: set[str]) -> None:
+        self.failing_channels = failing_channels
+        self.published: dict[str, list[str]] = defaultdict(list)
+        self.channels = self
+
+    def __getitem__(self, name: str) -> _FakeChannel:
+        return _FakeChannel(name, self)
+
+
+def _drain(ably: _FakeAbly) -> None:
+    async def run() -> None:
+        settings = connection.settings_dict
+        pg: asyncpg.Connection[Any] = await asyncpg.connect(
+            user=settings["USER"],
+            password=settings["PASSWORD"],
+            host=settings["HOST"] or None,
+            port=settings["PORT"] or None,
+            database=settings["NAME"],
+        )
+        try:
+            await drain(
+                pg,
+                ably=cast(AblyRest, ably),
+                log=structlog.stdlib.get_logger(),
+            )
+        finally:
+            await pg.close()
+
+    asyncio.run(run())
+
+
+# the job reads the outbox on its own connection, so the rows must be committed
+@pytest.mark.django_db(transaction=True)
+def test_drain() -> None:
+    """
+    Published rows are deleted, a failed channel keeps its rows to be retried
+    until they run out of attempts.
+    """
+    for channel, name in [
+        ("team:1:recipe:1", "recipe_modified"),
+        ("team:1:recipe:1", "recipe_modified"),
+        ("team:1:recipe:2", "recipe_modified"),
+        ("team:1:recipe:2", "note_created"),
+    ]:
+        RealtimeOutbox.objects.create(channel=channel, name=name, data={})
+
+    ably = _FakeAbly(failing_channels={"team:1:recipe:2"})
+    _drain(ably)
+    assert ably.published == {"team:1:recipe:1": ["recipe_modified"]}
+    assert sorted(
+        RealtimeOutbox.objects.values_list("channel", "name", "attempts")
+    ) == [
+        ("team:1:recipe:2", "note_created", 1),
+        ("team:1:recipe:2", "recipe_modified", 1),
+    ]
+
+    # the last attempt fails too
+    RealtimeOutbox.objects.update(attempts=MAX_PUBLISH_ATTEMPTS - 1)
+    _drain(ably)
+    assert not RealtimeOutbox.objects.exists()
+    assert ably.published == {"team:1:recipe:1": ["recipe_modified"]}
+
+    # and once the channel recovers, new messages go out
+    RealtimeOutbox.objects.create(
+        channel="team:1:recipe:2", name="note_created", data={}
+    )
+    ably.failing_channels.clear()
+    _drain(ably)
+    assert not RealtimeOutbox.objects.exists()
+    assert ably.published["team:1:recipe:2"] == ["note_created"]
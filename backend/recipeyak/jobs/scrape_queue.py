@@ -0,0 +1,181 @@
+"""
+Runs the recipe imports queued by `scrape_job_create_view`.
+
+Unlike the other jobs, this uses the Django ORM since it shares the scraping
+& recipe creation code with `recipe_create_view`.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import timedelta
+from typing import Any
+from uuid import uuid4
+
+import django
+import structlog
+import typer
+from dotenv import load_dotenv
+from structlog.stdlib import BoundLogger
+
+load_dotenv()
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "recipeyak.django.settings")
+django.setup()
+
+from django.db import close_old_connections, connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from recipeyak.api.base.exceptions import APIError  # noqa: E402
+from recipeyak.api.recipe_create_view import create_recipe_from_url  # noqa: E402
+from recipeyak.models import ScrapeJob  # noqa: E402
+
+logger = structlog.stdlib.get_logger()
+
+MAX_CONCURRENT_SCRAPES = 4
+# Check for jobs even without a notification, in case we missed one.
+POLL_INTERVAL_SEC = 5
+# Running jobs older than this were abandoned by a worker that exited
+# mid-scrape, so we run them again.
+STALE_JOB_AGE = timedelta(minutes=10)
+# Give up on urls that keep crashing or hanging the worker.
+MAX_ATTEMPTS = 3
+
+
+def claim_job() -> ScrapeJob | None:
+    with transaction.atomic():
+        scrape_job = (
+            ScrapeJob.objects.select_for_update(skip_locked=True)
+            .select_related("team", "created_by")
+            .filter(status=ScrapeJob.QUEUED)
+            .order_by("id")
+            .first()
+        )
+        if scrape_job is None:
+            return None
+        scrape_job.status = ScrapeJob.RUNNING
+        scrape_job.started_at = timezone.now()
+        scrape_job.attempts += 1
+        scrape_job.save(update_fields=["status", "started_at", "attempts", "modified"])
+    return scrape_job
+
+
+def requeue_stale_jobs(*, log: BoundLogger) -> None:
+    now = timezone.now()
+    stale_jobs = ScrapeJob.objects.filter(
+        status=ScrapeJob.RUNNING, started_at__lt=now - STALE_JOB_AGE
+    )
+    failed = stale_jobs.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=ScrapeJob.FAILED,
+        finished_at=now,
+        error_code="scrape_timeout",
+        error_message="Importing the recipe took too long.",
+        modified=now,
+    )
+    if failed:
+        log.warning("failed stale jobs", count=failed)
+    requeued = stale_jobs.filter(attempts__lt=MAX_ATTEMPTS).update(
+        status=ScrapeJob.QUEUED, started_at=None, modified=now
+    )
+    if requeued:
+        log.warning("requeued stale jobs", count=requeued)
+
+
+def run_job(scrape_job: ScrapeJob, *, log: BoundLogger) -> None:
+    log = log.bind(scrape_job_id=scrape_job.id, url=scrape_job.url)
+    start = time.monotonic()
+    try:
+        # membership is only checked when the job is queued
+        if not scrape_job.team.is_member(scrape_job.created_by):
+            raise APIError(code="unknown_team", message="Unknown Team")
+        recipe = create_recipe_from_url(
+            url=scrape_job.url,
+            team=scrape_job.team,
+            user=scrape_job.created_by,
+            log=log,
+        )
+    except APIError as e:
+        scrape_job.status = ScrapeJob.FAILED
+        scrape_job.error_code = e.code
+        scrape_job.error_message = e.message
+    except Exception:
+        log.exception("scrape failed")
+        scrape_job.status = ScrapeJob.FAILED
+        scrape_job.error_code = "unknown_error"
+        scrape_job.error_message = "Problem importing recipe."
+    else:
+        scrape_job.status = ScrapeJob.SUCCEEDED
+        scrape_job.recipe = recipe
+    scrape_job.finished_at = timezone.now()
+    # The job could have been requeued or failed by `requeue_stale_jobs` while
+    # we were scraping, in which case the result is no longer ours to record.
+    # A rerun finds the recipe we created via its canonical url.
+    updated = ScrapeJob.objects.filter(
+        id=scrape_job.id, status=ScrapeJob.RUNNING, attempts=scrape_job.attempts
+    ).update(
+        status=scrape_job.status,
+        recipe=scrape_job.recipe,
+        error_code=scrape_job.error_code,
+        error_message=scrape_job.error_message,
+        finished_at=scrape_job.finished_at,
+        modified=scrape_job.finished_at,
+    )
+    if not updated:
+        log.warning(
+            "job changed while running, dropping result", status=scrape_job.status
+        )
+        return
+    log.info(
+        "ran job",
+        status=scrape_job.status,
+        error_code=scrape_job.error_code,
+        duration_sec=time.monotonic() - start,
+    )
+
+
+def _run_job_in_thread(scrape_job: ScrapeJob, *, log: BoundLogger) -> None:
+    # each worker thread has its own connection, which could have gone stale
+    # while idle
+    close_old_connections()
+    run_job(scrape_job, log=log)
+
+
+def job(*, log: BoundLogger) -> None:
+    listener: Any = connection.get_new_connection(connection.get_connection_params())
+    listener.autocommit = True
+    with listener.cursor() as cursor:
+        cursor.execute("listen scrape_job_enqueued")
+
+    running = set[Future[None]]()
+    with ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_SCRAPES, thread_name_prefix="scrape"
+    ) as executor:
+        while True:
+            close_old_connections()
+            requeue_stale_jobs(log=log)
+            running = {future for future in running if not future.done()}
+            while len(running) < MAX_CONCURRENT_SCRAPES and (scrape_job := claim_job()):
+                running.add(executor.submit(_run_job_in_thread, scrape_job, log=log))
+            if len(running) >= MAX_CONCURRENT_SCRAPES:
+                wait(running, return_when=FIRST_COMPLETED)
+                continue
+            # wait for a job to be queued
+            select.select([listener], [], [], POLL_INTERVAL_SEC)
+            listener.poll()
+            listener.notifies.clear()
+
+
+def main() -> None:
+    log = logger.bind(run_id=uuid4().hex)
+    log.info("initiate")
+    start = time.monotonic()
+    job(log=log)
+    log.info("done!", total_time_sec=time.monotonic() - start)
+    log.info("exiting")
+
+
+if __name__ == "__main__":
+    typer.run(main)
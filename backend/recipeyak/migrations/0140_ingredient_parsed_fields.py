@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0139_create_default_calendar_pins"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_name",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_quantity",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_unit",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="parsed_unknown_unit",
+            field=models.TextField(null=True),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:14
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("recipeyak", "0140_ingredient_parsed_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shoppinglist",
+            name="calendar_id",
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="shoppinglist",
+            name="end",
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name="shoppinglist",
+            name="recipes",
+            field=models.JSONField(null=True),
+        ),
+        migrations.AddField(
+            model_name="shoppinglist",
+            name="start",
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name="shoppinglist",
+            name="version",
+            field=models.TextField(null=True),
+        ),
+        AddIndexConcurrently(
+            model_name="shoppinglist",
+            index=models.Index(
+                fields=["calendar_id", "start", "end", "version"],
+                name="shoppinglist_cache_key_idx",
+            ),
+        ),
+    ]
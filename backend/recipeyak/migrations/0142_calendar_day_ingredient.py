@@ -0,0 +1,61 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0141_shoppinglist_cache_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="calendar",
+            name="day_ingredients_built",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether the calendar's `CalendarDayIngredient` rows have been built.",
+            ),
+        ),
+        migrations.CreateModel(
+            name="CalendarDayIngredient",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("on", models.DateField()),
+                ("name", models.TextField()),
+                ("normalized_name", models.TextField()),
+                ("unit", models.TextField()),
+                ("unknown_unit", models.TextField()),
+                ("quantity", models.TextField()),
+                ("count", models.IntegerField()),
+                (
+                    "calendar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="recipeyak.calendar",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "calendar_day_ingredient",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="calendardayingredient",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "calendar",
+                    "on",
+                    "name",
+                    "normalized_name",
+                    "unit",
+                    "unknown_unit",
+                ),
+                name="calendar_day_ingredient_uniq",
+            ),
+        ),
+    ]
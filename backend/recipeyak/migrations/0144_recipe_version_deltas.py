@@ -0,0 +1,54 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:44
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("recipeyak", "0143_realtime_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingredienthistorical",
+            name="deleted",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="recipehistorical",
+            name="is_snapshot",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name="sectionhistorical",
+            name="deleted",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="stephistorical",
+            name="deleted",
+            field=models.BooleanField(default=False),
+        ),
+        AddIndexConcurrently(
+            model_name="ingredienthistorical",
+            index=models.Index(
+                fields=["ingredient_id", "recipe_historical"],
+                name="ingredient_hist_item_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="sectionhistorical",
+            index=models.Index(
+                fields=["section_id", "recipe_historical"], name="section_hist_item_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="stephistorical",
+            index=models.Index(
+                fields=["step_id", "recipe_historical"], name="step_hist_item_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:53
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0144_recipe_version_deltas"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeSearchDocument",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("recipe_id", models.IntegerField(unique=True)),
+                ("attribute_hashes", models.JSONField()),
+            ],
+            options={
+                "db_table": "recipe_search_document",
+            },
+        ),
+    ]
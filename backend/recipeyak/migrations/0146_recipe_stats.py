@@ -0,0 +1,179 @@
+# Generated by Django 3.2.25 on 2026-10-18 18:57
+
+import django.contrib.postgres.fields
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0145_recipe_search_document"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeStats",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("recipe_id", models.IntegerField(unique=True)),
+                ("created_by_id", models.IntegerField(db_index=True, null=True)),
+                ("archived_by_id", models.IntegerField(db_index=True, null=True)),
+                ("scheduled_count_all_time", models.IntegerField(default=0)),
+                (
+                    "scheduled_by_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), null=True, size=None
+                    ),
+                ),
+                (
+                    "favorite_by_user_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), null=True, size=None
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "recipe_stats",
+            },
+        ),
+        migrations.RunSQL(
+            """
+CREATE OR REPLACE FUNCTION refresh_recipe_stats(stats_recipe_id integer)
+RETURNS void AS $$
+    INSERT INTO recipe_stats (
+        created,
+        modified,
+        recipe_id,
+        created_by_id,
+        archived_by_id,
+        scheduled_count_all_time,
+        scheduled_by_ids,
+        favorite_by_user_ids
+    )
+    SELECT
+        now(),
+        now(),
+        core_recipe.id,
+        (
+            SELECT created_by_id
+            FROM timeline_event
+            WHERE recipe_id = core_recipe.id
+                AND action = 'created'
+            ORDER BY created
+            LIMIT 1
+        ),
+        (
+            SELECT CASE WHEN action = 'archived' THEN created_by_id END
+            FROM timeline_event
+            WHERE recipe_id = core_recipe.id
+                AND action IN ('archived', 'unarchived')
+            ORDER BY created DESC
+            LIMIT 1
+        ),
+        (
+            SELECT count(*)
+            FROM core_scheduledrecipe
+            WHERE recipe_id = core_recipe.id
+        ),
+        (
+            SELECT array_agg(DISTINCT created_by_id)
+            FROM core_scheduledrecipe
+            WHERE recipe_id = core_recipe.id
+                AND created_by_id IS NOT NULL
+        ),
+        (
+            SELECT array_agg(DISTINCT user_id)
+            FROM recipe_favorite
+            WHERE recipe_id = core_recipe.id
+                AND user_id IS NOT NULL
+        )
+    FROM core_recipe
+    WHERE core_recipe.id = stats_recipe_id
+    ON CONFLICT (recipe_id) DO UPDATE SET
+        modified = excluded.modified,
+        created_by_id = excluded.created_by_id,
+        archived_by_id = excluded.archived_by_id,
+        scheduled_count_all_time = excluded.scheduled_count_all_time,
+        scheduled_by_ids = excluded.scheduled_by_ids,
+        favorite_by_user_ids = excluded.favorite_by_user_ids
+    -- skip no-op writes so we don't needlessly reindex the recipe
+    WHERE (
+        recipe_stats.created_by_id,
+        recipe_stats.archived_by_id,
+        recipe_stats.scheduled_count_all_time,
+        recipe_stats.scheduled_by_ids,
+        recipe_stats.favorite_by_user_ids
+    ) IS DISTINCT FROM (
+        excluded.created_by_id,
+        excluded.archived_by_id,
+        excluded.scheduled_count_all_time,
+        excluded.scheduled_by_ids,
+        excluded.favorite_by_user_ids
+    );
+$$ LANGUAGE sql;
+
+SELECT refresh_recipe_stats(id) FROM core_recipe;
+
+CREATE OR REPLACE FUNCTION update_recipe_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' OR TG_OP = 'DELETE' THEN
+        PERFORM refresh_recipe_stats(OLD.recipe_id);
+    END IF;
+    IF TG_OP = 'INSERT' OR (
+        TG_OP = 'UPDATE' AND NEW.recipe_id IS DISTINCT FROM OLD.recipe_id
+    ) THEN
+        PERFORM refresh_recipe_stats(NEW.recipe_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER timeline_event_recipe_stats_trigger
+AFTER INSERT OR UPDATE OR DELETE ON timeline_event
+FOR EACH ROW
+EXECUTE FUNCTION update_recipe_stats();
+
+CREATE TRIGGER recipe_favorite_recipe_stats_trigger
+AFTER INSERT OR UPDATE OR DELETE ON recipe_favorite
+FOR EACH ROW
+EXECUTE FUNCTION update_recipe_stats();
+
+CREATE TRIGGER scheduled_recipe_recipe_stats_trigger
+AFTER INSERT OR UPDATE OR DELETE ON core_scheduledrecipe
+FOR EACH ROW
+EXECUTE FUNCTION update_recipe_stats();
+
+CREATE OR REPLACE FUNCTION delete_recipe_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM recipe_stats WHERE recipe_id = OLD.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER recipe_deleted_recipe_stats_trigger
+AFTER DELETE ON core_recipe
+FOR EACH ROW
+EXECUTE FUNCTION delete_recipe_stats();
+
+-- the stats are part of the search document
+CREATE TRIGGER recipe_stats_modified_trigger
+AFTER INSERT OR UPDATE ON recipe_stats
+FOR EACH ROW
+EXECUTE FUNCTION update_core_ingredient_indexing();
+""",
+            """
+DROP TRIGGER recipe_stats_modified_trigger ON recipe_stats;
+DROP TRIGGER recipe_deleted_recipe_stats_trigger ON core_recipe;
+DROP FUNCTION delete_recipe_stats;
+DROP TRIGGER scheduled_recipe_recipe_stats_trigger ON core_scheduledrecipe;
+DROP TRIGGER recipe_favorite_recipe_stats_trigger ON recipe_favorite;
+DROP TRIGGER timeline_event_recipe_stats_trigger ON timeline_event;
+DROP FUNCTION update_recipe_stats;
+DROP FUNCTION refresh_recipe_stats;
+""",
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0146_recipe_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScrapeJob",
+            fields=[
+                ("created", models.DateTimeField(default=django.utils.timezone.now)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("url", models.TextField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "queued"),
+                            ("running", "running"),
+                            ("succeeded", "succeeded"),
+                            ("failed", "failed"),
+                        ],
+                        default="queued",
+                        max_length=9,
+                    ),
+                ),
+                ("started_at", models.DateTimeField(null=True)),
+                ("finished_at", models.DateTimeField(null=True)),
+                ("error_code", models.TextField(null=True)),
+                ("error_message", models.TextField(null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="recipeyak.recipe",
+                    ),
+                ),
+                (
+                    "team",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="recipeyak.team"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "scrape_job",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="scrapejob",
+            index=models.Index(
+                condition=models.Q(("status", "queued")),
+                fields=["id"],
+                name="scrape_job_queued_idx",
+            ),
+        ),
+        migrations.RunSQL(
+            """
+CREATE OR REPLACE FUNCTION notify_scrape_job_enqueued()
+RETURNS TRIGGER AS $$
+BEGIN
+    notify scrape_job_enqueued;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notify_scrape_job_enqueued_trigger
+AFTER INSERT ON scrape_job
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_scrape_job_enqueued();
+""",
+            """
+DROP TRIGGER notify_scrape_job_enqueued_trigger on scrape_job;
+DROP function notify_scrape_job_enqueued;
+""",
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:12
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("recipeyak", "0147_scrape_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scrape",
+            name="canonical_url",
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="scrape",
+            name="normalized_url",
+            field=models.TextField(null=True),
+        ),
+        AddIndexConcurrently(
+            model_name="scrape",
+            index=models.Index(
+                fields=["normalized_url"], name="scrape_normalized_url_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="scrape",
+            index=models.Index(
+                fields=["canonical_url"], name="scrape_canonical_url_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0148_scrape_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="realtimeoutbox",
+            name="attempts",
+            field=models.IntegerField(default=0),
+        ),
+        # Django drops the default after adding the column, keep it so the
+        # running web workers can still insert while we deploy.
+        migrations.RunSQL(
+            "alter table realtime_outbox alter column attempts set default 0;",
+            reverse_sql="alter table realtime_outbox alter column attempts drop default;",
+        ),
+    ]
@@ -0,0 +1,167 @@
+from django.db import migrations
+
+REFRESH_RECIPE_STATS_LOCKED = """
+CREATE OR REPLACE FUNCTION refresh_recipe_stats(stats_recipe_id integer)
+RETURNS void AS $$
+    -- The aggregates are read from the statement's snapshot, so without this
+    -- two concurrent writes for the same recipe could each miss the other's
+    -- row & the last upsert would win.
+    SELECT pg_advisory_xact_lock(hashtext('recipe_stats'), stats_recipe_id);
+    INSERT INTO recipe_stats (
+        created,
+        modified,
+        recipe_id,
+        created_by_id,
+        archived_by_id,
+        scheduled_count_all_time,
+        scheduled_by_ids,
+        favorite_by_user_ids
+    )
+    SELECT
+        now(),
+        now(),
+        core_recipe.id,
+        (
+            SELECT created_by_id
+            FROM timeline_event
+            WHERE recipe_id = core_recipe.id
+                AND action = 'created'
+            ORDER BY created
+            LIMIT 1
+        ),
+        (
+            SELECT CASE WHEN action = 'archived' THEN created_by_id END
+            FROM timeline_event
+            WHERE recipe_id = core_recipe.id
+                AND action IN ('archived', 'unarchived')
+            ORDER BY created DESC
+            LIMIT 1
+        ),
+        (
+            SELECT count(*)
+            FROM core_scheduledrecipe
+            WHERE recipe_id = core_recipe.id
+        ),
+        (
+            SELECT array_agg(DISTINCT created_by_id)
+            FROM core_scheduledrecipe
+            WHERE recipe_id = core_recipe.id
+                AND created_by_id IS NOT NULL
+        ),
+        (
+            SELECT array_agg(DISTINCT user_id)
+            FROM recipe_favorite
+            WHERE recipe_id = core_recipe.id
+                AND user_id IS NOT NULL
+        )
+    FROM core_recipe
+    WHERE core_recipe.id = stats_recipe_id
+    ON CONFLICT (recipe_id) DO UPDATE SET
+        modified = excluded.modified,
+        created_by_id = excluded.created_by_id,
+        archived_by_id = excluded.archived_by_id,
+        scheduled_count_all_time = excluded.scheduled_count_all_time,
+        scheduled_by_ids = excluded.scheduled_by_ids,
+        favorite_by_user_ids = excluded.favorite_by_user_ids
+    -- skip no-op writes so we don't needlessly reindex the recipe
+    WHERE (
+        recipe_stats.created_by_id,
+        recipe_stats.archived_by_id,
+        recipe_stats.scheduled_count_all_time,
+        recipe_stats.scheduled_by_ids,
+        recipe_stats.favorite_by_user_ids
+    ) IS DISTINCT FROM (
+        excluded.created_by_id,
+        excluded.archived_by_id,
+        excluded.scheduled_count_all_time,
+        excluded.scheduled_by_ids,
+        excluded.favorite_by_user_ids
+    );
+$$ LANGUAGE sql;
+"""
+
+REFRESH_RECIPE_STATS = """
+CREATE OR REPLACE FUNCTION refresh_recipe_stats(stats_recipe_id integer)
+RETURNS void AS $$
+    INSERT INTO recipe_stats (
+        created,
+        modified,
+        recipe_id,
+        created_by_id,
+        archived_by_id,
+        scheduled_count_all_time,
+        scheduled_by_ids,
+        favorite_by_user_ids
+    )
+    SELECT
+        now(),
+        now(),
+        core_recipe.id,
+        (
+            SELECT created_by_id
+            FROM timeline_event
+            WHERE recipe_id = core_recipe.id
+                AND action = 'created'
+            ORDER BY created
+            LIMIT 1
+        ),
+        (
+            SELECT CASE WHEN action = 'archived' THEN created_by_id END
+            FROM timeline_event
+            WHERE recipe_id = core_recipe.id
+                AND action IN ('archived', 'unarchived')
+            ORDER BY created DESC
+            LIMIT 1
+        ),
+        (
+            SELECT count(*)
+            FROM core_scheduledrecipe
+            WHERE recipe_id = core_recipe.id
+        ),
+        (
+            SELECT array_agg(DISTINCT created_by_id)
+            FROM core_scheduledrecipe
+            WHERE recipe_id = core_recipe.id
+                AND created_by_id IS NOT NULL
+        ),
+        (
+            SELECT array_agg(DISTINCT user_id)
+            FROM recipe_favorite
+            WHERE recipe_id = core_recipe.id
+                AND user_id IS NOT NULL
+        )
+    FROM core_recipe
+    WHERE core_recipe.id = stats_recipe_id
+    ON CONFLICT (recipe_id) DO UPDATE SET
+        modified = excluded.modified,
+        created_by_id = excluded.created_by_id,
+        archived_by_id = excluded.archived_by_id,
+        scheduled_count_all_time = excluded.scheduled_count_all_time,
+        scheduled_by_ids = excluded.scheduled_by_ids,
+        favorite_by_user_ids = excluded.favorite_by_user_ids
+    -- skip no-op writes so we don't needlessly reindex the recipe
+    WHERE (
+        recipe_stats.created_by_id,
+        recipe_stats.archived_by_id,
+        recipe_stats.scheduled_count_all_time,
+        recipe_stats.scheduled_by_ids,
+        recipe_stats.favorite_by_user_ids
+    ) IS DISTINCT FROM (
+        excluded.created_by_id,
+        excluded.archived_by_id,
+        excluded.scheduled_count_all_time,
+        excluded.scheduled_by_ids,
+        excluded.favorite_by_user_ids
+    );
+$$ LANGUAGE sql;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0150_scrape_job_attempts"),
+    ]
+
+    operations = [
+        migrations.RunSQL(REFRESH_RECIPE_STATS_LOCKED, REFRESH_RECIPE_STATS),
+    ]
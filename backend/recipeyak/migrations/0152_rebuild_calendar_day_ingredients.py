@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipeyak", "0151_recipe_stats_lock"),
+    ]
+
+    operations = [
+        # Deleting a user didn't subtract the recipes they scheduled, rebuild
+        # every calendar on its next read to drop the leftovers.
+        migrations.RunSQL(
+            "UPDATE core_calendar SET day_ingredients_built = false",
+            migrations.RunSQL.noop,
+        ),
+    ]
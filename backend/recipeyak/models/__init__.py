@@ -4,6 +4,9 @@ from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404
 
 from recipeyak.models.calendar import Calendar
+from recipeyak.models.calendar_day_ingredient import (
+    CalendarDayIngredient,  # noqa: F401
+)
 from recipeyak.models.ingredient import Ingredient
 from recipeyak.models.ingredient_historical import IngredientHistorical  # noqa: F401
 from recipeyak.models.invite import Invite  # noqa: F401
@@ -11,6 +14,7 @@ from recipeyak.models.membership import Membership, get_random_ical_id  # noqa:
 from recipeyak.models.note import Note
 from recipeyak.models.note_historical import NoteHistorical as NoteHistorical
 from recipeyak.models.reaction import Reaction
+from recipeyak.models.realtime_outbox import RealtimeOutbox  # noqa: F401
 from recipeyak.models.recipe import Recipe
 from recipeyak.models.recipe_change import ChangeType, RecipeChange  # noqa: F401
 from recipeyak.models.recipe_cook_checklist_check import (
@@ -19,10 +23,13 @@ from recipeyak.models.recipe_cook_checklist_check import (
 from recipeyak.models.recipe_favorite import RecipeFavorite  # noqa: F401
 from recipeyak.models.recipe_historical import RecipeHistorical  # noqa: F401
 from recipeyak.models.recipe_index_queue import RecipeIndexQueue  # noqa: F401
+from recipeyak.models.recipe_search_document import RecipeSearchDocument  # noqa: F401
+from recipeyak.models.recipe_stats import RecipeStats  # noqa: F401
 from recipeyak.models.recipe_view import RecipeView  # noqa: F401
 from recipeyak.models.schedule_event import ScheduleEvent  # noqa: F401
 from recipeyak.models.scheduled_recipe import ScheduledRecipe  # noqa: F401
 from recipeyak.models.scrape import Scrape  # noqa: F401
+from recipeyak.models.scrape_job import ScrapeJob  # noqa: F401
 from recipeyak.models.section import Section  # noqa: F401
 from recipeyak.models.section_historical import SectionHistorical  # noqa: F401
 from recipeyak.models.shopping_list import ShoppingList  # noqa: F401
@@ -19,6 +19,11 @@ class Calendar(CommonInfo):
 
     name = models.TextField(help_text="Name of calendar, e.g. 'Family Calendar'")
 
+    day_ingredients_built = models.BooleanField(
+        default=False,
+        help_text="Whether the calendar's `CalendarDayIngredient` rows have been built.",
+    )
+
     class Meta:
         db_table = "core_calendar"
         ordering = ["name"]  # noqa: RUF012
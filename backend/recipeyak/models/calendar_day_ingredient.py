@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+if TYPE_CHECKING:
+    from recipeyak.models.calendar import Calendar  # noqa: F401
+
+
+class CalendarDayIngredient(CommonInfo):
+    """
+    Sum of the ingredients scheduled on a given calendar day, keyed by the
+    parsed name & exact unit so adding & subtracting quantities is lossless.
+
+    Maintained by `recipeyak.calendar_day_ingredients`.
+    """
+
+    id = models.AutoField(primary_key=True)
+    calendar = models.ForeignKey["Calendar"]("Calendar", on_delete=models.CASCADE)
+    calendar_id: int
+    on = models.DateField()
+    name = models.TextField()
+    normalized_name = models.TextField()
+    unit = models.TextField()
+    # empty string instead of null so it can be part of the unique constraint
+    unknown_unit = models.TextField()
+    # stored as text and summed as `numeric` in postgres to keep it exact
+    quantity = models.TextField()
+    # number of scheduled ingredients in the sum, row is removed at zero
+    count = models.IntegerField()
+
+    objects = Manager["CalendarDayIngredient"]()
+
+    class Meta:
+        db_table = "calendar_day_ingredient"
+        constraints = [  # noqa: RUF012
+            models.UniqueConstraint(
+                fields=(
+                    "calendar",
+                    "on",
+                    "name",
+                    "normalized_name",
+                    "unit",
+                    "unknown_unit",
+                ),
+                name="calendar_day_ingredient_uniq",
+            )
+        ]
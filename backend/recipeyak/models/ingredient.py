@@ -2,6 +2,12 @@ from typing import TYPE_CHECKING
 
 from django.db import models
 
+from recipeyak.combine import Ingredient as CombineIngredient
+from recipeyak.combine import (
+    ParsedIngredient,
+    to_parsed_ingredient,
+    to_parsed_ingredient_from_fields,
+)
 from recipeyak.models.base import CommonInfo
 
 if TYPE_CHECKING:
@@ -31,6 +37,15 @@ class Ingredient(CommonInfo):
     position = models.TextField(db_column="position")
     optional = models.BooleanField(default=False)
 
+    # Derived from `quantity` & `name` via `set_parsed_fields` so generating a
+    # shopping list doesn't have to parse them. Null when they haven't been
+    # computed yet, see `jobs/backfill_parsed_ingredients.py`.
+    parsed_name = models.TextField(null=True)
+    parsed_unit = models.TextField(null=True)
+    # stored as text to round trip the `Decimal` exactly
+    parsed_quantity = models.TextField(null=True)
+    parsed_unknown_unit = models.TextField(null=True)
+
     class Meta:
         ordering = ["position"]  # noqa: RUF012
         db_table = "core_ingredient"
@@ -44,3 +59,29 @@ class Ingredient(CommonInfo):
     def __repr__(self) -> str:
         optional = "[optional]" if self.optional else ""
         return f"<quantity={self.quantity} {self.name} description={self.description} recipe={self.recipe} {optional}>"
+
+    def set_parsed_fields(self) -> None:
+        """
+        Update the parsed fields to match `quantity` & `name`, call before saving.
+        """
+        parsed = to_parsed_ingredient(
+            CombineIngredient(quantity=self.quantity, name=self.name)
+        )
+        self.parsed_name = parsed.name
+        self.parsed_unit = parsed.quantity.unit.value
+        self.parsed_quantity = str(parsed.quantity.quantity)
+        self.parsed_unknown_unit = parsed.quantity.unknown_unit
+
+    def to_parsed(self) -> ParsedIngredient:
+        """
+        Parsed form of the ingredient, using the stored parsed fields when
+        they've been computed.
+        """
+        return to_parsed_ingredient_from_fields(
+            quantity=self.quantity,
+            name=self.name,
+            parsed_name=self.parsed_name,
+            parsed_unit=self.parsed_unit,
+            parsed_quantity=self.parsed_quantity,
+            parsed_unknown_unit=self.parsed_unknown_unit,
+        )
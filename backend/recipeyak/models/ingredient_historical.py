@@ -25,5 +25,14 @@ class IngredientHistorical(CommonInfo):
     position = models.TextField()
     optional = models.BooleanField(default=False)
 
+    # Recorded when the ingredient is removed in a delta version.
+    deleted = models.BooleanField(default=False)
+
     class Meta:
         db_table = "ingredient_historical"
+        indexes = [  # noqa: RUF012
+            models.Index(
+                fields=["ingredient_id", "recipe_historical"],
+                name="ingredient_hist_item_idx",
+            )
+        ]
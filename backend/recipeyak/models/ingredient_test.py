@@ -140,3 +140,41 @@ def test_step_field_trimming(
     )
     assert res.status_code == 200
     assert res.json()["text"] == "some test here"
+
+
+def test_ingredient_parsed_fields(
+    client: Client, user: User, team: Team, recipe: Recipe
+) -> None:
+    """
+    The parsed fields used for shopping lists should track quantity & name.
+    """
+    client.force_login(user)
+
+    res = client.post(
+        f"/api/v1/recipes/{recipe.pk}/ingredients/",
+        {
+            "quantity": "2 Tablespoons",
+            "name": "Scallions",
+            "description": "chopped",
+            "position": "$",
+        },
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    ingredient = Ingredient.objects.get(id=res.json()["id"])
+    assert ingredient.parsed_name == "scallion"
+    assert ingredient.parsed_unit == "TABLESPOON"
+    assert ingredient.parsed_quantity == "2"
+    assert ingredient.parsed_unknown_unit is None
+
+    res = client.patch(
+        f"/api/v1/ingredients/{ingredient.id}/",
+        {"quantity": "1 bunch"},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    ingredient.refresh_from_db()
+    assert ingredient.parsed_name == "scallion"
+    assert ingredient.parsed_unit == "UNKNOWN"
+    assert ingredient.parsed_quantity == "1"
+    assert ingredient.parsed_unknown_unit == "bunch"
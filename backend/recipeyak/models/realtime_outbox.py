@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+
+class RealtimeOutbox(CommonInfo):
+    """
+    Ably messages waiting to be published by `jobs/realtime_outbox.py`.
+
+    Written in the same transaction as the change they describe, so clients
+    only hear about committed changes and a publish can't get lost between
+    the commit & the request finishing.
+    """
+
+    id = models.AutoField(primary_key=True)
+    channel = models.TextField()
+    name = models.TextField()
+    data = models.JSONField[Any]()
+    # failed publishes, we give up after `MAX_PUBLISH_ATTEMPTS`
+    attempts = models.IntegerField(default=0)
+
+    objects = Manager["RealtimeOutbox"]()
+
+    class Meta:
+        db_table = "realtime_outbox"
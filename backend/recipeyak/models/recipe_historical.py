@@ -39,6 +39,9 @@ class RecipeHistorical(CommonInfo):
     primary_image = models.ForeignKey["Upload"](
         "Upload", related_name="+", on_delete=models.PROTECT, null=True
     )
+    # Snapshots store every ingredient, section & step of the version, the
+    # versions after store only the items that changed, see `versioning.py`.
+    is_snapshot = models.BooleanField(default=True)
     objects = Manager["RecipeHistorical"]()
 
     class Meta:
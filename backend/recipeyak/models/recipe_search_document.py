@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+
+class RecipeSearchDocument(CommonInfo):
+    """
+    What `jobs/live_search_sync.py` last pushed to Algolia for a recipe, so it
+    can skip unchanged recipes and only send the attributes that changed.
+    """
+
+    id = models.AutoField(primary_key=True)
+    # We don't use a foreign key since the row outlives the recipe until the
+    # search sync removes it from the index.
+    recipe_id = models.IntegerField(unique=True)
+    # attribute name -> hash of its value
+    attribute_hashes = models.JSONField[dict[str, Any]]()
+
+    objects = Manager["RecipeSearchDocument"]()
+
+    class Meta:
+        db_table = "recipe_search_document"
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+
+class RecipeStats(CommonInfo):
+    """
+    Per-recipe stats for the search index & user profiles.
+
+    Kept current by triggers on `timeline_event`, `recipe_favorite` &
+    `core_scheduledrecipe`, see migration 0146. Changes are queued for
+    indexing.
+    """
+
+    id = models.AutoField(primary_key=True)
+    # We don't use a foreign key since the triggers write the row while the
+    # recipe's related rows are deleted.
+    recipe_id = models.IntegerField(unique=True)
+    created_by_id = models.IntegerField(null=True, db_index=True)
+    # Who archived the recipe, null if it isn't archived.
+    archived_by_id = models.IntegerField(null=True, db_index=True)
+    scheduled_count_all_time = models.IntegerField(default=0)
+    scheduled_by_ids = ArrayField(models.IntegerField(), null=True)
+    favorite_by_user_ids = ArrayField(models.IntegerField(), null=True)
+
+    objects = Manager["RecipeStats"]()
+
+    class Meta:
+        db_table = "recipe_stats"
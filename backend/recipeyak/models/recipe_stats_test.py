@@ -0,0 +1,132 @@
+import threading
+from datetime import UTC, date, datetime
+from typing import Any
+
+import pytest
+from django.db import connection
+from django.test.client import Client
+
+from recipeyak.models import (
+    RecipeFavorite,
+    RecipeIndexQueue,
+    RecipeStats,
+    Team,
+    TimelineEvent,
+    User,
+)
+from recipeyak.models.recipe import Recipe
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recipe_stats_kept_current(
+    client: Client, user: User, user2: User, team: Team, recipe: Recipe
+) -> None:
+    recipe.team = team
+    recipe.save()
+    client.force_login(user)
+
+    TimelineEvent.objects.create(action="created", created_by=user, recipe=recipe)
+    stats = RecipeStats.objects.get(recipe_id=recipe.id)
+    assert stats.created_by_id == user.id
+    assert stats.archived_by_id is None
+    assert stats.scheduled_count_all_time == 0
+    assert stats.scheduled_by_ids is None
+
+    res = client.post(
+        "/api/v1/calendar/",
+        {"recipe": recipe.id, "on": str(date(1976, 7, 6))},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    scheduled_recipe_id = res.json()["id"]
+    stats.refresh_from_db()
+    assert stats.scheduled_count_all_time == 1
+    assert stats.scheduled_by_ids == [user.id]
+
+    res = client.patch(
+        f"/api/v1/recipes/{recipe.id}/",
+        {"archived_at": datetime.now(UTC)},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    stats.refresh_from_db()
+    assert stats.archived_by_id == user.id
+
+    res = client.patch(
+        f"/api/v1/recipes/{recipe.id}/",
+        {"archived_at": None},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+    stats.refresh_from_db()
+    assert stats.archived_by_id is None
+
+    RecipeFavorite.objects.create(recipe=recipe, user=user2)
+    stats.refresh_from_db()
+    assert stats.favorite_by_user_ids == [user2.id]
+
+    res = client.delete(f"/api/v1/calendar/{scheduled_recipe_id}/")
+    assert res.status_code == 204
+    stats.refresh_from_db()
+    assert stats.scheduled_count_all_time == 0
+    assert stats.scheduled_by_ids is None
+
+    recipe.delete()
+    assert not RecipeStats.objects.filter(recipe_id=recipe.id).exists()
+
+
+def test_recipe_stats_changes_are_indexed(user: User, recipe: Recipe) -> None:
+    TimelineEvent.objects.create(action="created", created_by=user, recipe=recipe)
+    RecipeIndexQueue.objects.all().delete()
+
+    # not part of the stats
+    TimelineEvent.objects.create(
+        action="set_primary_image", created_by=user, recipe=recipe
+    )
+    assert not RecipeIndexQueue.objects.exists()
+
+    RecipeFavorite.objects.create(recipe=recipe, user=user)
+    assert list(RecipeIndexQueue.objects.values_list("recipe_id", flat=True)) == [
+        recipe.id
+    ]
+
+
+def _new_connection() -> Any:
+    return connection.get_new_connection(connection.get_connection_params())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recipe_stats_concurrent_writes(
+    user: User, user2: User, recipe: Recipe
+) -> None:
+    """
+    Concurrent favorites for the same recipe both end up in the stats.
+    """
+    insert_favorite = """
+insert into recipe_favorite (created, modified, recipe_id, user_id)
+values (now(), now(), %s, %s)
+"""
+    first, second = _new_connection(), _new_connection()
+    try:
+        with first.cursor() as cursor:
+            cursor.execute(insert_favorite, [recipe.id, user.id])
+
+        def favorite() -> None:
+            with second.cursor() as cursor:
+                cursor.execute(insert_favorite, [recipe.id, user2.id])
+            second.commit()
+
+        # waits on the first transaction
+        thread = threading.Thread(target=favorite)
+        thread.start()
+        thread.join(timeout=0.5)
+        assert thread.is_alive()
+        first.commit()
+        thread.join()
+    finally:
+        first.close()
+        second.close()
+
+    stats = RecipeStats.objects.get(recipe_id=recipe.id)
+    assert sorted(stats.favorite_by_user_ids or []) == sorted([user.id, user2.id])
@@ -3,8 +3,9 @@ from __future__ import annotations
 from datetime import date
 from typing import TYPE_CHECKING
 
-from django.db import models
+from django.db import models, transaction
 
+from recipeyak import calendar_day_ingredients
 from recipeyak.models.base import CommonInfo
 
 if TYPE_CHECKING:
@@ -21,9 +22,14 @@ class ScheduledRecipeManager(models.Manager["ScheduledRecipe"]):
         """
         add to existing scheduled recipe count for dupes
         """
-        return ScheduledRecipe.objects.create(
-            recipe=recipe, on=on, team=team, created_by=user, calendar=calendar
-        )
+        with transaction.atomic():
+            scheduled_recipe = ScheduledRecipe.objects.create(
+                recipe=recipe, on=on, team=team, created_by=user, calendar=calendar
+            )
+            calendar_day_ingredients.add_scheduled_recipe(
+                calendar_id=calendar.id, on=on, recipe_id=recipe.id
+            )
+        return scheduled_recipe
 
 
 class ScheduledRecipe(CommonInfo):
@@ -12,8 +12,16 @@ class Scrape(CommonInfo):
     url = models.TextField()
     duration_sec = models.IntegerField()
     parsed = models.JSONField[Any]()
+    # Used to find a previous scrape of the same recipe, see
+    # `scrape_recipe._get_cached_scrape`.
+    normalized_url = models.TextField(null=True)
+    canonical_url = models.TextField(null=True)
 
     objects = Manager["Scrape"]()
 
     class Meta:
         db_table = "scrape"
+        indexes = [  # noqa: RUF012
+            models.Index(fields=["normalized_url"], name="scrape_normalized_url_idx"),
+            models.Index(fields=["canonical_url"], name="scrape_canonical_url_idx"),
+        ]
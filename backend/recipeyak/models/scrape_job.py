@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+from django.db import models
+from django.db.models.manager import Manager
+
+from recipeyak.models.base import CommonInfo
+
+if TYPE_CHECKING:
+    from recipeyak.models.recipe import Recipe  # noqa: F401
+    from recipeyak.models.team import Team  # noqa: F401
+    from recipeyak.models.user import User  # noqa: F401
+
+ScrapeJobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class ScrapeJob(CommonInfo):
+    """
+    A recipe import queued by `scrape_job_create_view` & run by
+    `jobs/scrape_queue.py`, so slow sites don't tie up the web workers.
+    """
+
+    QUEUED: Literal["queued"] = "queued"
+    RUNNING: Literal["running"] = "running"
+    SUCCEEDED: Literal["succeeded"] = "succeeded"
+    FAILED: Literal["failed"] = "failed"
+
+    STATUS_CHOICES = (
+        (QUEUED, QUEUED),
+        (RUNNING, RUNNING),
+        (SUCCEEDED, SUCCEEDED),
+        (FAILED, FAILED),
+    )
+
+    id = models.AutoField(primary_key=True)
+    url = models.TextField()
+    team = models.ForeignKey["Team"]("Team", on_delete=models.CASCADE)
+    team_id: int
+    created_by = models.ForeignKey["User"]("User", on_delete=models.CASCADE)
+    created_by_id: int
+    status = models.CharField(max_length=9, choices=STATUS_CHOICES, default=QUEUED)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+    # times a worker has claimed the job, see `jobs/scrape_queue.py`
+    attempts = models.IntegerField(default=0)
+    recipe = models.ForeignKey["Recipe"]("Recipe", on_delete=models.SET_NULL, null=True)
+    recipe_id: int | None
+    error_code = models.TextField(null=True)
+    error_message = models.TextField(null=True)
+
+    objects = Manager["ScrapeJob"]()
+
+    class Meta:
+        db_table = "scrape_job"
+        indexes = [  # noqa: RUF012
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status="queued"),
+                name="scrape_job_queued_idx",
+            )
+        ]
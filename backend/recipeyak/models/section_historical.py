@@ -23,5 +23,14 @@ class SectionHistorical(CommonInfo):
     title = models.CharField(max_length=255)
     position = models.TextField()
 
+    # Recorded when the section is removed in a delta version.
+    deleted = models.BooleanField(default=False)
+
     class Meta:
         db_table = "section_historical"
+        indexes = [  # noqa: RUF012
+            models.Index(
+                fields=["section_id", "recipe_historical"],
+                name="section_hist_item_idx",
+            )
+        ]
@@ -1,5 +1,6 @@
 from typing import Any
 
+from django.db import models
 from django.db.models import JSONField
 from django.db.models.manager import Manager
 
@@ -11,11 +12,25 @@ class ShoppingList(CommonInfo):
     Store a shoppinglist anytime we generate one.
 
     Useful for looking back at bad combines and similar parsing issues.
+
+    Also serves as a cache, keyed on calendar, date range & version, so we
+    only generate (and store) a new one when the underlying data changes.
     """
 
     ingredients = JSONField[Any]()
+    recipes = JSONField[Any](null=True)
+    calendar_id = models.IntegerField(null=True)
+    start = models.DateField(null=True)
+    end = models.DateField(null=True)
+    version = models.TextField(null=True)
 
     objects = Manager["ShoppingList"]()
 
     class Meta:
         db_table = "core_shoppinglist"
+        indexes = [  # noqa: RUF012
+            models.Index(
+                fields=("calendar_id", "start", "end", "version"),
+                name="shoppinglist_cache_key_idx",
+            )
+        ]
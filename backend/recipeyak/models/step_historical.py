@@ -23,5 +23,14 @@ class StepHistorical(CommonInfo):
     text = models.TextField()
     position = models.TextField()
 
+    # Recorded when the step is removed in a delta version.
+    deleted = models.BooleanField(default=False)
+
     class Meta:
         db_table = "step_historical"
+        indexes = [  # noqa: RUF012
+            models.Index(
+                fields=["step_id", "recipe_historical"],
+                name="step_hist_item_idx",
+            )
+        ]
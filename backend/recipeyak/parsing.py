@@ -3,16 +3,20 @@ from __future__ import annotations
 import decimal
 import enum
 import itertools
+import re
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
-from functools import cache
+from fractions import Fraction
+from functools import cache, lru_cache
 
 from recipeyak.string import starts_with
 
 _MALFORMED_UNITS = {"large", "medium", "small", "fresh"}
 
-_quantity_chars = set(" /.0123456789")
+# leading quantity characters, e.g., `1 1/2 `, followed by the unit, e.g.,
+# `cups`, which runs until the next quantity character.
+_QUANTITY_UNIT_RE = re.compile(r"([ /.0-9]*)([^ /.0-9]*)")
 
 _UNICODE_FRACTION_MAPPING = {
     "½": "1/2",
@@ -36,21 +40,26 @@ _UNICODE_FRACTION_MAPPING = {
 }
 
 
+_UNICODE_FRACTION_RE = re.compile(f"[{''.join(_UNICODE_FRACTION_MAPPING)}]")
+
+
 def _unicode_fractions_to_ascii(s: str) -> str:
     """
     convert occurances of unicode fractions like `½` to their ascii
     equivalent `1/2`
     """
 
-    output = ""
-    for char in s:
-        expanded = _UNICODE_FRACTION_MAPPING.get(char, char)
+    def expand(match: re.Match[str]) -> str:
+        expanded = _UNICODE_FRACTION_MAPPING[match.group()]
+        start = match.start()
         # ensure 1¾ becomes 1 3/4, not 13/4
-        if output and output[-1].isdigit() and expanded != char:
-            output += " "
-        output += expanded
+        if start and (
+            s[start - 1].isdigit() or s[start - 1] in _UNICODE_FRACTION_MAPPING
+        ):
+            return " " + expanded
+        return expanded
 
-    return output
+    return _UNICODE_FRACTION_RE.sub(expand, s)
 
 
 def _max_quantity(quantity: str) -> str:
@@ -109,45 +118,53 @@ class Unit(str, Enum):
         raise UnhandledCaseError(case=self)
 
     def __lt__(self, other: Unit) -> bool:  # type: ignore[override]
-        if self in _VOLUME:
-            return _VOLUME[self] < _VOLUME[other]
-        if self in _MASS:
-            return _MASS[self] < _MASS[other]
+        if self in _VOLUME or self in _MASS:
+            return _UNIT_SIZE_RANK[self] < _UNIT_SIZE_RANK[other]
         return False
 
 
+# Checked in order, first match wins. None of the exact matches below contain
+# one of these substrings so they can be checked afterwards.
+_UNIT_SUBSTRINGS: tuple[tuple[str, Unit], ...] = (
+    ("cup", Unit.CUP),
+    ("gram", Unit.GRAM),
+    ("gallon", Unit.GALLON),
+    ("ounce", Unit.OUNCE),
+    ("milliliter", Unit.MILLILITER),
+    ("tsp", Unit.TEASPOON),
+    ("teaspoon", Unit.TEASPOON),
+    ("tbs", Unit.TABLESPOON),
+    ("tablespoon", Unit.TABLESPOON),
+    ("pinch", Unit.SOME),
+    ("lb", Unit.POUND),
+    ("pound", Unit.POUND),
+    ("quart", Unit.QUART),
+    ("liter", Unit.LITER),
+)
+
+_UNIT_EXACT: dict[str, Unit] = {
+    "kg": Unit.KILOGRAM,
+    "oz": Unit.OUNCE,
+    "some": Unit.SOME,
+    "sprinkle": Unit.SOME,
+    "dash": Unit.SOME,
+    "": Unit.NONE,
+}
+
+
+@lru_cache(maxsize=4096)
 def _get_unit(val: str) -> Unit:
     val_cased = val.strip()
-    val = val_cased.lower()
-    if "cup" in val:
-        return Unit.CUP
-    if val == "kg":
-        return Unit.KILOGRAM
-    if "gram" in val:
-        return Unit.GRAM
-    if "gallon" in val:
-        return Unit.GALLON
-    if "ounce" in val or val == "oz":
-        return Unit.OUNCE
-    if "milliliter" in val:
-        return Unit.MILLILITER
-    if val_cased == "t" or "tsp" in val or "teaspoon" in val:
+    # case sensitive
+    if val_cased == "t":
         return Unit.TEASPOON
-    if val_cased == "T" or "tbs" in val or "tablespoon" in val:
+    if val_cased == "T":
         return Unit.TABLESPOON
-    if "pinch" in val:
-        return Unit.SOME
-    if "lbs" in val or "lb" in val or "pound" in val:
-        return Unit.POUND
-    if "quart" in val:
-        return Unit.QUART
-    if "liter" in val:
-        return Unit.LITER
-    if val in {"some", "sprinkle", "dash"}:
-        return Unit.SOME
-    if val == "":
-        return Unit.NONE
-    return Unit.UNKNOWN
+    val = val_cased.lower()
+    for substring, unit in _UNIT_SUBSTRINGS:
+        if substring in val:
+            return unit
+    return _UNIT_EXACT.get(val, Unit.UNKNOWN)
 
 
 def _fraction_to_decimal(val: str) -> Decimal | None:
@@ -168,7 +185,7 @@ def _is_unit(val: str) -> bool:
     return _get_unit(val) != Unit.UNKNOWN
 
 
-@dataclass
+@dataclass(frozen=True)
 class Quantity:
     quantity: Decimal
     unit: Unit
@@ -193,11 +210,23 @@ class Quantity:
         if self.unit.base_unit() == other.unit.base_unit():
             if self.unit == Unit.UNKNOWN:
                 raise IncompatibleUnitError(units=(self.unit, other.unit))
-            unit_lookup = _VOLUME if self.unit in _VOLUME else _MASS
             smallest_unit = self.unit if self.unit < other.unit else other.unit
-            quantity = self.to_base_unit().quantity + other.to_base_unit().quantity
+            # Convert directly to the smaller unit using integer arithmetic
+            # on the exact ratios, rounding once at the end. e.g., 1
+            # tablespoon + 1 teaspoon is exactly 4 teaspoons.
+            self_num, self_den = self.quantity.as_integer_ratio()
+            other_num, other_den = other.quantity.as_integer_ratio()
+            self_factor_num, self_factor_den = _CONVERSIONS[self.unit, smallest_unit]
+            other_factor_num, other_factor_den = _CONVERSIONS[other.unit, smallest_unit]
+            self_den *= self_factor_den
+            other_den *= other_factor_den
+            numerator = (
+                self_num * self_factor_num * other_den
+                + other_num * other_factor_num * self_den
+            )
             return Quantity(
-                quantity=quantity / unit_lookup[smallest_unit], unit=smallest_unit
+                quantity=_ratio_to_decimal(numerator, self_den * other_den),
+                unit=smallest_unit,
             )
         raise IncompatibleUnitError(units=(self.unit, other.unit))
 
@@ -212,30 +241,33 @@ class Quantity:
     def to_base_unit(self) -> Quantity:
         if self.unit.base_unit() == BaseUnit.VOLUME:
             return Quantity(
-                unit=Unit.MILLILITER, quantity=_VOLUME[self.unit] * self.quantity
+                unit=Unit.MILLILITER,
+                quantity=_ratio_to_decimal(
+                    *(_VOLUME[self.unit] * Fraction(self.quantity)).as_integer_ratio()
+                ),
             )
         if self.unit.base_unit() == BaseUnit.MASS:
-            return Quantity(unit=Unit.GRAM, quantity=_MASS[self.unit] * self.quantity)
+            return Quantity(
+                unit=Unit.GRAM,
+                quantity=_ratio_to_decimal(
+                    *(_MASS[self.unit] * Fraction(self.quantity)).as_integer_ratio()
+                ),
+            )
         return self
 
 
-def _parse_quantity(val: str) -> Quantity:
-    value = iter(_unicode_fractions_to_ascii(_max_quantity(val).strip()))
+def _ratio_to_decimal(numerator: int, denominator: int) -> Decimal:
+    if denominator == 1:
+        return Decimal(numerator)
+    return Decimal(numerator) / Decimal(denominator)
 
-    quantity = ""
-    unit_str = ""
-    for c in value:
-        if c in _quantity_chars:
-            quantity += c
-        else:
-            unit_str += c
-            break
 
-    for c in value:
-        if c in _quantity_chars:
-            break
-        # handle case of two units and quantities next to each other
-        unit_str += c
+def _parse_quantity(val: str) -> Quantity:
+    value = _unicode_fractions_to_ascii(_max_quantity(val).strip())
+
+    match = _QUANTITY_UNIT_RE.match(value)
+    assert match is not None, "regex matches the empty string"
+    quantity, unit_str = match.groups()
 
     # strip out misplaced words, e.g., `1 large` `lemon` instead of `1` `large lemon`
     if unit_str in _MALFORMED_UNITS:
@@ -273,7 +305,9 @@ class BaseUnit(Enum):
     UNKNOWN = "UNKNOWN"
 
 
-_TEASPOON_ML = Decimal(4.92892)
+# Conversion factors are exact rationals so that conversions between units
+# that are multiples of each other, e.g., cups & tablespoons, stay exact.
+_TEASPOON_ML = Fraction("4.92892")
 _TABLESPOON_ML = 3 * _TEASPOON_ML
 _FLUID_OUNCE_ML = 2 * _TABLESPOON_ML
 _CUP_ML = 8 * _FLUID_OUNCE_ML
@@ -282,32 +316,52 @@ _QUART_ML = 2 * _PINT_ML
 _GALLON_ML = 4 * _QUART_ML
 
 
-_OUNCE_GRAM = Decimal(28.34952)
+_OUNCE_GRAM = Fraction("28.34952")
 
-_MASS: dict[Unit, Decimal] = {
-    Unit.GRAM: Decimal(1),
+_MASS: dict[Unit, Fraction] = {
+    Unit.GRAM: Fraction(1),
     Unit.OUNCE: _OUNCE_GRAM,
     Unit.POUND: 16 * _OUNCE_GRAM,
-    Unit.KILOGRAM: Decimal(1000),
+    Unit.KILOGRAM: Fraction(1000),
 }
 
 
-_VOLUME: dict[Unit, Decimal] = {
-    Unit.MILLILITER: Decimal(1),
+_VOLUME: dict[Unit, Fraction] = {
+    Unit.MILLILITER: Fraction(1),
     Unit.TEASPOON: _TEASPOON_ML,
     Unit.TABLESPOON: _TABLESPOON_ML,
     Unit.FLUID_OUNCE: _FLUID_OUNCE_ML,
     Unit.CUP: _CUP_ML,
     Unit.PINT: _PINT_ML,
     Unit.QUART: _QUART_ML,
-    Unit.LITER: Decimal(1000),
+    Unit.LITER: Fraction(1000),
     Unit.GALLON: _GALLON_ML,
 }
 
+# smallest to largest within each base unit, avoids comparing fractions when
+# ordering units
+_UNIT_SIZE_RANK: dict[Unit, int] = {
+    unit: rank
+    for lookup in (_VOLUME, _MASS)
+    for rank, unit in enumerate(sorted(lookup, key=lookup.__getitem__))
+}
+
+# (from unit, to unit) -> (numerator, denominator) of the multiplier
+_CONVERSIONS: dict[tuple[Unit, Unit], tuple[int, int]] = {
+    (from_unit, to_unit): (lookup[from_unit] / lookup[to_unit]).as_integer_ratio()
+    for lookup in (_VOLUME, _MASS)
+    for from_unit in lookup
+    for to_unit in lookup
+}
+
 
+@lru_cache(maxsize=4096)
 def parse_quantity(val: str) -> Quantity:
     """
     handle "3 Tablespoon + 1 teaspoon" format
+
+    Cached since ingredient quantities are very repetitive, e.g., `1 cup`.
+    `Quantity` is immutable so sharing results between callers is safe.
     """
     quantities = val.split("+")
     a = _parse_quantity(quantities[0])
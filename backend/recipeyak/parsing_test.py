@@ -12,6 +12,7 @@ from recipeyak.parsing import (
     _IngredientResult,
     _parse_name_description,
     _parse_quantity_name,
+    _unicode_fractions_to_ascii,
     parse_ingredient,
     parse_quantity,
 )
@@ -61,6 +62,24 @@ def test_parsing_quantities(quantity: str, expected: Quantity | None) -> None:
     assert parse_quantity(quantity) == expected
 
 
+def test_parse_quantity_is_cached() -> None:
+    assert parse_quantity("2 tablespoons") is parse_quantity("2 tablespoons")
+
+
+@pytest.mark.parametrize(
+    ("quantity", "expected"),
+    [
+        ("1½", "1 1/2"),
+        ("½½", "1/2 1/2"),
+        ("a½", "a1/2"),
+        ("¾ cup", "3/4 cup"),
+        ("1 cup", "1 cup"),
+    ],
+)
+def test_unicode_fractions_to_ascii(quantity: str, expected: str) -> None:
+    assert _unicode_fractions_to_ascii(quantity) == expected
+
+
 @pytest.mark.parametrize(
     ("fraction", "expected"),
     [("1/2", Decimal(0.5)), ("11/2", Decimal(5.5)), ("1 1/2", Decimal(1.5))],
@@ -169,6 +188,24 @@ def test_adding_incompatible_units() -> None:
         )
 
 
+@pytest.mark.parametrize(
+    ("a", "b", "expected"),
+    [
+        ("1 tablespoon", "2 teaspoons", "5 Unit.TEASPOON"),
+        ("1 cup", "3 tbs", "19 Unit.TABLESPOON"),
+        ("1/2 gallon", "1 quart", "3 Unit.QUART"),
+        ("8 oz", "1 lb", "24 Unit.OUNCE"),
+        ("1 kg", "250 gram", "1250 Unit.GRAM"),
+    ],
+)
+def test_adding_quantities_is_exact(a: str, b: str, expected: str) -> None:
+    """
+    Converting between units that are multiples of each other shouldn't leave
+    any rounding errors behind, e.g., 4.999999999999 teaspoons.
+    """
+    assert str(parse_quantity(a) + parse_quantity(b)) == expected
+
+
 @pytest.mark.parametrize(
     ("ingredient", "expected"),
     [
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+from django.db import transaction
+from django.test.client import Client
+
+from recipeyak.models import RealtimeOutbox, Recipe, Team, User
+from recipeyak.realtime import publish_recipe
+
+pytestmark = pytest.mark.django_db
+
+
+def test_publish_writes_to_outbox(
+    client: Client, user: User, team: Team, recipe: Recipe
+) -> None:
+    recipe.team = team
+    recipe.save()
+    ingredient = recipe.ingredient_set.all()[0]
+    client.force_login(user)
+
+    res = client.post(
+        f"/api/v1/cook-checklist/{recipe.id}/",
+        {"ingredient_id": ingredient.id, "checked": True},
+        content_type="application/json",
+    )
+    assert res.status_code == 200
+
+    message = RealtimeOutbox.objects.get()
+    assert message.channel == f"team:{team.id}:cook_checklist:{recipe.id}"
+    assert message.name == "checkmark_updated"
+    assert json.loads(message.data) == {"ingredientId": ingredient.id, "checked": True}
+
+
+def test_publish_is_transactional() -> None:
+    with transaction.atomic():
+        publish_recipe(recipe_id=1, team_id=1)
+        assert RealtimeOutbox.objects.count() == 1
+        transaction.set_rollback(True)
+
+    assert RealtimeOutbox.objects.count() == 0
@@ -0,0 +1,136 @@
+"""
+Buffer recipe views in memory & write them in batches, so fetching a recipe
+doesn't have to write to the database.
+
+Each gunicorn worker has a background thread that flushes its views every
+`FLUSH_INTERVAL_SEC` with a single upsert. Views can be lost if the worker is
+killed, which is fine for the "recently viewed" list.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+log = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SEC = 5
+# flush early if a lot of views come in
+MAX_PENDING = 1_000
+
+_lock = threading.Lock()
+# (recipe_id, user_id) -> the first view since the last flush
+_pending: dict[tuple[int, int], datetime] = {}
+_flush_requested = threading.Event()
+_flusher_pid: int | None = None
+
+
+def record_recipe_view(*, recipe_id: int, user_id: int) -> None:
+    with _lock:
+        _pending.setdefault((recipe_id, user_id), datetime.now(UTC))
+        pending_count = len(_pending)
+    if pending_count >= MAX_PENDING:
+        _flush_requested.set()
+    # Tests run inside a transaction the flusher's connection can't see, so
+    # they call `flush_recipe_views` directly.
+    if not settings.TESTING:
+        _ensure_flusher()
+
+
+def flush_recipe_views() -> None:
+    """
+    Write the pending views with the same semantics as recording each view as
+    it happened: the count only increases if the last visit was more than an
+    hour before.
+
+    We flush far more often than hourly, so only the first view of each
+    recipe & user since the last flush can matter.
+
+    If the write fails, the views are put back to be retried by the next
+    flush.
+    """
+    with _lock:
+        if not _pending:
+            return
+        views = sorted(_pending.items())
+        _pending.clear()
+    try:
+        _write_recipe_views(views)
+    except Exception:
+        with _lock:
+            for key, visited_at in views:
+                # keep the first view, which may be from before the failed
+                # flush
+                _pending[key] = min(visited_at, _pending.get(key, visited_at))
+        raise
+
+
+def _write_recipe_views(views: list[tuple[tuple[int, int], datetime]]) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+insert into recipe_view (recipe_id, user_id, last_visited_at, count, created, modified)
+select view.recipe_id, view.user_id, view.visited_at, 1, view.visited_at, view.visited_at
+from unnest(
+  %(recipe_ids)s::int[],
+  %(user_ids)s::int[],
+  %(visited_ats)s::timestamptz[]
+) as view(recipe_id, user_id, visited_at)
+-- the recipe or user could have been deleted since the view
+join core_recipe on core_recipe.id = view.recipe_id
+join core_myuser on core_myuser.id = view.user_id
+order by view.recipe_id, view.user_id
+on conflict
+on constraint one_user_view_row_per_recipe
+do update set
+  last_visited_at =
+    case when recipe_view.last_visited_at < excluded.last_visited_at - '1 hour'::interval then
+      excluded.last_visited_at
+    else
+      recipe_view.last_visited_at
+    end,
+  count =
+    case when recipe_view.last_visited_at < excluded.last_visited_at - '1 hour'::interval then
+      recipe_view.count + 1
+    else
+      recipe_view.count
+    end
+""",
+            {
+                "recipe_ids": [recipe_id for (recipe_id, _), _ in views],
+                "user_ids": [user_id for (_, user_id), _ in views],
+                "visited_ats": [visited_at for _, visited_at in views],
+            },
+        )
+
+
+def _flush_forever() -> None:
+    while True:
+        _flush_requested.wait(timeout=FLUSH_INTERVAL_SEC)
+        _flush_requested.clear()
+        close_old_connections()
+        try:
+            flush_recipe_views()
+        except Exception:
+            log.exception("failed to flush recipe views")
+
+
+def _ensure_flusher() -> None:
+    global _flusher_pid
+    # Threads don't survive a fork, so check the pid too.
+    if _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        threading.Thread(
+            target=_flush_forever, name="recipe-view-flusher", daemon=True
+        ).start()
+        _flusher_pid = os.getpid()
+    atexit.register(flush_recipe_views)
@@ -0,0 +1,70 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from django.db import DatabaseError
+
+from recipeyak import recipe_views
+from recipeyak.models import Recipe, RecipeView, User
+from recipeyak.recipe_views import flush_recipe_views, record_recipe_view
+
+pytestmark = pytest.mark.django_db
+
+
+def test_flush_recipe_views(user: User, user2: User, recipe: Recipe) -> None:
+    for _ in range(3):
+        record_recipe_view(recipe_id=recipe.id, user_id=user.id)
+    record_recipe_view(recipe_id=recipe.id, user_id=user2.id)
+    # deleted before the flush
+    record_recipe_view(recipe_id=recipe.id + 1_000, user_id=user.id)
+    flush_recipe_views()
+
+    assert sorted(
+        RecipeView.objects.filter(recipe=recipe).values_list("user_id", "count")
+    ) == sorted([(user.id, 1), (user2.id, 1)])
+
+    # views within the hour don't count
+    view = RecipeView.objects.get(recipe=recipe, user=user)
+    record_recipe_view(recipe_id=recipe.id, user_id=user.id)
+    flush_recipe_views()
+    view.refresh_from_db()
+    assert view.count == 1
+
+    # but after an hour they do
+    an_hour_ago = datetime.now(UTC) - timedelta(hours=1, minutes=1)
+    RecipeView.objects.filter(id=view.id).update(last_visited_at=an_hour_ago)
+    record_recipe_view(recipe_id=recipe.id, user_id=user.id)
+    flush_recipe_views()
+    view.refresh_from_db()
+    assert view.count == 2
+    assert view.last_visited_at > an_hour_ago
+
+
+def test_flush_recipe_views_empty() -> None:
+    flush_recipe_views()
+    assert not RecipeView.objects.exists()
+
+
+def test_flush_recipe_views_failure_retries(
+    user: User, user2: User, recipe: Recipe
+) -> None:
+    record_recipe_view(recipe_id=recipe.id, user_id=user.id)
+    first_view_at = recipe_views._pending[(recipe.id, user.id)]
+    with (
+        patch.object(recipe_views, "_write_recipe_views", side_effect=DatabaseError),
+        pytest.raises(DatabaseError),
+    ):
+        flush_recipe_views()
+    # newer views while the write was failing
+    record_recipe_view(recipe_id=recipe.id, user_id=user.id)
+    record_recipe_view(recipe_id=recipe.id, user_id=user2.id)
+    assert recipe_views._pending[(recipe.id, user.id)] == first_view_at
+
+    flush_recipe_views()
+    assert sorted(
+        RecipeView.objects.filter(recipe=recipe).values_list("user_id", "count")
+    ) == sorted([(user.id, 1), (user2.id, 1)])
+    assert (
+        RecipeView.objects.get(recipe=recipe, user=user).last_visited_at
+        == first_view_at
+    )
@@ -0,0 +1,59 @@
+# ruff: noqa: T201
+"""
+Parse time & peak memory of extracting a recipe from each page in
+`test_data`, run with:
+
+    python -m recipeyak.scraper.benchmark
+
+Peak memory is from `tracemalloc`, so it doesn't include lxml's trees, which
+are allocated in C.
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import typer
+
+from recipeyak.scraper.extract import parse_recipe
+
+TEST_DATA = Path(__file__).parent / "test_data"
+
+# the scraper `recipe_scrapers` uses depends on the url
+PAGE_URLS = {
+    "1023609-chile-crisp-fettuccine-alfredo-with-spinach.html": "https://cooking.nytimes.com/recipes/1023609-chile-crisp-fettuccine-alfredo-with-spinach",
+    "1025652-oven-smores.html": "https://cooking.nytimes.com/recipes/1025652-oven-smores",
+    "pressure-cooker-fast-and-easy-chicken-enchiladas-food-lab-recipe.html": "https://www.seriouseats.com/pressure-cooker-fast-and-easy-chicken-enchiladas-food-lab-recipe",
+}
+
+
+def main(runs: int = 10) -> None:
+    print(f"{'page':<70} {'size KiB':>9} {'median ms':>10} {'peak MiB':>9}")
+    for name, url in PAGE_URLS.items():
+        html = (TEST_DATA / name).read_bytes()
+        # warm up imports & caches so they aren't counted
+        parse_recipe(html=html, url=url)
+
+        durations = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            parse_recipe(html=html, url=url)
+            durations.append(time.perf_counter() - start)
+
+        # tracemalloc slows things down, so measure it separately
+        tracemalloc.start()
+        parse_recipe(html=html, url=url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{name[:70]:<70} {len(html) / 1024:>9.0f} "
+            f"{statistics.median(durations) * 1000:>10.1f} {peak / 1024 / 1024:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,5 +1,8 @@
 """
 IO-free recipe-scraping
+
+The html is parsed once, by `recipe_scrapers`, & everything else we extract
+reads from that tree.
 """
 
 from __future__ import annotations
@@ -10,9 +13,9 @@ import json
 from dataclasses import dataclass
 from typing import Any, cast
 
-import extruct
 from markdownify import markdownify
 from recipe_scrapers import AbstractScraper
+from recipe_scrapers import scrape_html as parse_html
 from recipe_scrapers._exceptions import SchemaOrgException
 
 from recipeyak.scraper.format_time import human_time_duration
@@ -38,11 +41,12 @@ class _IngredientGroup:
     ingredients: list[str]
 
 
-def _extract_open_graph_image(html: bytes | str) -> str | None:
-    og_data = extruct.extract(html, syntaxes=["opengraph"], uniform=True)["opengraph"]
-    if not og_data:
-        return None
-    return cast(str | None, og_data[0].get("og:image"))
+def _extract_open_graph_image(soup: Any) -> str | None:
+    # same as `extruct`, the first non-empty og:image
+    for meta in soup.find_all("meta", property="og:image", content=True):
+        if content := meta["content"].strip():
+            return cast(str, content)
+    return None
 
 
 def _extract_next_json(tag_text: str) -> dict[str, Any] | None:
@@ -55,10 +59,8 @@ def _extract_next_json(tag_text: str) -> dict[str, Any] | None:
             return None
 
 
-def _extract_tips(parsed: AbstractScraper) -> list[str]:
-    nextjs_data_tag = parsed.soup.find(
-        "script", type="application/json", id="__NEXT_DATA__"
-    )
+def _extract_tips(soup: Any) -> list[str]:
+    nextjs_data_tag = soup.find("script", type="application/json", id="__NEXT_DATA__")
     if nextjs_data_tag is None:
         return []
     # TODO: make more robust, this is really only intended for nyt cooking
@@ -132,8 +134,10 @@ def extract_recipe(parsed: AbstractScraper) -> _ExtractedRecipe:
     use, but this module should be io-free, which makes testing and structuring
     easier
     """
+    # parsed by `recipe_scrapers`, reuse it rather than parsing the html again
+    soup = parsed.soup
     total_time = _extract_total_time(parsed)
-    tips_html = _extract_tips(parsed)
+    tips_html = _extract_tips(soup)
     yields = _extract_yields(parsed)
     author = _extract_author(parsed)
     ingredient_groups = _extract_ingredient_groups(parsed)
@@ -148,7 +152,7 @@ def extract_recipe(parsed: AbstractScraper) -> _ExtractedRecipe:
     title = parsed.title()
 
     # possible image urls that we figure out the best one later on by actually fetching them
-    og_image_url = _extract_open_graph_image(parsed.page_data)
+    og_image_url = _extract_open_graph_image(soup)
     image_urls = [og_image_url, parsed.image()]
 
     return _ExtractedRecipe(
@@ -161,3 +165,11 @@ def extract_recipe(parsed: AbstractScraper) -> _ExtractedRecipe:
         instructions=instructions,
         image_urls=image_urls,
     )
+
+
+def parse_recipe(*, html: bytes, url: str) -> _ExtractedRecipe:
+    """
+    No IO parsing of the html, in its own function to make testing easier.
+    """
+    parsed = parse_html(html=html, org_url=url)  # type: ignore[arg-type]
+    return extract_recipe(parsed)
@@ -1,87 +1,156 @@
 import time
+from http.cookiejar import DefaultCookiePolicy
 from io import BytesIO
 
+import structlog
 from urllib3.util.retry import Retry
 from yarl import URL
 
-from recipeyak.scraper.safe_session import SafeSession
+from recipeyak.scraper.safe_session import (
+    SafeSession,
+    override_retries,
+    track_connections,
+)
+
+logger = structlog.stdlib.get_logger()
 
 MAX_RES_LENGTH = 40 * 1024 * 1024  # 40MB
 TIMEOUT = 5
+# Hosts to keep connections open to, & connections per host.
+POOL_HOSTS = 32
+POOL_MAXSIZE = 4
+# Probes are best effort & have a deadline, so a retry would only keep a
+# thread busy after the caller has given up.
+_PROBE_RETRIES = Retry(0, read=False)
+# Method Not Allowed & Not Implemented
+_HEAD_UNSUPPORTED_STATUSES = {405, 501}
 
 
-def fetch_bytes(*, url: str) -> tuple[bytes, str]:
-    start = time.monotonic()
-    with SafeSession(
+def _create_session() -> SafeSession:
+    session = SafeSession(
         max_retries=Retry(
             total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)
-        )
-    ) as http:
-        response = http.get(
+        ),
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=POOL_MAXSIZE,
+    )
+    # The session is shared by every scrape, so don't carry cookies between
+    # them.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+# Shared so scraping a page & its images reuses connections to the same host.
+_session = _create_session()
+
+
+def _headers(url: str) -> dict[str, str | None]:
+    return {
+        # naive attempt to look like a browser
+        "Host": URL(url).host,
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.5 Safari/605.1.15",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Connection": "keep-alive",
+    }
+
+
+def fetch_bytes(*, url: str) -> tuple[bytes, str]:
+    start = time.monotonic()
+    with track_connections() as connections:
+        response = _session.get(
             url,
             timeout=TIMEOUT,
             allow_redirects=True,
             stream=True,
-            headers={
-                # naive attempt to look like a browser
-                "Host": URL(url).host,
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.5 Safari/605.1.15",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Connection": "keep-alive",
-            },
+            headers=_headers(url),
         )
-    response.raise_for_status()
-
-    # via https://stackoverflow.com/a/22347526
-    # and https://github.com/getsentry/sentry/blob/66b93770e95290a3ab257311e4a2598304fb4e6f/src/sentry/http.py#L171
-    try:
-        content_len = int(response.headers["content-length"])
-    except (LookupError, ValueError):
-        content_len = 0
-    if content_len > MAX_RES_LENGTH:
-        raise OverflowError
-    buf = BytesIO()
-    size = 0
-    for chunk in response.iter_content(16 * 1024):
-        if time.monotonic() - start > TIMEOUT:
-            raise TimeoutError
-        buf.write(chunk)
-        size += len(chunk)
-        if size > MAX_RES_LENGTH:
+    first_byte_at = time.monotonic()
+    # the body must be read or the response closed to release the connection
+    # back to the pool
+    with response:
+        response.raise_for_status()
+
+        # via https://stackoverflow.com/a/22347526
+        # and https://github.com/getsentry/sentry/blob/66b93770e95290a3ab257311e4a2598304fb4e6f/src/sentry/http.py#L171
+        try:
+            content_len = int(response.headers["content-length"])
+        except (LookupError, ValueError):
+            content_len = 0
+        if content_len > MAX_RES_LENGTH:
             raise OverflowError
+        buf = BytesIO()
+        size = 0
+        for chunk in response.iter_content(16 * 1024):
+            if time.monotonic() - start > TIMEOUT:
+                raise TimeoutError
+            buf.write(chunk)
+            size += len(chunk)
+            if size > MAX_RES_LENGTH:
+                raise OverflowError
+    logger.info(
+        "fetched bytes",
+        url=url,
+        size=size,
+        new_connections=connections.new_connections,
+        connect_sec=connections.connect_sec,
+        tls_sec=connections.tls_sec,
+        first_byte_sec=first_byte_at
+        - start
+        - connections.connect_sec
+        - connections.tls_sec,
+        body_sec=time.monotonic() - first_byte_at,
+    )
     return buf.getvalue(), response.headers["content-type"]
 
 
-def fetch_content_length(*, url: str) -> int | None:
+def fetch_content_length(*, url: str, timeout: float = TIMEOUT) -> int | None:
     """
     grab the content-length of the response without downloading the entire file
+
+    Uses a HEAD request so the connection goes back to the pool, falling back
+    to a GET for servers that don't support HEAD or don't send a length.
     """
-    with SafeSession(
-        max_retries=Retry(
-            total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)
-        )
-    ) as http:
-        response = http.get(
+    start = time.monotonic()
+    with track_connections() as connections, override_retries(_PROBE_RETRIES):
+        response = _session.head(
             url,
-            timeout=TIMEOUT,
+            timeout=timeout,
             allow_redirects=True,
-            stream=True,
-            headers={
-                # naive attempt to look like a browser
-                "Host": URL(url).host,
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.5 Safari/605.1.15",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Connection": "keep-alive",
-            },
+            headers=_headers(url),
         )
-    response.raise_for_status()
+        if response.status_code in _HEAD_UNSUPPORTED_STATUSES or (
+            response.ok and "content-length" not in response.headers
+        ):
+            response = _session.get(
+                url,
+                timeout=timeout,
+                allow_redirects=True,
+                stream=True,
+                headers=_headers(url),
+            )
+    # Closing a GET without reading the body means the connection can't be
+    # reused, but that's cheaper than downloading the image.
+    with response:
+        logger.info(
+            "fetched content-length",
+            url=url,
+            method=response.request.method,
+            new_connections=connections.new_connections,
+            connect_sec=connections.connect_sec,
+            tls_sec=connections.tls_sec,
+            first_byte_sec=time.monotonic()
+            - start
+            - connections.connect_sec
+            - connections.tls_sec,
+        )
+        response.raise_for_status()
 
-    # via https://stackoverflow.com/a/22347526
-    # and https://github.com/getsentry/sentry/blob/66b93770e95290a3ab257311e4a2598304fb4e6f/src/sentry/http.py#L171
-    try:
-        size = int(response.headers["content-length"])
-        if size > MAX_RES_LENGTH:
-            raise OverflowError
-        return size
-    except (LookupError, ValueError):
-        return None
+        # via https://stackoverflow.com/a/22347526
+        # and https://github.com/getsentry/sentry/blob/66b93770e95290a3ab257311e4a2598304fb4e6f/src/sentry/http.py#L171
+        try:
+            size = int(response.headers["content-length"])
+            if size > MAX_RES_LENGTH:
+                raise OverflowError
+            return size
+        except (LookupError, ValueError):
+            return None
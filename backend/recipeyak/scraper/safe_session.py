@@ -1,16 +1,159 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Any
 
 from advocate.adapters import ValidatingHTTPAdapter
+from advocate.addrvalidator import AddrValidator
+from advocate.connection import ValidatingHTTPConnection, ValidatingHTTPSConnection
+from advocate.connectionpool import (
+    ValidatingHTTPConnectionPool,
+    ValidatingHTTPSConnectionPool,
+)
 from advocate.exceptions import MountDisabledException
+from advocate.poolmanager import ValidatingPoolManager
 from requests import Session as RequestsSession
+from requests.adapters import DEFAULT_POOLBLOCK
 from urllib3.util.retry import Retry
 
 
+@dataclass(slots=True)
+class ConnectionTimings:
+    """
+    Time spent opening connections while tracking, see `track_connections`.
+    """
+
+    new_connections: int = 0
+    # advocate resolves & validates the address as part of connecting, so DNS
+    # is included here.
+    connect_sec: float = 0.0
+    tls_sec: float = 0.0
+
+
+_connection_timings: ContextVar[ConnectionTimings | None] = ContextVar(
+    "connection_timings", default=None
+)
+
+
+@contextmanager
+def track_connections() -> Iterator[ConnectionTimings]:
+    """
+    Record the connections opened by the current thread. Requests that reuse
+    a pooled connection won't open any.
+    """
+    timings = ConnectionTimings()
+    token = _connection_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _connection_timings.reset(token)
+
+
+_max_retries: ContextVar[Retry | None] = ContextVar("max_retries", default=None)
+
+
+@contextmanager
+def override_retries(max_retries: Retry) -> Iterator[None]:
+    """
+    Use `max_retries` instead of the session's for requests made by the
+    current thread, without needing a separate connection pool.
+    """
+    token = _max_retries.set(max_retries)
+    try:
+        yield
+    finally:
+        _max_retries.reset(token)
+
+
+def _timed_new_conn(new_conn: Any) -> Any:
+    start = time.monotonic()
+    sock = new_conn()
+    timings = _connection_timings.get()
+    if timings is not None:
+        timings.new_connections += 1
+        timings.connect_sec += time.monotonic() - start
+    return sock
+
+
+class _TimedHTTPConnection(ValidatingHTTPConnection):
+    def _new_conn(self) -> Any:
+        return _timed_new_conn(super()._new_conn)
+
+
+class _TimedHTTPSConnection(ValidatingHTTPSConnection):
+    def _new_conn(self) -> Any:
+        return _timed_new_conn(super()._new_conn)
+
+    def connect(self) -> None:
+        # `connect()` calls `_new_conn()` then does the TLS handshake.
+        timings = _connection_timings.get()
+        connect_sec = timings.connect_sec if timings is not None else 0.0
+        start = time.monotonic()
+        super().connect()
+        if timings is not None:
+            timings.tls_sec += (
+                time.monotonic() - start - (timings.connect_sec - connect_sec)
+            )
+
+
+class _TimedHTTPConnectionPool(ValidatingHTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(ValidatingHTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedPoolManager(ValidatingPoolManager):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class _TimedHTTPAdapter(ValidatingHTTPAdapter):
+    @property
+    def max_retries(self) -> Retry:
+        max_retries = _max_retries.get()
+        if max_retries is not None:
+            return max_retries
+        return self._max_retries
+
+    @max_retries.setter
+    def max_retries(self, value: Retry) -> None:
+        self._max_retries = value
+
+    def init_poolmanager(
+        self,
+        connections: int,
+        maxsize: int,
+        block: bool = DEFAULT_POOLBLOCK,
+        **pool_kwargs: Any,
+    ) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _TimedPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            validator=self._validator,
+            **pool_kwargs,
+        )
+
+
 class SafeSession(RequestsSession):
     """
     Convenience wrapper around `requests.Session` set up for `advocate`ing
+
+    Connections are pooled per host & validated by `advocate` when opened, so
+    a session can be shared across requests & threads.
     """
 
     # taken from: https://github.com/JordanMilne/Advocate/blob/5f2ccc62c2d811bdf25ae8cf9e8b72b5490aa842/advocate/api.py#L42-L46
@@ -18,15 +161,30 @@ class SafeSession(RequestsSession):
 
     # avoids us having to run something like Squid or https://github.com/stripe/smokescreen
 
-    def __init__(self, max_retries: Retry | None = None) -> None:
+    def __init__(
+        self,
+        max_retries: Retry | None = None,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        validator: AddrValidator | None = None,
+    ) -> None:
         # `Session.__init__()` calls `mount()` internally, so we need to allow
         # it temporarily
         self.__mount_allowed = True
         RequestsSession.__init__(self)
         # Drop any existing adapters
         self.adapters = {}
-        self.mount("http://", ValidatingHTTPAdapter(max_retries=max_retries))
-        self.mount("https://", ValidatingHTTPAdapter(max_retries=max_retries))
+        for prefix in ("http://", "https://"):
+            self.mount(
+                prefix,
+                _TimedHTTPAdapter(
+                    max_retries=max_retries,
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    validator=validator,
+                ),
+            )
         self.__mount_allowed = False
 
     def mount(self, *args: Any, **kwargs: Any) -> None:
@@ -7,25 +7,48 @@ rel: https://forum.sentry.io/t/source-code-scrapping/4167/7
 
 from __future__ import annotations
 
+import threading
 import time
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import asdict, dataclass
+from datetime import timedelta
 from pathlib import Path
 from urllib.parse import urlparse
 from uuid import uuid4
 
+import advocate
+import requests
+import structlog
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
-from recipe_scrapers import scrape_html as parse_html
+from django.db.models import Q
+from django.utils import timezone
+from yarl import URL
 
 from recipeyak import config
 from recipeyak.models import Scrape
 from recipeyak.models.upload import Upload
 from recipeyak.models.user import User
-from recipeyak.scraper.extract import _ExtractedRecipe, extract_recipe
+from recipeyak.scraper.extract import parse_recipe
 from recipeyak.scraper.fetch import fetch_bytes, fetch_content_length
 from recipeyak.storage import s3
 
+logger = structlog.stdlib.get_logger()
+
+# Overall time budget for checking the sizes of the candidate images.
+IMAGE_PROBE_DEADLINE_SEC = 5
+MAX_CONCURRENT_IMAGE_PROBES = 4
+CONTENT_LENGTH_CACHE_TTL_SEC = 60 * 60
+CONTENT_LENGTH_CACHE_MAX_SIZE = 1_024
+
+_content_length_cache_lock = threading.Lock()
+# url -> (time fetched, content-length)
+_content_length_cache: dict[str, tuple[float, int | None]] = {}
+
+# Query params that don't change the page, usually added when sharing a link.
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid"}
+
 
 @dataclass
 class IngredientGroup:
@@ -63,17 +86,177 @@ def _parse_url(url: str | None) -> None | str:
         return None
 
 
+def _normalize_url(url: str) -> str:
+    """
+    Drop the parts of the url that don't change the page, so different links
+    to the same recipe find the same scrape.
+    """
+    parsed = URL(url)
+    query = sorted(
+        (key, value)
+        for key, value in parsed.query.items()
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return str(
+        URL.build(
+            scheme="https",
+            host=(parsed.host or "").lower().removeprefix("www."),
+            port=None if parsed.is_default_port() else parsed.port,
+            path=parsed.path.rstrip("/"),
+            query=query,
+        )
+    )
+
+
+def _copy_upload(*, upload_id: int, user: User) -> int | None:
+    """
+    Uploads belong to a single recipe, so create a new one pointing at the
+    same S3 object. We don't delete scraped images from S3.
+    """
+    upload = Upload.objects.filter(id=upload_id, completed=True).first()
+    if upload is None:
+        return None
+    return Upload.objects.create(
+        scraped_by=user,
+        bucket=upload.bucket,
+        key=upload.key,
+        content_type=upload.content_type,
+        background_url=upload.background_url,
+        completed=True,
+    ).id
+
+
+def _get_cached_scrape(*, normalized_url: str, user: User) -> ScrapeResult | None:
+    """
+    Find a recent scrape of the url, either fetched from it or with it as the
+    canonical url, so we can skip fetching the page & image again.
+    """
+    if config.SCRAPE_CACHE_TTL_SEC <= 0:
+        return None
+    scrape = (
+        Scrape.objects.filter(
+            Q(normalized_url=normalized_url) | Q(canonical_url=normalized_url),
+            created__gte=timezone.now()
+            - timedelta(seconds=config.SCRAPE_CACHE_TTL_SEC),
+        )
+        .only("id", "parsed")
+        .order_by("-id")
+        .first()
+    )
+    if scrape is None:
+        return None
+    parsed = scrape.parsed
+    try:
+        scrape_result = ScrapeResult(
+            title=parsed["title"],
+            total_time=parsed["total_time"],
+            yields=parsed["yields"],
+            image=parsed["image"],
+            upload_id=parsed["upload_id"],
+            instructions=parsed["instructions"],
+            ingredient_groups=[
+                IngredientGroup(name=group["name"], ingredients=group["ingredients"])
+                for group in parsed["ingredient_groups"]
+            ],
+            author=parsed["author"],
+            canonical_url=parsed["canonical_url"],
+            id=scrape.id,
+        )
+    except (KeyError, TypeError):
+        # scraped before `ScrapeResult` had its current shape
+        return None
+    if scrape_result.upload_id is not None:
+        scrape_result.upload_id = _copy_upload(
+            upload_id=scrape_result.upload_id, user=user
+        )
+        if scrape_result.upload_id is None:
+            return None
+    return scrape_result
+
+
+def _get_cached_content_length(url: str) -> tuple[bool, int | None]:
+    with _content_length_cache_lock:
+        cached = _content_length_cache.get(url)
+    if cached is None:
+        return False, None
+    fetched_at, content_length = cached
+    if time.monotonic() - fetched_at > CONTENT_LENGTH_CACHE_TTL_SEC:
+        return False, None
+    return True, content_length
+
+
+def _set_cached_content_length(url: str, content_length: int | None) -> None:
+    with _content_length_cache_lock:
+        if len(_content_length_cache) >= CONTENT_LENGTH_CACHE_MAX_SIZE:
+            # dicts are insertion ordered, so this evicts the oldest entry
+            del _content_length_cache[next(iter(_content_length_cache))]
+        _content_length_cache[url] = (time.monotonic(), content_length)
+
+
+def _get_content_lengths(urls: Sequence[str]) -> dict[str, int | None]:
+    """
+    fetch the content-length for the urls concurrently, skipping any that
+    fail or don't finish within `IMAGE_PROBE_DEADLINE_SEC`
+    """
+    content_lengths: dict[str, int | None] = {}
+    uncached_urls: list[str] = []
+    for url in urls:
+        is_cached, content_length = _get_cached_content_length(url)
+        if is_cached:
+            content_lengths[url] = content_length
+        else:
+            uncached_urls.append(url)
+    if not uncached_urls:
+        return content_lengths
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(MAX_CONCURRENT_IMAGE_PROBES, len(uncached_urls)),
+        thread_name_prefix="image-probe",
+    )
+    futures = {
+        executor.submit(
+            fetch_content_length, url=url, timeout=IMAGE_PROBE_DEADLINE_SEC
+        ): url
+        for url in uncached_urls
+    }
+    done, not_done = wait(futures, timeout=IMAGE_PROBE_DEADLINE_SEC)
+    # Don't wait on the stragglers. Probes aren't retried, so they finish
+    # within their connect & read timeouts.
+    executor.shutdown(wait=False, cancel_futures=True)
+    for future in done:
+        url = futures[future]
+        try:
+            content_length = future.result()
+        except (
+            requests.RequestException,
+            advocate.exceptions.UnacceptableAddressException,
+            OverflowError,
+        ):
+            logger.warning("failed to fetch content-length", url=url, exc_info=True)
+            continue
+        _set_cached_content_length(url, content_length)
+        content_lengths[url] = content_length
+    if not_done:
+        logger.warning(
+            "image probes exceeded deadline",
+            urls=[futures[future] for future in not_done],
+        )
+    return content_lengths
+
+
 def _get_largest_image(urls: Sequence[str | None]) -> str | None:
     """
     fetch the content-length for all the urls and pick the largest one
     """
+    # og:image & the schema image are usually the same
+    candidates = list(
+        dict.fromkeys(url for url in map(_parse_url, urls) if url is not None)
+    )
+    content_lengths = _get_content_lengths(candidates)
     max_size: int | None = None
     max_url: str | None = None
-    for url in urls:
-        url = _parse_url(url)
-        if url is None:
-            continue
-        content_length = fetch_content_length(url=url)
+    for url in candidates:
+        content_length = content_lengths.get(url)
         if content_length is None:
             continue
         if max_size is None or content_length > max_size:
@@ -120,14 +303,6 @@ def _find_and_save_largest_image(
     )
 
 
-def _parse_recipe(*, html: bytes, url: str) -> _ExtractedRecipe:
-    """
-    No IO parsing of the html, in its own function to make testing easier.
-    """
-    parsed = parse_html(html=html, org_url=url)  # type: ignore[arg-type]
-    return extract_recipe(parsed)
-
-
 def scrape_recipe(*, url: str, user: User) -> ScrapeResult:
     """
     fetch a recipe and avoid:
@@ -140,9 +315,15 @@ def scrape_recipe(*, url: str, user: User) -> ScrapeResult:
     start = time.monotonic()
 
     _validate_url(url)
+    normalized_url = _normalize_url(url)
+    cached_scrape = _get_cached_scrape(normalized_url=normalized_url, user=user)
+    if cached_scrape is not None:
+        logger.info("using cached scrape", url=url, scrape_id=cached_scrape.id)
+        return cached_scrape
+
     html, _ = fetch_bytes(url=url)
 
-    recipe = _parse_recipe(html=html, url=url)
+    recipe = parse_recipe(html=html, url=url)
 
     image = _find_and_save_largest_image(image_urls=recipe.image_urls, user=user)
 
@@ -168,6 +349,12 @@ def scrape_recipe(*, url: str, user: User) -> ScrapeResult:
         url=url,
         duration_sec=duration_sec,
         parsed=scrape_dict,
+        normalized_url=normalized_url,
+        canonical_url=(
+            _normalize_url(canonical_url)
+            if (canonical_url := _parse_url(recipe.canonical_url)) is not None
+            else None
+        ),
     )
     scrape_result.id = scrape.id
 
@@ -1,8 +1,25 @@
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ipaddress import ip_network
 from pathlib import Path
+from typing import Any
 
+import pytest
+from advocate.addrvalidator import AddrValidator
+from django.utils import timezone
+from structlog.testing import capture_logs
 from syrupy.assertion import SnapshotAssertion
 
-from recipeyak.scraper.scrape_recipe import _parse_recipe
+from recipeyak import config
+from recipeyak.models import Scrape, Upload, User
+from recipeyak.scraper import fetch, scrape_recipe
+from recipeyak.scraper.extract import parse_recipe
+from recipeyak.scraper.safe_session import SafeSession
+from recipeyak.scraper.scrape_recipe import _get_largest_image, _normalize_url
 
 
 def test_parse_recipe_tips_html_to_markdown(
@@ -19,7 +36,7 @@ def test_parse_recipe_tips_html_to_markdown(
         / "1023609-chile-crisp-fettuccine-alfredo-with-spinach.html"
     ).read_bytes()
 
-    result = _parse_recipe(
+    result = parse_recipe(
         html=html,
         url="https://cooking.nytimes.com/recipes/1023609-chile-crisp-fettuccine-alfredo-with-spinach",
     )
@@ -38,7 +55,7 @@ def test_parse_recipe_tips_html_to_markdown_plain_text(
         Path(__file__).parent / "test_data" / "1025652-oven-smores.html"
     ).read_bytes()
 
-    result = _parse_recipe(
+    result = parse_recipe(
         html=html,
         url="https://cooking.nytimes.com/recipes/1025652-oven-smores",
     )
@@ -55,8 +72,224 @@ def test_parse_links_in_steps(snapshot: SnapshotAssertion) -> None:
         / "pressure-cooker-fast-and-easy-chicken-enchiladas-food-lab-recipe.html"
     ).read_bytes()
 
-    result = _parse_recipe(
+    result = parse_recipe(
         html=html,
         url="https://www.seriouseats.com/pressure-cooker-fast-and-easy-chicken-enchiladas-food-lab-recipe",
     )
     assert result == snapshot()
+
+
+_IMAGE_SIZES = {
+    "/small.jpg": 10,
+    "/large.jpg": 1_000,
+    "/slow.jpg": 1_000_000,
+    "/no-head.jpg": 100,
+}
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    # keep-alive
+    protocol_version = "HTTP/1.1"
+    requests: Counter[str]
+
+    def do_GET(self) -> None:
+        self._respond(body=True)
+
+    def do_HEAD(self) -> None:
+        if self.path == "/no-head.jpg":
+            self.send_error(405)
+            return
+        self._respond(body=False)
+
+    def _respond(self, *, body: bool) -> None:
+        self.requests[f"{self.command} {self.path}"] += 1
+        if self.path == "/slow.jpg":
+            time.sleep(2)
+        size = _IMAGE_SIZES.get(self.path)
+        if size is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        if body:
+            self.wfile.write(b"\0" * size)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def image_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[tuple[str, Counter[str]]]:
+    monkeypatch.setattr(scrape_recipe, "_content_length_cache", {})
+    monkeypatch.setattr(scrape_recipe, "IMAGE_PROBE_DEADLINE_SEC", 0.5)
+    requests_by_path = Counter[str]()
+    handler = type("Handler", (_ImageHandler,), {"requests": requests_by_path})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    # advocate rejects localhost by default
+    monkeypatch.setattr(
+        fetch,
+        "_session",
+        SafeSession(
+            validator=AddrValidator(
+                ip_whitelist={ip_network("127.0.0.1/32")},
+                port_whitelist={server.server_port},
+            )
+        ),
+    )
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", requests_by_path
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_largest_image(image_server: tuple[str, Counter[str]]) -> None:
+    """
+    Probe the candidates concurrently, once per url, skipping those that fail
+    or miss the deadline.
+    """
+    base_url, requests_by_path = image_server
+    urls = [
+        f"{base_url}/small.jpg",
+        None,
+        "not a url",
+        f"{base_url}/slow.jpg",
+        f"{base_url}/missing.jpg",
+        f"{base_url}/large.jpg",
+        f"{base_url}/large.jpg",
+    ]
+
+    start = time.monotonic()
+    assert _get_largest_image(urls) == f"{base_url}/large.jpg"
+    assert time.monotonic() - start < 1.5, "shouldn't wait on the slow image"
+    time.sleep(1.5)
+    assert requests_by_path["HEAD /slow.jpg"] == 1, "probes aren't retried"
+    assert requests_by_path["HEAD /large.jpg"] == 1
+    assert requests_by_path["HEAD /small.jpg"] == 1
+
+    # sizes are cached
+    start = time.monotonic()
+    assert (
+        _get_largest_image([f"{base_url}/small.jpg", f"{base_url}/large.jpg"])
+        == f"{base_url}/large.jpg"
+    )
+    assert time.monotonic() - start < 0.1
+    assert requests_by_path["HEAD /large.jpg"] == 1
+    assert requests_by_path["HEAD /small.jpg"] == 1
+
+
+def test_fetch_reuses_connections(image_server: tuple[str, Counter[str]]) -> None:
+    base_url, _ = image_server
+
+    with capture_logs() as logs:
+        content, content_type = fetch.fetch_bytes(url=f"{base_url}/large.jpg")
+        assert len(content) == 1_000
+        assert content_type == "image/jpeg"
+        fetch.fetch_bytes(url=f"{base_url}/small.jpg")
+
+    first, second = logs
+    assert first["new_connections"] == 1
+    assert first["connect_sec"] > 0
+    assert second["new_connections"] == 0, "should reuse the connection"
+    assert second["connect_sec"] == 0
+
+
+def test_normalize_url() -> None:
+    assert (
+        _normalize_url(
+            "http://WWW.Example.com/recipes/Soup/?utm_source=share&b=2&fbclid=abc&a=1#comments"
+        )
+        == "https://example.com/recipes/Soup?a=1&b=2"
+    )
+    assert (
+        _normalize_url("https://example.com/recipes/soup")
+        == _normalize_url("https://www.example.com/recipes/soup/")
+        == "https://example.com/recipes/soup"
+    )
+
+
+@pytest.mark.django_db()
+def test_scrape_recipe_uses_cached_scrape(
+    user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    A previous scrape of the url or with the url as its canonical url is
+    reused without fetching anything.
+    """
+
+    def fetch_bytes(*, url: str) -> tuple[bytes, str]:
+        raise AssertionError("shouldn't fetch")
+
+    monkeypatch.setattr(scrape_recipe, "fetch_bytes", fetch_bytes)
+    upload = Upload.objects.create(
+        scraped_by=user,
+        bucket="bucket",
+        key="scraper/abc.jpg",
+        content_type="image/jpeg",
+        completed=True,
+    )
+    scrape = Scrape.objects.create(
+        html="<html></html>",
+        url="https://example.com/recipes/soup?utm_source=share",
+        normalized_url="https://example.com/recipes/soup",
+        canonical_url="https://example.com/recipes/tomato-soup",
+        duration_sec=1,
+        parsed={
+            "title": "Tomato Soup",
+            "total_time": "1 hour",
+            "yields": "4 servings",
+            "image": "https://example.com/soup.jpg",
+            "upload_id": upload.id,
+            "instructions": ["simmer"],
+            "ingredient_groups": [{"name": None, "ingredients": ["1 tomato"]}],
+            "author": "J. Doe",
+            "canonical_url": "https://example.com/recipes/tomato-soup",
+        },
+    )
+
+    for url in [
+        "www.example.com/recipes/soup/",
+        "https://example.com/recipes/tomato-soup?utm_medium=email",
+    ]:
+        result = scrape_recipe.scrape_recipe(url=url, user=user)
+        assert result.id == scrape.id
+        assert result.title == "Tomato Soup"
+        assert result.ingredient_groups == [
+            scrape_recipe.IngredientGroup(name=None, ingredients=["1 tomato"])
+        ]
+        # recipes don't share uploads
+        assert result.upload_id is not None
+        assert result.upload_id != upload.id
+        new_upload = Upload.objects.get(id=result.upload_id)
+        assert new_upload.key == upload.key
+        assert new_upload.completed
+
+    assert Scrape.objects.count() == 1
+
+    # expired
+    scrape.created = timezone.now() - timedelta(seconds=config.SCRAPE_CACHE_TTL_SEC + 1)
+    scrape.save()
+    with pytest.raises(AssertionError, match="shouldn't fetch"):
+        scrape_recipe.scrape_recipe(url="https://example.com/recipes/soup", user=user)
+
+
+def test_fetch_content_length(image_server: tuple[str, Counter[str]]) -> None:
+    """
+    Probe with HEAD so the connection can be reused, falling back to GET.
+    """
+    base_url, requests_by_path = image_server
+
+    with capture_logs() as logs:
+        assert fetch.fetch_content_length(url=f"{base_url}/large.jpg") == 1_000
+        assert fetch.fetch_content_length(url=f"{base_url}/small.jpg") == 10
+        fetch.fetch_bytes(url=f"{base_url}/large.jpg")
+        assert fetch.fetch_content_length(url=f"{base_url}/no-head.jpg") == 100
+
+    assert [log["method"] for log in logs if "method" in log] == ["HEAD", "HEAD", "GET"]
+    # the probes & the download share a connection
+    assert [log["new_connections"] for log in logs[:3]] == [1, 0, 0]
+    assert requests_by_path["GET /large.jpg"] == 1, "only the download"
+    assert requests_by_path["GET /no-head.jpg"] == 1
@@ -1,4 +1,8 @@
+from collections.abc import Callable
 from datetime import UTC, datetime
+from typing import TypeVar
+
+from django.db import transaction
 
 from recipeyak.models.ingredient_historical import IngredientHistorical
 from recipeyak.models.note import Note
@@ -10,32 +14,121 @@ from recipeyak.models.step_historical import StepHistorical
 from recipeyak.models.upload import Upload
 from recipeyak.models.user import User
 
+# Store every item at least once every N versions so rebuilding a version
+# never needs more than N versions of rows.
+SNAPSHOT_INTERVAL = 20
+
+
+def _latest_versions(recipe_id: int) -> list[int] | None:
+    """
+    IDs of the latest snapshot & the delta versions after it, oldest first.
+
+    None if there isn't a snapshot within `SNAPSHOT_INTERVAL` versions, in
+    which case the next version should be a snapshot.
+    """
+    versions = list(
+        RecipeHistorical.objects.filter(recipe_id=recipe_id)
+        .order_by("-id")
+        .values_list("id", "is_snapshot")[:SNAPSHOT_INTERVAL]
+    )
+    for idx, (_, is_snapshot) in enumerate(versions):
+        if is_snapshot:
+            if idx + 1 >= SNAPSHOT_INTERVAL:
+                return None
+            return [version_id for version_id, _ in reversed(versions[: idx + 1])]
+    return None
+
+
+_HistoricalItem = IngredientHistorical | SectionHistorical | StepHistorical
+_T = TypeVar("_T", IngredientHistorical, SectionHistorical, StepHistorical)
+
+
+def _item_key(item: _HistoricalItem) -> tuple[object, ...]:
+    if isinstance(item, IngredientHistorical):
+        return (
+            item.quantity,
+            item.name,
+            item.description,
+            item.position,
+            item.optional,
+        )
+    if isinstance(item, SectionHistorical):
+        return (item.title, item.position)
+    return (item.text, item.position)
+
+
+def _delta(
+    *,
+    current: dict[int, _T],
+    previous: dict[int, _T],
+    tombstone: Callable[[int], _T],
+) -> list[_T]:
+    """
+    The items that were added or changed since the previous version, and
+    tombstones for those that were removed.
+    """
+    out = [
+        item
+        for item_id, item in current.items()
+        if item_id not in previous or _item_key(previous[item_id]) != _item_key(item)
+    ]
+    out.extend(tombstone(item_id) for item_id in previous.keys() - current.keys())
+    return out
+
+
+def _version_items(
+    model: type[_T], *, id_field: str, version_ids: list[int]
+) -> dict[int, _T]:
+    """
+    Replay the snapshot & deltas to get the items of the last version.
+    """
+    items: dict[int, _T] = {}
+    for item in model.objects.filter(recipe_historical_id__in=version_ids).order_by(
+        "recipe_historical_id"
+    ):
+        item_id = getattr(item, id_field)
+        if item.deleted:
+            items.pop(item_id, None)
+        else:
+            items[item_id] = item
+    return items
+
 
 def save_recipe_version(
     *, recipe_id: int, actor: User | None, created: datetime | None = None
 ) -> None:
     """
     Called after writing recipe changes to the database.
+
+    Every `SNAPSHOT_INTERVAL` versions we store all the ingredients, sections
+    & steps, otherwise we only store the ones that changed since the previous
+    version, with `deleted=True` rows for removals.
     """
-    recipe = Recipe.objects.get(id=recipe_id)
-    recipe_historical = RecipeHistorical.objects.create(
-        team_id=recipe.team_id,
-        recipe_id=recipe.id,
-        actor=actor,
-        name=recipe.name,
-        author=recipe.author,
-        source=recipe.source,
-        time=recipe.time,
-        servings=recipe.servings,
-        archived_at=recipe.archived_at,
-        tags=recipe.tags,
-        primary_image_id=recipe.primary_image_id,
-        created=created or datetime.now(UTC),
-    )
-    ingredients = []
-    for ingredient in recipe.ingredient_set.all():
-        ingredients.append(
-            IngredientHistorical(
+    with transaction.atomic():
+        # serialize versions of a recipe so each delta is against the one before
+        #
+        # `no_key` since the children we've inserted in this transaction hold
+        # a `for key share` lock on the recipe, which `for update` would
+        # deadlock with when two transactions are editing the same recipe.
+        recipe = Recipe.objects.select_for_update(no_key=True).get(id=recipe_id)
+        previous_versions = _latest_versions(recipe_id)
+        recipe_historical = RecipeHistorical.objects.create(
+            team_id=recipe.team_id,
+            recipe_id=recipe.id,
+            actor=actor,
+            name=recipe.name,
+            author=recipe.author,
+            source=recipe.source,
+            time=recipe.time,
+            servings=recipe.servings,
+            archived_at=recipe.archived_at,
+            tags=recipe.tags,
+            primary_image_id=recipe.primary_image_id,
+            is_snapshot=previous_versions is None,
+            created=created or datetime.now(UTC),
+        )
+        ingredients = {
+            ingredient.id: IngredientHistorical(
                 ingredient_id=ingredient.id,
                 team_id=recipe.team_id,
                 recipe_historical=recipe_historical,
@@ -45,32 +138,85 @@ def save_recipe_version(
                 position=ingredient.position,
                 optional=ingredient.optional,
             )
-        )
-    IngredientHistorical.objects.bulk_create(ingredients)
-    sections = []
-    for section in recipe.section_set.all():
-        sections.append(
-            SectionHistorical(
+            for ingredient in recipe.ingredient_set.all()
+        }
+        sections = {
+            section.id: SectionHistorical(
                 section_id=section.id,
                 team_id=recipe.team_id,
                 recipe_historical=recipe_historical,
                 title=section.title,
                 position=section.position,
             )
-        )
-    SectionHistorical.objects.bulk_create(sections)
-    steps = []
-    for step in recipe.step_set.all():
-        steps.append(
-            StepHistorical(
+            for section in recipe.section_set.all()
+        }
+        steps = {
+            step.id: StepHistorical(
                 step_id=step.id,
                 team_id=recipe.team_id,
                 recipe_historical=recipe_historical,
                 text=step.text,
                 position=step.position,
             )
-        )
-    StepHistorical.objects.bulk_create(steps)
+            for step in recipe.step_set.all()
+        }
+        if previous_versions is not None:
+            ingredients_delta = _delta(
+                current=ingredients,
+                previous=_version_items(
+                    IngredientHistorical,
+                    id_field="ingredient_id",
+                    version_ids=previous_versions,
+                ),
+                tombstone=lambda ingredient_id: IngredientHistorical(
+                    ingredient_id=ingredient_id,
+                    team_id=recipe.team_id,
+                    recipe_historical=recipe_historical,
+                    quantity="",
+                    name="",
+                    position="",
+                    deleted=True,
+                ),
+            )
+            sections_delta = _delta(
+                current=sections,
+                previous=_version_items(
+                    SectionHistorical,
+                    id_field="section_id",
+                    version_ids=previous_versions,
+                ),
+                tombstone=lambda section_id: SectionHistorical(
+                    section_id=section_id,
+                    team_id=recipe.team_id,
+                    recipe_historical=recipe_historical,
+                    title="",
+                    position="",
+                    deleted=True,
+                ),
+            )
+            steps_delta = _delta(
+                current=steps,
+                previous=_version_items(
+                    StepHistorical,
+                    id_field="step_id",
+                    version_ids=previous_versions,
+                ),
+                tombstone=lambda step_id: StepHistorical(
+                    step_id=step_id,
+                    team_id=recipe.team_id,
+                    recipe_historical=recipe_historical,
+                    text="",
+                    position="",
+                    deleted=True,
+                ),
+            )
+        else:
+            ingredients_delta = list(ingredients.values())
+            sections_delta = list(sections.values())
+            steps_delta = list(steps.values())
+        IngredientHistorical.objects.bulk_create(ingredients_delta)
+        SectionHistorical.objects.bulk_create(sections_delta)
+        StepHistorical.objects.bulk_create(steps_delta)
 
 
 def save_note_version(note: Note, *, actor: User) -> None:
@@ -13,3 +13,7 @@ class Message:
         timestamp: Any | None = None,
         extras: Any | None = None,
     ) -> None: ...
+    @property
+    def name(self) -> Any: ...
+    @property
+    def data(self) -> Any: ...
@@ -130,7 +130,7 @@ export function recipeCreate(params: {
       /** Name of User who created the Upload. */
       author: string | null
     } | null
-    /** The previous versions of the Recipe. */
+    /** The previous versions of the Recipe, empty if `include_versions` is false. */
     versions: Array<{
       id: number
       created_at: string
@@ -1,7 +1,10 @@
 // generated by recipeyak.api.base.codegen
 import { http } from "@/apiClient"
 
-export function recipeRetrieve(params: { recipe_id: number }) {
+export function recipeRetrieve(params: {
+  recipe_id: number
+  include_versions?: boolean
+}) {
   return http<{
     /** Unique ID of the Recipe. */
     id: number
@@ -126,7 +129,7 @@ export function recipeRetrieve(params: { recipe_id: number }) {
       /** Name of User who created the Upload. */
       author: string | null
     } | null
-    /** The previous versions of the Recipe. */
+    /** The previous versions of the Recipe, empty if `include_versions` is false. */
     versions: Array<{
       id: number
       created_at: string
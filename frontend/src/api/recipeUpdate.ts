@@ -11,6 +11,7 @@ export function recipeUpdate(params: {
   archived_at?: Date | null
   user_favorite?: boolean | null
   primaryImageId?: string | null
+  include_versions?: boolean
   recipe_id: number
 }) {
   return http<{
@@ -137,7 +138,7 @@ export function recipeUpdate(params: {
       /** Name of User who created the Upload. */
       author: string | null
     } | null
-    /** The previous versions of the Recipe. */
+    /** The previous versions of the Recipe, empty if `include_versions` is false. */
     versions: Array<{
       id: number
       created_at: string
@@ -0,0 +1,63 @@
+// generated by recipeyak.api.base.codegen
+import { http } from "@/apiClient"
+
+export function recipeVersionList(params: {
+  recipe_id: number
+  /** The `next_cursor` from the previous page. */
+  cursor?: number | null
+  limit?: number
+}) {
+  return http<{
+    /** The previous versions of the Recipe, newest first. */
+    versions: Array<{
+      id: number
+      created_at: string
+      actor: {
+        id: number
+        name: string
+        avatar_url: string
+      } | null
+      name: string
+      author: string | null
+      source: string | null
+      time: string | null
+      servings: string | null
+      archived_at: string | null
+      tags: Array<string> | null
+      primary_image: {
+        id: number
+        url: string
+        backgroundUrl: string | null
+      } | null
+      ingredients: Array<
+        | {
+            id: number | null
+            type: "ingredient"
+            description: string
+            quantity: string
+            name: string
+            position: string
+            optional: boolean
+          }
+        | {
+            id: number | null
+            type: "section"
+            title: string
+            position: string
+          }
+      >
+      steps: Array<{
+        id: number | null
+        text: string
+        position: string
+      }>
+    }>
+    /** Pass as the `cursor` to fetch the next page. */
+    next_cursor: number | null
+  }>({
+    url: "/api/v1/recipes/{recipe_id}/versions/",
+    method: "get",
+    params,
+    pathParamNames: ["recipe_id"],
+  })
+}
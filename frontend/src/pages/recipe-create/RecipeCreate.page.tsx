@@ -53,6 +53,7 @@ function CreateFromURLForm() {
           {
             // eslint-disable-next-line @typescript-eslint/consistent-type-assertions, @typescript-eslint/no-unsafe-member-access
             (recipeCreate.error as AxiosError).response?.data.message ??
+              recipeCreate.error.message ??
               "something went wrong."
           }
         </div>
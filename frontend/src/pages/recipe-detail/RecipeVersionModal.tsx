@@ -8,15 +8,17 @@ import {
 } from "@sanity/diff-match-patch"
 import { isSameYear, parseISO } from "date-fns"
 import { clamp, sortBy } from "lodash-es"
-import { useState } from "react"
+import { useEffect, useState } from "react"
 
+import { recipeVersionList } from "@/api/recipeVersionList"
 import { assertNever } from "@/assert"
 import { clx } from "@/classnames"
 import { Avatar } from "@/components/Avatar"
 import { Image } from "@/components/Image"
+import { Loader } from "@/components/Loader"
 import { Modal } from "@/components/Modal"
 import { formatAbsoluteDateTime, formatHumanDate } from "@/date"
-import { RecipeFetchResponse } from "@/queries/useRecipeFetch"
+import { useRecipeVersionList } from "@/queries/useRecipeVersionList"
 import { urlToDomain } from "@/text"
 import { useGlobalEvent } from "@/useGlobalEvent"
 
@@ -533,7 +535,7 @@ function getVersions(
   return [prev, cur, diffMapping]
 }
 
-type Versions = RecipeFetchResponse["versions"]
+type Versions = Awaited<ReturnType<typeof recipeVersionList>>["versions"]
 
 function SideBySideDiff({
   versions,
@@ -595,8 +597,27 @@ function VersionList({
     </div>
   )
 }
-function RecipeVersionDiff({ versions }: { versions: Versions }) {
+function RecipeVersionDiff({ recipeId }: { recipeId: number }) {
+  const res = useRecipeVersionList({ recipeId })
+  const versions = res.data?.pages.flatMap((page) => page.versions) ?? []
   const [currentVersion, setCurrentVersion] = useState<number>(0)
+  const { hasNextPage, isFetchingNextPage, fetchNextPage } = res
+  useEffect(() => {
+    // the diff of the last loaded version is against the next page's first
+    if (
+      currentVersion >= versions.length - 1 &&
+      hasNextPage &&
+      !isFetchingNextPage
+    ) {
+      void fetchNextPage()
+    }
+  }, [
+    currentVersion,
+    versions.length,
+    hasNextPage,
+    isFetchingNextPage,
+    fetchNextPage,
+  ])
   useGlobalEvent({
     keyDown: (e) => {
       switch (e.key) {
@@ -613,6 +634,12 @@ function RecipeVersionDiff({ versions }: { versions: Versions }) {
       }
     },
   })
+  if (res.isPending) {
+    return <Loader />
+  }
+  if (res.isError) {
+    return <div className="mt-10 text-center">error loading versions</div>
+  }
   if (versions.length === 0) {
     return <div className="mt-10 text-center">No versions found</div>
   }
@@ -629,11 +656,11 @@ function RecipeVersionDiff({ versions }: { versions: Versions }) {
 }
 
 export function RecipeVersionModal({
-  versions,
+  recipeId,
   isOpen,
   onOpenChange,
 }: {
-  versions: Versions
+  recipeId: number
   isOpen: boolean
   onOpenChange: (_: boolean) => void
 }) {
@@ -644,7 +671,7 @@ export function RecipeVersionModal({
       full
       onOpenChange={onOpenChange}
     >
-      <RecipeVersionDiff versions={versions} />
+      <RecipeVersionDiff recipeId={recipeId} />
     </Modal>
   )
 }
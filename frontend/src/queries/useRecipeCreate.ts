@@ -1,9 +1,32 @@
 import { useMutation, useQueryClient } from "@tanstack/react-query"
 
 import { recipeCreate } from "@/api/recipeCreate"
+import { scrapeJobCreate } from "@/api/scrapeJobCreate"
+import { scrapeJobRetrieve } from "@/api/scrapeJobRetrieve"
 import { cacheUpsertRecipe } from "@/queries/useRecipeFetch"
 import { useTeamId } from "@/useTeamId"
 
+const SCRAPE_JOB_POLL_INTERVAL_MS = 1_000
+const SCRAPE_JOB_MAX_WAIT_MS = 2 * 60 * 1_000
+
+async function importRecipe(params: { team: number; url: string }) {
+  const start = Date.now()
+  let job = await scrapeJobCreate(params)
+  while (job.status === "queued" || job.status === "running") {
+    if (Date.now() - start > SCRAPE_JOB_MAX_WAIT_MS) {
+      throw new Error("Import is taking too long, try again later.")
+    }
+    await new Promise((resolve) =>
+      setTimeout(resolve, SCRAPE_JOB_POLL_INTERVAL_MS),
+    )
+    job = await scrapeJobRetrieve({ scrape_job_id: job.id })
+  }
+  if (job.recipe == null) {
+    throw new Error(job.error?.message ?? "Problem importing recipe.")
+  }
+  return job.recipe
+}
+
 export function useRecipeCreate() {
   const queryClient = useQueryClient()
   const teamId = useTeamId()
@@ -18,17 +41,11 @@ export function useRecipeCreate() {
           },
     ) => {
       const team = teamId
-      const data =
-        "from_url" in payload
-          ? {
-              team,
-              from_url: payload.from_url,
-            }
-          : {
-              team,
-              name: payload.name,
-            }
-      return recipeCreate(data)
+      if ("from_url" in payload) {
+        // scraping can be slow, so it runs in the background
+        return importRecipe({ team, url: payload.from_url })
+      }
+      return recipeCreate({ team, name: payload.name })
     },
     onSuccess: (res) => {
       cacheUpsertRecipe(queryClient, {
@@ -9,7 +9,8 @@ export function useRecipeFetch({ recipeId }: { recipeId: number }) {
   const teamId = useTeamId()
   const res = useQuery({
     queryKey: getQueryKey({ teamId, recipeId }),
-    queryFn: () => recipeRetrieve({ recipe_id: recipeId }),
+    queryFn: () =>
+      recipeRetrieve({ recipe_id: recipeId, include_versions: false }),
   })
   useChannel(`team:${teamId}:recipe:${recipeId}`, (message) => {
     switch (message.name) {
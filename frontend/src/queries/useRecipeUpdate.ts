@@ -55,7 +55,12 @@ export function useRecipeUpdate() {
         archived_at?: Date | null
         user_favorite?: boolean | null
       }
-    }) => recipeUpdate({ recipe_id: recipeId, ...update }),
+    }) =>
+      recipeUpdate({
+        recipe_id: recipeId,
+        ...update,
+        include_versions: false,
+      }),
     onMutate: (vars) => {
       if (vars.update.user_favorite != null) {
         const userFavorite = vars.update.user_favorite
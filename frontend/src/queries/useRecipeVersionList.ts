@@ -0,0 +1,18 @@
+import { useInfiniteQuery } from "@tanstack/react-query"
+
+import { recipeVersionList } from "@/api/recipeVersionList"
+import { useTeamId } from "@/useTeamId"
+
+// fetch the newest versions first
+const initialPageParam: number | null = null
+
+export function useRecipeVersionList({ recipeId }: { recipeId: number }) {
+  const teamId = useTeamId()
+  return useInfiniteQuery({
+    queryKey: [teamId, "recipes", recipeId, "versions"],
+    queryFn: ({ pageParam }) =>
+      recipeVersionList({ recipe_id: recipeId, cursor: pageParam }),
+    initialPageParam,
+    getNextPageParam: (lastPage) => lastPage.next_cursor,
+  })
+}